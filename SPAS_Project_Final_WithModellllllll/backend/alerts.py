@@ -1,62 +1,204 @@
-import os, joblib, pandas as pd
+import pandas as pd
+import numpy as np
+from datetime import datetime
 
 from flask import current_app
-from backend.models import Student, Performance, db
-from backend.analytics import aggregate_student_features, predict_for_aggregated
+from sqlalchemy import func, select, insert, update
+from backend.models import Student, Performance, StudentFeature, Prediction, Alert, db
+from backend.features import feature_frame
+from backend.model_registry import MODEL_PATH, registry
+from backend.queries import CURRENT_PREDICTIONS, student_scope_clauses
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'models', 'rf_model.pkl')
+# -------------------------------
+# Config
+# -------------------------------
+DEFAULT_ALERT_THRESHOLD = 50.0
+ALERT_CHUNK_SIZE = 500  # enrollment numbers per IN (...) query
 
 def load_model():
-    if os.path.exists(MODEL_PATH):
-        try:
-            return joblib.load(MODEL_PATH)
-        except Exception as e:
-            current_app.logger.warning('Model load failed: %s', e)
+    try:
+        return registry.get(current_app.config.get('MODEL_PATH', MODEL_PATH))
+    except Exception as e:
+        current_app.logger.warning('Model load failed: %s', e)
     return None
 
 def student_agg_df_from_db():
-    perfs = Performance.query.all()
-    rows = []
-    for p in perfs:
-        rows.append({'student_id': p.student.student_id, 'subject': p.subject, 'marks': p.marks, 'attendance': p.attendance, 'assignments_completed':0, 'assignments_total':1})
-    if not rows:
-        return pd.DataFrame()
-    df = pd.DataFrame(rows)
-    agg = aggregate_student_features(df)
-    return agg
+    """Per-student aggregated features, read from the feature store"""
+    return feature_frame()
+
+def alert_threshold():
+    return current_app.config.get('ALERT_THRESHOLD', DEFAULT_ALERT_THRESHOLD)
+
+# -------------------------------
+# At-Risk Students (set-based)
+# -------------------------------
+# Stored batch prediction, or the student's average while not scored yet
+ALERT_VALUE = func.coalesce(CURRENT_PREDICTIONS.c.predicted_marks, StudentFeature.avg_marks)
+
+def at_risk_query(threshold, enrollment_nos=None):
+    """(enrollment_no, value) for students with tests whose value is below `threshold`"""
+    query = (
+        select(StudentFeature.enrollment_no, ALERT_VALUE)
+        .outerjoin(CURRENT_PREDICTIONS, CURRENT_PREDICTIONS.c.enrollment_no == StudentFeature.enrollment_no)
+        .where(ALERT_VALUE < threshold)
+    )
+    if enrollment_nos is not None:
+        query = query.where(StudentFeature.enrollment_no.in_(enrollment_nos))
+    return query
 
 def generate_alerts(threshold=50.0):
-    agg = student_agg_df_from_db()
-    alerts = []
-    if agg.empty:
-        return alerts
-    pred_df = predict_for_aggregated(agg) if os.path.exists(MODEL_PATH) else agg
-    for _, row in pred_df.iterrows():
-        val = row.get('predicted_marks', row.get('avg_marks',0))
-        if float(val) < threshold:
-            alerts.append({'student_id': row['student_id'], 'predicted_marks': float(val)})
-    return alerts
+    """Students whose stored prediction (or actual average, if not scored yet) is below threshold"""
+    return [
+        {'student_id': enrollment_no, 'predicted_marks': float(value)}
+        for enrollment_no, value in db.session.execute(at_risk_query(threshold).order_by(StudentFeature.enrollment_no))
+    ]
+
+# -------------------------------
+# Persisted Alerts
+# -------------------------------
+def _evaluate(threshold, now, enrollment_nos=None):
+    at_risk = dict(db.session.execute(at_risk_query(threshold, enrollment_nos)).all())
+    existing = select(Alert.student_enrollment_no)
+    if enrollment_nos is not None:
+        existing = existing.where(Alert.student_enrollment_no.in_(enrollment_nos))
+    existing = set(db.session.scalars(existing))
+
+    cleared = existing - set(at_risk)
+    if cleared:
+        db.session.query(Alert).filter(Alert.student_enrollment_no.in_(cleared)).delete(synchronize_session=False)
+    still = [{'student_enrollment_no': e, 'predicted_marks': float(v), 'threshold': threshold, 'last_seen': now}
+             for e, v in at_risk.items() if e in existing]
+    if still:
+        db.session.execute(update(Alert), still)
+    opened = [{'student_enrollment_no': e, 'predicted_marks': float(v), 'threshold': threshold,
+               'first_seen': now, 'last_seen': now}
+              for e, v in at_risk.items() if e not in existing]
+    if opened:
+        db.session.execute(insert(Alert), opened)
+    return len(opened), len(cleared)
+
+def evaluate_alerts(enrollment_nos=None, threshold=None):
+    """Re-evaluate alerts for these students (everyone when None); the caller commits.
+
+    New at-risk students get an alert (first_seen = last_seen = now), students
+    still at risk have last_seen bumped, recovered students lose theirs.
+    Returns (opened, cleared).
+    """
+    threshold = alert_threshold() if threshold is None else threshold
+    now = datetime.utcnow()
+    if enrollment_nos is None:
+        return _evaluate(threshold, now)
+
+    opened = cleared = 0
+    enrollment_nos = list(dict.fromkeys(enrollment_nos))
+    for start in range(0, len(enrollment_nos), ALERT_CHUNK_SIZE):
+        chunk_opened, chunk_cleared = _evaluate(threshold, now, enrollment_nos[start:start + ALERT_CHUNK_SIZE])
+        opened += chunk_opened
+        cleared += chunk_cleared
+    return opened, cleared
+
+def backfill_alerts():
+    """Evaluate every student once for databases created before the alerts table"""
+    if Alert.query.first() is None and StudentFeature.query.first() is not None:
+        opened, _ = evaluate_alerts()
+        db.session.commit()
+        if opened:
+            print(f"🚨 {opened} students flagged at risk.")
+
+def active_alerts(scope=None):
+    """Open alerts in a resolve_scope() scope, lowest predicted marks first"""
+    return (
+        db.session.query(Alert, Student.name, Student.department, Student.college)
+        .join(Student, Student.enrollment_no == Alert.student_enrollment_no)
+        .filter(*student_scope_clauses(scope))
+        .order_by(Alert.predicted_marks, Alert.student_enrollment_no)
+    )
+
+# -------------------------------
+# Recommendations
+# -------------------------------
+ATTENDANCE_TARGET = 75
+WEAK_SUBJECT_MARKS = 60
+REMEDIAL_MARKS = 50
+PRACTICE_MARKS = 70
+
+def _subject_frame(scope):
+    """One grouped query: per student and subject, test count, sums and the stored prediction"""
+    rows = (
+        db.session.query(
+            Student.enrollment_no, Student.name, Student.department, Student.college, Student.semester,
+            Performance.subject,
+            func.count(Performance.id),
+            func.sum(Performance.marks),
+            func.sum(Performance.attendance),
+            func.max(CURRENT_PREDICTIONS.c.predicted_marks)
+        )
+        .join(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+        .outerjoin(CURRENT_PREDICTIONS, CURRENT_PREDICTIONS.c.enrollment_no == Student.enrollment_no)
+        .filter(*student_scope_clauses(scope))
+        .group_by(Student.enrollment_no, Performance.subject)
+        .all()
+    )
+    return pd.DataFrame(rows, columns=[
+        'enrollment_no', 'name', 'department', 'college', 'semester', 'subject',
+        'tests', 'marks_sum', 'attendance_sum', 'predicted_marks'
+    ])
+
+def cohort_recommendations(scope=None):
+    """Recommendations for every student with tests in a department/college/semester scope.
+
+    Same rules as personalized_recommendation() used to apply per student, with
+    the thresholds evaluated over the whole cohort at once.
+    """
+    subjects = _subject_frame(scope)
+    if subjects.empty:
+        return []
+
+    students = subjects.groupby('enrollment_no', sort=True).agg(
+        name=('name', 'first'), department=('department', 'first'), college=('college', 'first'),
+        semester=('semester', 'first'), tests=('tests', 'sum'), marks_sum=('marks_sum', 'sum'),
+        attendance_sum=('attendance_sum', 'sum'), predicted_marks=('predicted_marks', 'first')
+    )
+    predicted = pd.to_numeric(students['predicted_marks'], errors='coerce')
+    avg_marks = students['marks_sum'] / students['tests']
+    avg_attendance = students['attendance_sum'] / students['tests']
+
+    weak = subjects[subjects['marks_sum'] / subjects['tests'] < WEAK_SUBJECT_MARKS]
+    weak = weak.sort_values('subject').groupby('enrollment_no')['subject'].agg(list)
+
+    students = students.assign(
+        avg_marks=avg_marks.round(2),
+        avg_attendance=avg_attendance.round(2),
+        predicted_marks=predicted.round(2).astype(object).where(predicted.notna(), None),
+        weak_subjects=weak.reindex(students.index).apply(lambda v: v if isinstance(v, list) else []),
+        attendance_advice=np.where(avg_attendance < ATTENDANCE_TARGET, f'Improve attendance to at least {ATTENDANCE_TARGET}%', ''),
+        marks_advice=np.select(
+            [avg_marks < REMEDIAL_MARKS, avg_marks < PRACTICE_MARKS],
+            ['Attend remedial classes and practice basics', 'Regular practice and revision recommended'],
+            'Keep up the good work; try advanced problems'
+        )
+    ).reset_index()
+
+    results = []
+    for record in students.to_dict('records'):
+        recommendations = [advice for advice in (record.pop('attendance_advice'), record.pop('marks_advice')) if advice]
+        if record['weak_subjects']:
+            recommendations.append('Weak subjects: ' + ', '.join(record['weak_subjects']))
+        for column in ('tests', 'marks_sum', 'attendance_sum'):
+            del record[column]
+        record['recommendations'] = recommendations
+        results.append(record)
+    return results
+
+def recommendation_model_version():
+    """Model version behind the stored predictions (None before the first scoring)"""
+    return db.session.query(func.max(Prediction.model_version)).scalar()
 
 def personalized_recommendation(student_id):
-    perfs = Performance.query.join(Student).filter(Student.student_id==student_id).all()
-    if not perfs:
+    """Recommendations for one student (enrollment number)"""
+    results = cohort_recommendations({'enrollment_no': student_id})
+    if not results:
         return {'msg':'No data'}
-    avg_marks = sum([p.marks for p in perfs])/len(perfs)
-    avg_att = sum([p.attendance for p in perfs])/len(perfs)
-    recs = []
-    if avg_att < 75:
-        recs.append('Improve attendance to at least 75%')
-    if avg_marks < 50:
-        recs.append('Attend remedial classes and practice basics')
-    elif avg_marks < 70:
-        recs.append('Regular practice and revision recommended')
-    else:
-        recs.append('Keep up the good work; try advanced problems')
-    # weak subjects
-    subj = {}
-    for p in perfs:
-        subj.setdefault(p.subject,[]).append(p.marks)
-    weak = [s for s,v in subj.items() if sum(v)/len(v) < 60]
-    if weak:
-        recs.append('Weak subjects: ' + ', '.join(weak))
-    return {'avg_marks':avg_marks,'avg_attendance':avg_att,'recommendations':recs}
+    result = results[0]
+    return {'avg_marks': result['avg_marks'], 'avg_attendance': result['avg_attendance'],
+            'recommendations': result['recommendations']}
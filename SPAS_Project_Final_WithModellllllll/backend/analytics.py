@@ -3,10 +3,11 @@ import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
-import joblib, os
 import json
 from datetime import datetime
 
+from backend.model_registry import MODEL_PATH, load_model, publish_model, new_model_version
+
 # -------------------------------
 # Load CSV
 # -------------------------------
@@ -109,9 +110,11 @@ def aggregate_student_features(df):
 # -------------------------------
 # Train Random Forest Model
 # -------------------------------
-def train_model(df, model_path='../models/rf_model.pkl'):
-    agg = aggregate_student_features(df)
-    
+def train_model(df, model_path=MODEL_PATH):
+    return train_model_from_features(aggregate_student_features(df), model_path)
+
+def train_model_from_features(agg, model_path=MODEL_PATH):
+    """Train on per-student features (aggregate_student_features() layout, e.g. the feature store)"""
     if len(agg) < 2:
         return None, None  # Not enough data to train
     
@@ -125,15 +128,17 @@ def train_model(df, model_path='../models/rf_model.pkl'):
     preds = model.predict(X_test)
     mse = mean_squared_error(y_test, preds)
     
-    os.makedirs(os.path.dirname(model_path), exist_ok=True)
-    joblib.dump(model, model_path)
+    # Stamped before anyone else sees the model, then an atomic write-and-rename;
+    # the registry picks the new version up on next use
+    model.spas_version_ = new_model_version()
+    publish_model(model, model_path)
     
     return model, mse
 
 # -------------------------------
 # Predict for Aggregated Data
 # -------------------------------
-def predict_for_aggregated(df, model_path='../models/rf_model.pkl'):
+def predict_for_aggregated(df, model_path=MODEL_PATH):
     df = preprocess(df)
     
     # Always add predicted_marks column
@@ -143,10 +148,8 @@ def predict_for_aggregated(df, model_path='../models/rf_model.pkl'):
     if 'student_id' in df.columns:
         df = df.rename(columns={'student_id':'enrollment_no'})
     
-    if not os.path.exists(model_path):
-        return df
-    
-    model = joblib.load(model_path)
+    # Cached per process; only reloaded when the model file changes
+    model = load_model(model_path)
     if model is None or not hasattr(model, 'feature_names_in_'):
         return df
     
@@ -400,6 +403,130 @@ def generate_monthly_trend_chart(performance_data):
         print(f"Error in monthly trend chart: {e}")
         return None
 
+# -------------------------------
+# Shared-Frame Chart Engine
+# -------------------------------
+MARKS_HISTOGRAM_BINS = [0, 40, 50, 60, 70, 80, 90, 100]
+STUDENT_CHARTS = ('department_comparison', 'college_performance', 'marks_distribution',
+                  'attendance_correlation', 'performance_prediction')
+# Dashboard panels served from the same frame but not part of generate_all_chart_data()
+DASHBOARD_STUDENT_CHARTS = ('semester_performance', 'top_students')
+TOP_STUDENTS = 10
+
+def build_student_frame(students_data):
+    """One typed, columnar frame for every per-student chart.
+
+    Built column by column (much cheaper than pd.DataFrame(list_of_dicts)), with
+    department/college as categoricals so the group-bys work on integer codes.
+    Columns the source rows don't carry are left out, so their charts return None.
+    """
+    if not students_data:
+        return None
+    present = students_data[0].keys()
+
+    def column(name, default=None):
+        return [s.get(name, default) for s in students_data]
+
+    columns = {'enrollment': column('enrollment'), 'name': column('name', 'Unknown')}
+    for name in ('department', 'college', 'semester'):
+        if name in present:
+            columns[name] = pd.Categorical(column(name))
+    for name in ('avg_marks', 'avg_attendance', 'predicted_marks'):
+        if name in present:
+            columns[name] = pd.to_numeric(pd.Series(column(name), dtype='object'), errors='coerce').astype('float64')
+    return pd.DataFrame(columns)
+
+def _group_series(frame, by):
+    """Mean marks/attendance and student count per category, labels in sorted order"""
+    if by not in frame.columns or 'avg_marks' not in frame.columns:
+        return None
+    stats = frame.groupby(by, observed=True, sort=True).agg(
+        avg_marks=('avg_marks', 'mean'),
+        avg_attendance=('avg_attendance', 'mean'),
+        student_count=('enrollment', 'count')
+    )
+    return {
+        "labels": [str(label) for label in stats.index],
+        "avg_marks": stats['avg_marks'].round(2).tolist(),
+        "avg_attendance": stats['avg_attendance'].round(2).tolist(),
+        "student_count": stats['student_count'].tolist()
+    }
+
+def _top_students(frame):
+    if 'avg_marks' not in frame.columns or 'avg_attendance' not in frame.columns:
+        return None
+    top = frame.sort_values(['avg_marks', 'enrollment'], ascending=[False, True]).head(TOP_STUDENTS)
+    return {
+        "labels": top['name'].tolist(),
+        "avg_marks": top['avg_marks'].round(2).tolist(),
+        "avg_attendance": top['avg_attendance'].round(2).tolist()
+    }
+
+def _marks_histogram(frame):
+    if 'avg_marks' not in frame.columns:
+        return None
+    marks = frame['avg_marks'].dropna().to_numpy()
+    if len(marks) == 0:
+        return None
+    hist, bin_edges = np.histogram(marks, bins=MARKS_HISTOGRAM_BINS)
+    return {
+        "labels": [f"{int(bin_edges[i])}-{int(bin_edges[i+1])}" for i in range(len(bin_edges)-1)],
+        "counts": hist.tolist(),
+        "total_students": len(marks)
+    }
+
+def _correlation_series(frame):
+    if 'avg_attendance' not in frame.columns or 'avg_marks' not in frame.columns:
+        return None
+    return {
+        "attendance": frame['avg_attendance'].fillna(0).tolist(),
+        "marks": frame['avg_marks'].fillna(0).tolist(),
+        "students": frame['name'].tolist()
+    }
+
+def _prediction_series(frame):
+    if 'avg_marks' not in frame.columns:
+        return None
+    actual = frame['avg_marks'].tolist()
+    return {
+        "students": frame['name'].tolist(),
+        "actual_marks": actual,
+        # Use actual as fallback
+        "predicted_marks": frame['predicted_marks'].tolist() if 'predicted_marks' in frame.columns else actual
+    }
+
+def compute_student_charts(students_data, charts=STUDENT_CHARTS):
+    """All per-student chart series from one shared frame.
+
+    Same JSON shapes as the generate_*_chart() builders above, which each
+    rebuilt their own DataFrame from the list of dicts.
+    """
+    try:
+        frame = build_student_frame(students_data)
+    except Exception as e:
+        print(f"Error building chart frame: {e}")
+        return {}
+    if frame is None:
+        return {}
+
+    builders = {
+        "department_comparison": lambda: _group_series(frame, 'department'),
+        "college_performance": lambda: _group_series(frame, 'college'),
+        "marks_distribution": lambda: _marks_histogram(frame),
+        "attendance_correlation": lambda: _correlation_series(frame),
+        "performance_prediction": lambda: _prediction_series(frame),
+        "semester_performance": lambda: _group_series(frame, 'semester'),
+        "top_students": lambda: _top_students(frame)
+    }
+    result = {}
+    for name in charts:
+        try:
+            result[name] = builders[name]()
+        except Exception as e:
+            print(f"Error in {name} chart: {e}")
+            result[name] = None
+    return result
+
 # -------------------------------
 # Main Analytics Data Generator
 # -------------------------------
@@ -409,15 +536,9 @@ def generate_all_chart_data(students_data=None, student_performances=None, perfo
     
     chart_data = {}
     
-    # Only generate charts if we have students_data
+    # Only generate charts if we have students_data (one shared frame for all of them)
     if students_data:
-        chart_data.update({
-            "department_comparison": generate_department_comparison_chart(students_data),
-            "college_performance": generate_college_performance_chart(students_data),
-            "marks_distribution": generate_marks_distribution_chart(students_data),
-            "attendance_correlation": generate_attendance_correlation_chart(students_data),
-            "performance_prediction": generate_performance_prediction_chart(students_data),
-        })
+        chart_data.update(compute_student_charts(students_data))
     
     # Add student-specific charts if performance data is available
     if student_performances:
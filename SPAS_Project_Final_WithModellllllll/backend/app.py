@@ -14,15 +14,27 @@ from backend.models import db
 from backend.config import (
     SQLALCHEMY_DATABASE_URI,
     SQLALCHEMY_TRACK_MODIFICATIONS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
     SECRET_KEY
 )
+from backend.database import init_database, create_missing_indexes
 from backend.routes import setup_routes
+from backend.jobs import init_upload_jobs
+from backend.retrain_scheduler import init_retrain_scheduler
+from backend.cache import init_dashboard_cache
+from backend.features import backfill_student_features, rebuild_student_features
+from backend.rollups import backfill_rollups, rebuild_rollups
+from backend.alerts import backfill_alerts, evaluate_alerts
+from backend.search import init_search_index
+from backend.metrics import init_request_metrics
+from backend.profiler import init_request_profiler
 
 
 mail = Mail()  # global mail instance
 
 
-def create_app():
+def create_app(config_overrides=None):
     # ---------------------------------------------------------------
     # ✅ Initialize Flask app with correct template/static paths
     # ---------------------------------------------------------------
@@ -47,6 +59,8 @@ def create_app():
     app.config['SECRET_KEY'] = SECRET_KEY
     app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = SQLALCHEMY_TRACK_MODIFICATIONS
+    app.config['DB_POOL_SIZE'] = DB_POOL_SIZE
+    app.config['DB_MAX_OVERFLOW'] = DB_MAX_OVERFLOW
 
     # ---------------------------------------------------------------
     # ✅ Flask-Mail Config (for password reset)
@@ -62,20 +76,61 @@ def create_app():
     app.config['MAIL_PASSWORD'] = "vyal frti unxm wxkr"  # ⚠️ Use App Password (never real password)
     app.config['MAIL_DEFAULT_SENDER'] = ("SPAS Admin", app.config['MAIL_USERNAME'])
 
+    # Optional overrides (tests point the app at a throwaway database)
+    if config_overrides:
+        app.config.update(config_overrides)
+
     # ---------------------------------------------------------------
     # ✅ Initialize Extensions
     # ---------------------------------------------------------------
-    db.init_app(app)
+    # SQLite in WAL mode with tuned pragmas, or the server database from
+    # SPAS_DATABASE_URL / DATABASE_URL; one connection pool per worker process
+    init_database(app)
     mail.init_app(app)
 
+    # Per-endpoint latency, SQL, template and payload metrics (served at /metrics)
+    init_request_metrics(app)
+
     # Register Routes (which will use 'mail' for reset)
     setup_routes(app)
 
+    # Background worker pool for uploads (parse → import), and the debounced
+    # retrain scheduler the uploads hand their changes to. Upload job state is
+    # per process: serve /upload and its status polls from a single worker.
+    init_upload_jobs(app)
+    init_retrain_scheduler(app)
+
+    # Scoped LRU/TTL cache for dashboard contexts and the students API
+    init_dashboard_cache(app)
+
+    # On-demand cProfile of single admin requests (listed at /admin/profiles)
+    init_request_profiler(app)
+
     # ---------------------------------------------------------------
     # ✅ Auto-create tables
     # ---------------------------------------------------------------
     with app.app_context():
         db.create_all()
+
+        # create_all() skips indexes on tables that already exist, so add any
+        # missing ones (e.g. the performance upsert key) to older databases.
+        # Fails startup if the upsert key cannot be created.
+        removed = create_missing_indexes()
+        if removed:
+            # Duplicates were counted in the stored aggregates
+            rebuild_student_features()
+            rebuild_rollups()
+            evaluate_alerts()
+            db.session.commit()
+            print(f"🧹 Removed {removed} duplicate performance rows before adding the upsert key.")
+
+        # Build the per-student feature store, rollups and alerts for databases that predate them
+        backfill_student_features()
+        backfill_rollups()
+        backfill_alerts()
+
+        # Full-text index behind student search (SQLite FTS5, else LIKE)
+        init_search_index()
         print("✅ Database connected and initialized successfully.")
 
     return app
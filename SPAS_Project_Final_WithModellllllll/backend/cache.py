@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+# -------------------------------
+# Config
+# -------------------------------
+DEFAULT_CACHE_SIZE = 256      # entries across all scopes (LRU beyond this)
+DEFAULT_CACHE_TTL = 300       # seconds; an upper bound on staleness for writes we don't see
+
+ADMIN_SCOPE = ('admin',)
+
+def scope_key(scope):
+    """Cache partition for a resolve_scope() dict: admin, dept+college, or one student"""
+    if scope is None:
+        return None
+    if not scope:
+        return ADMIN_SCOPE
+    if 'enrollment_no' in scope:
+        return ('student', scope['enrollment_no'])
+    return ('dept', scope.get('department'), scope.get('college'))
+
+# -------------------------------
+# Scoped LRU + TTL Cache
+# -------------------------------
+class ScopedCache:
+    """LRU/TTL cache of computed dashboard data, partitioned by role scope.
+
+    Entries are keyed by (scope key, name, params). Writes invalidate whole
+    partitions: the admin view, the dept+college views and the single-student
+    views that the written rows belong to.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE, ttl=DEFAULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (scope, name, params) -> (expires_at, value)
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    # ---------- reads ----------
+    def get_or_compute(self, scope, name, compute, params=()):
+        """Cached value for (scope, name, params); `compute()` fills a miss"""
+        partition = scope_key(scope)
+        if partition is None or self.max_entries <= 0:
+            return compute()
+        key = (partition, name, params)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.counters['hits'] += 1
+                return entry[1]
+            if entry:
+                del self.entries[key]
+                self.counters['expirations'] += 1
+            self.counters['misses'] += 1
+
+        value = compute()
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters['evictions'] += 1
+        return value
+
+    def stats(self):
+        with self.lock:
+            partitions = {}
+            for partition, _, _ in self.entries:
+                label = ':'.join(str(p) for p in partition)
+                partitions[label] = partitions.get(label, 0) + 1
+            lookups = self.counters['hits'] + self.counters['misses']
+            return {
+                **self.counters,
+                'hit_ratio': round(self.counters['hits'] / lookups, 4) if lookups else None,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'partitions': partitions
+            }
+
+    # ---------- invalidation ----------
+    def _drop(self, partitions):
+        with self.lock:
+            stale = [key for key in self.entries if key[0] in partitions]
+            for key in stale:
+                del self.entries[key]
+            self.counters['invalidations'] += len(stale)
+        return len(stale)
+
+    def invalidate_students(self, scopes=(), enrollment_nos=()):
+        """After student/performance writes: admin, each (department, college) and each student"""
+        partitions = {ADMIN_SCOPE}
+        partitions.update(('dept', department, college) for department, college in scopes)
+        partitions.update(('student', enrollment_no) for enrollment_no in enrollment_nos)
+        return self._drop(partitions)
+
+    def invalidate_teachers(self, scopes=()):
+        """After teacher writes: admin and the teachers' (department, college) views"""
+        partitions = {ADMIN_SCOPE}
+        partitions.update(('dept', department, college) for department, college in scopes)
+        return self._drop(partitions)
+
+    def clear(self):
+        with self.lock:
+            self.counters['invalidations'] += len(self.entries)
+            self.entries.clear()
+
+def init_dashboard_cache(app):
+    """Attach the dashboard cache to the app (app.extensions['dashboard_cache'])"""
+    cache = ScopedCache(
+        max_entries=app.config.get('DASHBOARD_CACHE_SIZE', DEFAULT_CACHE_SIZE),
+        ttl=app.config.get('DASHBOARD_CACHE_TTL', DEFAULT_CACHE_TTL)
+    )
+    app.extensions['dashboard_cache'] = cache
+    return cache
@@ -0,0 +1,125 @@
+from sqlalchemy import func
+
+from backend.models import db, Student, Performance, StudentFeature
+from backend.analytics import (
+    STUDENT_CHARTS, DASHBOARD_STUDENT_CHARTS, compute_student_charts,
+    generate_subject_performance_chart, generate_monthly_trend_chart, generate_performance_trend_data
+)
+from backend.queries import filtered_student_query, performance_detail_query, student_summary, student_scope_clauses
+from backend.rollups import rollup_series
+
+# -------------------------------
+# Config
+# -------------------------------
+# Charts with one point per student ship at most this many students
+CHART_POINT_LIMIT = 1000
+POINT_CHARTS = ('attendance_correlation', 'performance_prediction')
+
+STUDENT_FRAME_CHARTS = STUDENT_CHARTS + DASHBOARD_STUDENT_CHARTS
+PERFORMANCE_CHARTS = ('subject_performance', 'monthly_trend')
+CHART_NAMES = STUDENT_FRAME_CHARTS + PERFORMANCE_CHARTS + ('student_trend',)
+
+# Charts answered from the performance rollups (averages over tests): chart -> rollup dimension
+ROLLUP_CHARTS = {
+    'subject_performance': 'subject',
+    'monthly_trend': 'month'
+}
+# Charts answered from the feature store (averages over students, like the overview): chart -> column
+GROUP_CHARTS = {
+    'department_comparison': 'department',
+    'college_performance': 'college'
+}
+
+# -------------------------------
+# Per-Chart Series
+# -------------------------------
+def chart_series(name, scope, filters=None, q=''):
+    """Series for one chart over the scope's students, narrowed like /api/students.
+
+    Same JSON shape as the chart's entry in generate_all_chart_data(); None when
+    there is nothing to plot. Raises ValueError for an unknown chart or filter.
+    """
+    if name not in CHART_NAMES:
+        raise ValueError(f"Unknown chart: {name}")
+
+    if name in ROLLUP_CHARTS and _rollups_answer(scope, filters, q):
+        return _rollup_chart(name, scope, filters)
+    if name in GROUP_CHARTS and _rollups_answer(scope, filters, q):
+        return _group_chart(GROUP_CHARTS[name], scope, filters)
+
+    if name in STUDENT_FRAME_CHARTS:
+        query = filtered_student_query(scope, filters, q).order_by(Student.enrollment_no)
+        if name in POINT_CHARTS:
+            query = query.limit(CHART_POINT_LIMIT)
+        students = [student_summary(row) for row in query]
+        return compute_student_charts(students, charts=(name,)).get(name)
+
+    if name in PERFORMANCE_CHARTS:
+        students = filtered_student_query(scope, filters, q).with_entities(Student.enrollment_no)
+        rows = (
+            performance_detail_query(scope)
+            .with_entities(Performance.subject, Performance.marks, Performance.attendance, Performance.date)
+            .filter(Student.enrollment_no.in_(students.subquery().select()))
+        )
+        performance_data = [row._asdict() for row in rows]
+        if name == 'subject_performance':
+            return generate_subject_performance_chart(performance_data)
+        return generate_monthly_trend_chart(performance_data)
+
+    # student_trend: one student's tests in order, only for a single-student scope
+    if not scope or not scope.get('enrollment_no'):
+        return None
+    performances = (
+        Performance.query.filter_by(student_enrollment_no=scope['enrollment_no'])
+        .order_by(Performance.date, Performance.id).all()
+    )
+    return generate_performance_trend_data(performances)
+
+# -------------------------------
+# Rollup-Backed Charts
+# -------------------------------
+def _rollups_answer(scope, filters, q):
+    """Rollups and the feature store group by department/college only: no single student, semester, status or search"""
+    filters = filters or {}
+    return (scope is not None and 'enrollment_no' not in scope and not q
+            and not filters.get('semester') and not filters.get('status'))
+
+def _rollup_chart(name, scope, filters):
+    """Chart series from the rollups (averages over tests, like the admin statistics)"""
+    series = rollup_series(ROLLUP_CHARTS[name], scope, filters)
+    if not series['labels']:
+        return None
+    return {
+        "subjects" if name == 'subject_performance' else "months": series['labels'],
+        "avg_marks": series['avg_marks'],
+        "avg_attendance": series['avg_attendance']
+    }
+
+def _group_chart(dimension, scope, filters):
+    """Per-department/college means of each student's own averages, in SQL.
+
+    Same definition as the per-student path and the overview: every student
+    weighs the same however many tests they sat, and students without tests
+    count with 0 averages.
+    """
+    column = getattr(Student, dimension)
+    rows = (
+        db.session.query(
+            column,
+            func.avg(func.round(func.coalesce(StudentFeature.avg_marks, 0), 2)),
+            func.avg(func.round(func.coalesce(StudentFeature.avg_attendance, 0), 2)),
+            func.count()
+        )
+        .outerjoin(StudentFeature, StudentFeature.enrollment_no == Student.enrollment_no)
+        .filter(*student_scope_clauses(scope))
+        .filter(*[getattr(Student, c) == filters[c] for c in ('department', 'college') if (filters or {}).get(c)])
+        .group_by(column).order_by(column).all()
+    )
+    if not rows:
+        return None
+    return {
+        "labels": [r[0] for r in rows],
+        "avg_marks": [round(r[1], 2) for r in rows],
+        "avg_attendance": [round(r[2], 2) for r in rows],
+        "student_count": [r[3] for r in rows]
+    }
@@ -8,8 +8,22 @@ DB_DIR = os.path.join(BASE_DIR, '..', 'database')
 os.makedirs(DB_DIR, exist_ok=True)
 
 # SQLite database path (absolute)
-SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(DB_DIR, 'app.db')}"
+SQLITE_DATABASE_URI = f"sqlite:///{os.path.join(DB_DIR, 'app.db')}"
+
+def database_url(environ=os.environ):
+    """SPAS_DATABASE_URL or DATABASE_URL (e.g. PostgreSQL) if set, else the bundled SQLite file"""
+    url = environ.get('SPAS_DATABASE_URL') or environ.get('DATABASE_URL') or SQLITE_DATABASE_URI
+    # Hosting platforms still hand out the pre-SQLAlchemy-1.4 scheme
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+SQLALCHEMY_DATABASE_URI = database_url()
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# Connection pool per worker process (see backend/database.py)
+DB_POOL_SIZE = int(os.environ.get('SPAS_DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('SPAS_DB_MAX_OVERFLOW', 10))
+
 # Optional: secret key for session handling
 SECRET_KEY = "spas_secret_key_2025"
@@ -0,0 +1,153 @@
+import os
+import weakref
+
+from sqlalchemy import create_engine, event, func, inspect, select
+from sqlalchemy.engine import make_url
+
+from backend.models import db, Performance
+
+# -------------------------------
+# Config
+# -------------------------------
+# Applied to every new SQLite connection. WAL lets dashboard reads run against
+# the last committed snapshot while an upload's transaction is writing;
+# busy_timeout makes a second writer wait for the lock instead of failing.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',      # durable at checkpoints; safe with WAL
+    'cache_size': -64000,         # negative = KiB, i.e. 64 MB of page cache per connection
+    'mmap_size': 268435456,       # 256 MB memory-mapped reads
+    'busy_timeout': 30000         # ms
+}
+
+# Per worker process: each gunicorn worker (and its threads) gets its own pool
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800       # seconds; server databases drop idle connections
+
+# -------------------------------
+# Engine Options
+# -------------------------------
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+def _is_memory(uri):
+    return make_url(uri).database in (None, '', ':memory:')
+
+def engine_options(uri, config=None):
+    """create_engine() keyword arguments for a database URL and the app config"""
+    config = config or {}
+    if is_sqlite(uri) and _is_memory(uri):
+        return {}  # one shared in-memory connection (Flask-SQLAlchemy's StaticPool)
+
+    options = {
+        'pool_size': config.get('DB_POOL_SIZE', DEFAULT_POOL_SIZE),
+        'max_overflow': config.get('DB_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW),
+        'pool_timeout': config.get('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT),
+        'pool_pre_ping': True
+    }
+    if is_sqlite(uri):
+        # Connections move between the request and upload worker threads
+        options['connect_args'] = {'check_same_thread': False}
+    else:
+        options['pool_recycle'] = config.get('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE)
+    return options
+
+def sqlite_pragmas(uri, config=None):
+    pragmas = dict(SQLITE_PRAGMAS)
+    pragmas.update((config or {}).get('SQLITE_PRAGMAS', {}))
+    if _is_memory(uri):
+        pragmas.pop('journal_mode')  # in-memory databases have no WAL
+    return pragmas
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Run PRAGMA statements on every new connection of a SQLite engine"""
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+# -------------------------------
+# Pools Across Worker Processes
+# -------------------------------
+_engines = weakref.WeakSet()
+
+def _reset_pools_after_fork():
+    # A forked worker must not reuse the parent's sockets/file handles
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+def make_engine(uri, config=None):
+    """Standalone engine with the app's pragmas and pool settings (e.g. the retraining process)"""
+    engine = create_engine(uri, **engine_options(uri, config))
+    if is_sqlite(uri):
+        install_sqlite_pragmas(engine, sqlite_pragmas(uri, config))
+    _engines.add(engine)
+    return engine
+
+def init_database(app):
+    """db.init_app() with tuned engine options, SQLite pragmas and per-worker pools"""
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    options = engine_options(uri, app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+    if is_sqlite(uri):
+        install_sqlite_pragmas(engine, sqlite_pragmas(uri, app.config))
+    _engines.add(engine)
+    return engine
+
+# -------------------------------
+# Indexes on Existing Databases
+# -------------------------------
+def dedupe_performances():
+    """Keep only the latest row (highest id) per (student, subject, date); returns rows deleted.
+
+    Rows without a date are left alone: unique indexes never treat NULLs as equal.
+    """
+    latest = (
+        select(func.max(Performance.id))
+        .where(Performance.date.isnot(None))
+        .group_by(Performance.student_enrollment_no, Performance.subject, Performance.date)
+    )
+    return (
+        db.session.query(Performance)
+        .filter(Performance.date.isnot(None), Performance.id.not_in(latest))
+        .delete(synchronize_session=False)
+    )
+
+def create_missing_indexes():
+    """Add indexes that create_all() skips on tables that already exist.
+
+    The performance upsert key is unique, so duplicate rows from before it
+    existed are removed first. Raises RuntimeError if an index still cannot be
+    created: every upload's ON CONFLICT depends on the key. Returns the number
+    of duplicate performance rows deleted.
+    """
+    inspector = inspect(db.engine)
+    removed = 0
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique and table is Performance.__table__:
+                removed += dedupe_performances()
+                db.session.commit()
+            try:
+                index.create(bind=db.engine)
+            except Exception as e:
+                raise RuntimeError(f"Could not create index {index.name}: {e}") from e
+    return removed
@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import insert, select
+
+from backend.models import db, Student, Performance, StudentFeature
+from backend.analytics import aggregate_student_features
+
+# -------------------------------
+# Config
+# -------------------------------
+REFRESH_CHUNK_SIZE = 500  # enrollment numbers per IN (...) query
+
+FEATURE_COLUMNS = ['enrollment_no', 'avg_marks', 'avg_attendance', 'avg_assign_ratio']
+
+# -------------------------------
+# Feature Computation
+# -------------------------------
+def _raw_rows(enrollment_nos=None):
+    """students JOIN performances rows, optionally limited to some students"""
+    query = (
+        db.session.query(Student.enrollment_no, Performance.subject, Performance.marks, Performance.attendance)
+        .join(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+    )
+    if enrollment_nos is not None:
+        query = query.filter(Student.enrollment_no.in_(enrollment_nos))
+    return pd.DataFrame(query.all(), columns=['enrollment_no', 'subject', 'marks', 'attendance'])
+
+def _feature_rows(raw):
+    """aggregate_student_features() output as student_features rows"""
+    if raw.empty:
+        return []
+    agg = aggregate_student_features(raw)
+    counts = raw.groupby('enrollment_no').size()
+    sub_cols = [c for c in agg.columns if c.startswith('sub_')]
+    updated_at = datetime.utcnow()
+
+    rows = []
+    for record, subjects in zip(agg[FEATURE_COLUMNS].to_dict('records'), agg[sub_cols].to_dict('records')):
+        record['subject_mix'] = json.dumps({k: float(v) for k, v in subjects.items() if v})
+        record['test_count'] = int(counts[record['enrollment_no']])
+        record['updated_at'] = updated_at
+        rows.append(record)
+    return rows
+
+# -------------------------------
+# Incremental Maintenance
+# -------------------------------
+def refresh_student_features(enrollment_nos):
+    """Recompute features for just these students (call inside the writing transaction).
+
+    Features are per-student aggregates, so recomputing a subset gives exactly the
+    rows a full rebuild would. Students with no performances left lose their row.
+    """
+    enrollment_nos = list(dict.fromkeys(enrollment_nos))
+    for start in range(0, len(enrollment_nos), REFRESH_CHUNK_SIZE):
+        chunk = enrollment_nos[start:start + REFRESH_CHUNK_SIZE]
+        db.session.query(StudentFeature).filter(
+            StudentFeature.enrollment_no.in_(chunk)
+        ).delete(synchronize_session=False)
+        rows = _feature_rows(_raw_rows(chunk))
+        if rows:
+            db.session.execute(insert(StudentFeature), rows)
+    return len(enrollment_nos)
+
+def rebuild_student_features():
+    """Full rebuild (initial backfill of databases created before the feature store)"""
+    db.session.query(StudentFeature).delete(synchronize_session=False)
+    rows = _feature_rows(_raw_rows())
+    if rows:
+        db.session.execute(insert(StudentFeature), rows)
+    return len(rows)
+
+def backfill_student_features():
+    """Populate an empty feature table from existing performances; no-op otherwise"""
+    if StudentFeature.query.first() is None and Performance.query.first() is not None:
+        count = rebuild_student_features()
+        db.session.commit()
+        print(f"✅ Built student features for {count} students.")
+
+# -------------------------------
+# Reading Features
+# -------------------------------
+def read_feature_frame(connection, enrollment_nos=None):
+    """Stored features in aggregate_student_features() layout (sub_* columns expanded).
+
+    Takes a plain SQLAlchemy connection so it also works outside the Flask app
+    (the retraining subprocess). All students unless `enrollment_nos` is given.
+    """
+    query = select(
+        StudentFeature.enrollment_no, StudentFeature.avg_marks, StudentFeature.avg_attendance,
+        StudentFeature.avg_assign_ratio, StudentFeature.subject_mix
+    )
+    if enrollment_nos is not None:
+        query = query.where(StudentFeature.enrollment_no.in_(enrollment_nos))
+    stored = pd.read_sql(query, connection)
+    if stored.empty:
+        return pd.DataFrame(columns=FEATURE_COLUMNS)
+
+    base = stored[FEATURE_COLUMNS]
+    subjects = pd.DataFrame([json.loads(mix) for mix in stored['subject_mix']]).fillna(0.0)
+    subjects = subjects[sorted(subjects.columns)]
+    return pd.concat([base, subjects], axis=1)
+
+def feature_frame(enrollment_nos=None):
+    """Stored features through the app's session"""
+    return read_feature_frame(db.session.connection(), enrollment_nos)
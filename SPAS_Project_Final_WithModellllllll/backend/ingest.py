@@ -0,0 +1,249 @@
+import pandas as pd
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.dialects import sqlite, postgresql
+
+from backend.models import db, Student, Performance
+from backend.features import refresh_student_features
+from backend.predictions import score_students
+from backend.rollups import updating_rollups
+from backend.alerts import evaluate_alerts
+
+# -------------------------------
+# Config
+# -------------------------------
+# Rows per prefetch + upsert round trip (kept well under SQLite's bound-parameter limit)
+INGEST_CHUNK_SIZE = 1000
+
+# Rows read from an uploaded file at a time; each chunk is imported and committed
+# before the next is read, so memory stays flat however large the file is
+PARSE_CHUNK_ROWS = 20000
+
+DEFAULT_STUDENT_PASSWORD = 'default123'
+
+# Imported students are created in a "must set password" state instead of paying
+# a full password-hash KDF per row. check_password_hash() rejects this marker;
+# login() recognises it and sends the student through the reset-password flow.
+# ON CONFLICT never copies it over an existing student's real hash.
+PROVISIONED_PASSWORD = '!provisioned'
+
+def is_provisioned(password_hash):
+    """True while an imported student has not chosen a password yet"""
+    return password_hash == PROVISIONED_PASSWORD
+
+# Normalize column names (handle different naming conventions)
+COLUMN_MAPPING = {
+    'enrollment': 'enrollment_no',
+    'enrollno': 'enrollment_no',
+    'studentid': 'enrollment_no',
+    'student_id': 'enrollment_no',
+    'avg marks': 'marks',
+    'avg_marks': 'marks',
+    'average marks': 'marks',
+    'avg attendance': 'attendance',
+    'avg_attendance': 'attendance',
+    'average attendance': 'attendance',
+    'date': 'date',
+    'test_date': 'date',
+    'exam_date': 'date'
+}
+
+# -------------------------------
+# Streaming Readers
+# -------------------------------
+def iter_upload_chunks(path, filename, chunk_rows=PARSE_CHUNK_ROWS):
+    """Yield bounded DataFrame chunks (with normalized column names) from a saved upload.
+
+    CSV and JSON-lines (.jsonl/.ndjson) are streamed from disk. Excel and plain
+    JSON documents cannot be read incrementally, so they are loaded once and then
+    handed out in slices of the same size.
+    """
+    ext = filename.rsplit('.', 1)[1].lower()
+    if ext == 'csv':
+        reader = pd.read_csv(path, chunksize=chunk_rows)
+    elif ext in ['jsonl', 'ndjson']:
+        reader = pd.read_json(path, lines=True, chunksize=chunk_rows)
+    elif ext in ['xlsx', 'xls', 'json']:
+        df = pd.read_excel(path) if ext != 'json' else pd.read_json(path)
+        reader = (df.iloc[start:start + chunk_rows] for start in range(0, max(len(df), 1), chunk_rows))
+    else:
+        raise ValueError('Invalid file type!')
+
+    try:
+        for chunk in reader:
+            yield normalize_columns(chunk)
+    finally:
+        reader.close()  # releases the file handle if the import stops early
+
+# -------------------------------
+# Column Normalization
+# -------------------------------
+def normalize_columns(df):
+    """Lower-case/strip headers and map known aliases onto the canonical names"""
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+    df = df.rename(columns=COLUMN_MAPPING)
+    return df.loc[:, ~df.columns.duplicated()]
+
+def _text_column(df, names, default):
+    """First non-blank value across `names` (e.g. name → student_name), else `default`"""
+    result = None
+    for name in names:
+        if name not in df.columns:
+            continue
+        values = df[name]
+        # Whole numbers read as floats because of gaps (7.0) should still become "7"
+        if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+            values = values.astype('Int64')
+        values = values.astype('string').str.strip()
+        values = values.mask(values == '')
+        result = values if result is None else result.fillna(values)
+    if result is None:
+        return pd.Series(default, index=df.index, dtype='string')
+    return result.fillna(default) if default is not None else result
+
+def _numeric_column(df, name):
+    if name not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[name], errors='coerce').fillna(0.0).astype(float)
+
+def _date_column(df, name):
+    today = pd.Timestamp(datetime.now().date())
+    if name not in df.columns:
+        return pd.Series(today, index=df.index).dt.date
+    values = df[name]
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, format='%Y-%m-%d', errors='coerce')
+    return values.fillna(today).dt.date
+
+def prepare_records(df):
+    """Vectorized clean-up of an uploaded frame into student and performance columns.
+
+    Returns (frame, valid_rows) where `valid_rows` counts every row that carried an
+    enrollment number, matching what the upload page has always reported.
+    """
+    df = normalize_columns(df.copy())
+    records = pd.DataFrame({
+        'enrollment_no': _text_column(df, ['enrollment_no', 'enrollment', 'enrollno', 'studentid'], None),
+        'name': _text_column(df, ['name', 'student_name'], 'Unknown'),
+        'email': _text_column(df, ['email'], ''),
+        'department': _text_column(df, ['department', 'dept'], 'General'),
+        'college': _text_column(df, ['college', 'college_name'], 'Unknown College'),
+        'semester': _text_column(df, ['semester'], '1'),
+        'subject': _text_column(df, ['subject'], 'General'),
+        'marks': _numeric_column(df, 'marks'),
+        'attendance': _numeric_column(df, 'attendance'),
+        'date': _date_column(df, 'date')
+    })
+    records = records[records['enrollment_no'].notna()]
+    return records, len(records)
+
+# -------------------------------
+# Bulk Upserts
+# -------------------------------
+def _insert(table):
+    """Dialect-specific INSERT that supports ON CONFLICT"""
+    if db.engine.dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+def _existing_enrollments(enrollment_nos):
+    """One query per chunk: which of these students are already on file, and where.
+
+    Returns {enrollment_no: (department, college)} as stored before the upsert.
+    """
+    rows = db.session.execute(
+        select(Student.enrollment_no, Student.department, Student.college)
+        .where(Student.enrollment_no.in_(enrollment_nos))
+    )
+    return {row.enrollment_no: (row.department, row.college) for row in rows}
+
+def upsert_students(students):
+    """INSERT ... ON CONFLICT (enrollment_no) DO UPDATE for one chunk of students.
+
+    Returns (created, scopes): the number of newly created students and every
+    (department, college) the chunk touched, before and after the update.
+    """
+    existing = _existing_enrollments(students['enrollment_no'].tolist())
+    rows = students.assign(password=PROVISIONED_PASSWORD).astype(object).to_dict('records')
+    created = len(rows) - len(existing)
+    scopes = set(existing.values()) | {(row['department'], row['college']) for row in rows}
+
+    stmt = _insert(Student.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Student.enrollment_no],
+        set_={
+            'name': stmt.excluded.name,
+            # A blank email in the file keeps the address already on record
+            'email': func.coalesce(func.nullif(stmt.excluded.email, ''), Student.email),
+            'department': stmt.excluded.department,
+            'semester': stmt.excluded.semester,
+            'college': stmt.excluded.college
+        }
+    )
+    db.session.execute(stmt, rows)
+    return created, scopes
+
+def upsert_performances(performances):
+    """INSERT ... ON CONFLICT (enrollment_no, subject, date) DO UPDATE for one chunk"""
+    rows = performances.rename(columns={'enrollment_no': 'student_enrollment_no'}).astype(object).to_dict('records')
+    if not rows:
+        return 0
+    stmt = _insert(Performance.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Performance.student_enrollment_no, Performance.subject, Performance.date],
+        set_={
+            'marks': stmt.excluded.marks,
+            'attendance': stmt.excluded.attendance
+        }
+    )
+    db.session.execute(stmt, rows)
+    return len(rows)
+
+# -------------------------------
+# Import Pipeline
+# -------------------------------
+def import_frame(df, chunk_size=INGEST_CHUNK_SIZE):
+    """Set-based import of one uploaded frame. The caller owns the commit/rollback.
+
+    Later rows win over earlier ones for the same student or (student, subject, date),
+    exactly like the old row-by-row loop.
+    """
+    records, valid_rows = prepare_records(df)
+
+    students = records.drop_duplicates('enrollment_no', keep='last')[
+        ['enrollment_no', 'name', 'email', 'department', 'semester', 'college']
+    ]
+    # Only create performance record if we have valid data
+    performances = records[(records['marks'] > 0) | (records['attendance'] > 0)]
+    performances = performances.drop_duplicates(['enrollment_no', 'subject', 'date'], keep='last')[
+        ['enrollment_no', 'subject', 'marks', 'attendance', 'date']
+    ]
+
+    created = 0
+    scopes = set()
+    written = 0
+    # Rollups follow every student in the file: a new department/college moves
+    # their existing performances to other groups too
+    with updating_rollups(students['enrollment_no'].tolist()):
+        for start in range(0, len(students), chunk_size):
+            chunk_created, chunk_scopes = upsert_students(students.iloc[start:start + chunk_size])
+            created += chunk_created
+            scopes |= chunk_scopes
+
+        for start in range(0, len(performances), chunk_size):
+            written += upsert_performances(performances.iloc[start:start + chunk_size])
+
+    # Keep the feature store, predictions and alerts in step, for the touched students only
+    refresh_student_features(performances['enrollment_no'].tolist())
+    score_students(performances['enrollment_no'].tolist())
+    evaluate_alerts(performances['enrollment_no'].tolist())
+
+    return {
+        'rows': valid_rows,
+        'students_created': created,
+        'students_updated': len(students) - created,
+        'performances_written': written,
+        # For cache invalidation: which dashboard scopes this import changed
+        'scopes': scopes,
+        'enrollment_nos': students['enrollment_no'].tolist()
+    }
@@ -0,0 +1,197 @@
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from backend.models import db
+from backend.ingest import iter_upload_chunks, import_frame, PARSE_CHUNK_ROWS
+
+# -------------------------------
+# Config
+# -------------------------------
+DEFAULT_UPLOAD_WORKERS = 2
+MAX_TRACKED_JOBS = 200  # oldest finished jobs are forgotten beyond this
+
+UPLOAD_STAGES = ('parse', 'import', 'retrain')
+
+# -------------------------------
+# Job Queue
+# -------------------------------
+class UploadJobQueue:
+    """Local thread pool that runs parse → import outside the request.
+
+    Files are streamed in bounded chunks, so parse and import progress together.
+    Retraining is only requested here; the retrain scheduler batches requests
+    from concurrent uploads into one training (see backend/retrain_scheduler.py).
+
+    Job state lives in memory (per process) and is exposed as plain dicts so the
+    /upload/status/<job_id> endpoint can return it as JSON. A job is only known
+    to the worker that accepted the upload, so run uploads on a single worker
+    process (or pin a client's requests to one worker) when serving with several.
+    """
+
+    def __init__(self, app, workers=DEFAULT_UPLOAD_WORKERS):
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='spas-upload')
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+
+    # ---------- public API ----------
+    def submit(self, files, owner=None, previews=None, workdir=None):
+        """Queue saved files [(filename, path), ...]; returns the new job id.
+
+        `workdir` (the upload's private directory) is deleted when the job finishes.
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'owner': owner,
+            'status': 'queued',
+            'stage': None,
+            'stages': {name: {'status': 'pending', 'done': 0, 'total': 0} for name in UPLOAD_STAGES},
+            'files': [filename for filename, _ in files],
+            'rows_total': 0,
+            'rows_imported': 0,
+            'previews': list(previews or []),
+            'errors': [],
+            'messages': [],
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'finished_at': None
+        }
+        with self.lock:
+            self.jobs[job_id] = job
+            self._trim()
+        self.executor.submit(self._run, job_id, files, workdir)
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of a job's state (None if unknown)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot['stages'] = {k: dict(v) for k, v in job['stages'].items()}
+            snapshot['previews'] = [dict(p) for p in job['previews']]
+            snapshot['errors'] = list(job['errors'])
+            snapshot['messages'] = list(job['messages'])
+            return snapshot
+
+    # ---------- internals ----------
+    def _trim(self):
+        finished = [k for k, j in self.jobs.items() if j['status'] in ('done', 'failed')]
+        while len(self.jobs) > MAX_TRACKED_JOBS and finished:
+            self.jobs.pop(finished.pop(0), None)
+
+    def _update(self, job_id, **fields):
+        with self.lock:
+            self.jobs[job_id].update(fields)
+
+    def _update_stage(self, job_id, stage, **fields):
+        with self.lock:
+            self.jobs[job_id]['stages'][stage].update(fields)
+
+    def _append(self, job_id, key, value):
+        with self.lock:
+            self.jobs[job_id][key].append(value)
+
+    def _start_stage(self, job_id, stage, total):
+        self._update(job_id, stage=stage)
+        self._update_stage(job_id, stage, status='running', total=total)
+
+    def _run(self, job_id, files, workdir=None):
+        with self.app.app_context():
+            try:
+                self._update(job_id, status='running')
+                any_error, success_count = self._ingest(job_id, files)
+                self._request_retrain(job_id, success_count)
+                self._summarize(job_id, any_error, success_count)
+                self._update(job_id, status='done')
+            except Exception as e:
+                db.session.rollback()
+                self._append(job_id, 'errors', str(e))
+                self._update(job_id, status='failed')
+            finally:
+                db.session.remove()
+                if workdir:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                self._update(job_id, finished_at=datetime.now().isoformat(timespec='seconds'))
+
+    def _ingest(self, job_id, files):
+        """Stream each file chunk by chunk: preview from the first chunk, commit after every chunk"""
+        chunk_rows = self.app.config.get('UPLOAD_CHUNK_ROWS', PARSE_CHUNK_ROWS)
+        self._start_stage(job_id, 'parse', len(files))
+        self._update_stage(job_id, 'import', status='running', total=len(files))
+        any_error = False
+        success_count = 0
+
+        for i, (filename, path) in enumerate(files, start=1):
+            preview = None
+            try:
+                for chunk in iter_upload_chunks(path, filename, chunk_rows):
+                    if preview is None:
+                        preview = {
+                            'filename': filename,
+                            'head_html': chunk.head(5).to_html(classes="preview-table", index=False),
+                            'rows': 0
+                        }
+                        self._append(job_id, 'previews', preview)
+                        self._update(job_id, stage='import')
+                    with self.lock:
+                        preview['rows'] += len(chunk)
+                        self.jobs[job_id]['rows_total'] += len(chunk)
+
+                    # Set-based upsert of this chunk (see backend/ingest.py)
+                    result = import_frame(chunk)
+                    db.session.commit()
+                    self.app.extensions['dashboard_cache'].invalidate_students(
+                        result['scopes'], result['enrollment_nos']
+                    )
+                    success_count += result['rows']
+                    with self.lock:
+                        self.jobs[job_id]['rows_imported'] += result['rows']
+                print(f"✅ Imported {filename}: {preview['rows'] if preview else 0} rows")
+            except Exception as e:
+                db.session.rollback()
+                self._append(job_id, 'previews', {'filename': filename, 'error': str(e)})
+                self._append(job_id, 'errors', f"{filename}: {e}")
+                # An unreadable file is only a preview error (as before); a failure
+                # mid-import is an import error, and earlier chunks stay committed
+                if preview is not None:
+                    any_error = True
+            self._update_stage(job_id, 'parse', done=i)
+            self._update_stage(job_id, 'import', done=i)
+
+        self._update_stage(job_id, 'parse', status='done')
+        self._update_stage(job_id, 'import', status='failed' if any_error else 'done')
+        return any_error, success_count
+
+    def _request_retrain(self, job_id, changed_rows):
+        """Hand the changed-row count to the retrain scheduler instead of training inline"""
+        self._start_stage(job_id, 'retrain', 1)
+        if changed_rows == 0:
+            self._update_stage(job_id, 'retrain', status='skipped', done=1)
+            return
+        scheduler = self.app.extensions['retrain_scheduler']
+        scheduler.request(changed_rows)
+        self._append(job_id, 'messages', (
+            "info", f"🕒 Model retraining scheduled (changes are batched for {scheduler.debounce_seconds}s)"
+        ))
+        self._update_stage(job_id, 'retrain', status='scheduled', done=1)
+
+    def _summarize(self, job_id, any_error, success_count):
+        if any_error:
+            message = ("warning", "⚠️ Some files failed to import. See previews for details.")
+        elif success_count > 0:
+            message = ("success", f"✅ {success_count} records processed successfully!")
+        else:
+            message = ("warning", "⚠️ No valid data found in uploaded files. Please check if files contain required columns.")
+        self._append(job_id, 'messages', message)
+
+def init_upload_jobs(app):
+    """Attach the upload job queue to the app (app.extensions['upload_jobs'])"""
+    queue = UploadJobQueue(app, workers=app.config.get('UPLOAD_WORKERS', DEFAULT_UPLOAD_WORKERS))
+    app.extensions['upload_jobs'] = queue
+    return queue
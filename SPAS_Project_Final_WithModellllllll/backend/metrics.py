@@ -0,0 +1,267 @@
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, request, current_app, has_request_context, before_render_template, template_rendered
+from sqlalchemy import event
+
+from backend.models import db
+
+# -------------------------------
+# Config
+# -------------------------------
+# Latency histogram bucket bounds in seconds (Prometheus `le` labels)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RECENT_SAMPLES = 500        # per-endpoint latencies kept for percentiles in the summary
+SLOWEST_ROUTES = 10
+N_PLUS_ONE_THRESHOLD = 10   # identical statement shapes per request before it is flagged
+
+METRIC_PREFIX = 'spas'
+
+# -------------------------------
+# Per-Endpoint Aggregates
+# -------------------------------
+class EndpointStats:
+    """Everything recorded for one (endpoint, method)"""
+
+    def __init__(self):
+        self.count = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.duration_sum = 0.0
+        self.duration_max = 0.0
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.response_bytes = 0
+        self.statuses = {}
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, duration, status, sql_count, sql_seconds, template_seconds, size):
+        self.count += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                self.buckets[i] += 1
+        self.duration_sum += duration
+        self.duration_max = max(self.duration_max, duration)
+        self.sql_count += sql_count
+        self.sql_seconds += sql_seconds
+        self.template_seconds += template_seconds
+        self.response_bytes += size
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.recent.append(duration)
+
+    def percentile(self, fraction):
+        samples = sorted(self.recent)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else 0.0
+
+# -------------------------------
+# Request Metrics
+# -------------------------------
+class RequestMetrics:
+    """Per-endpoint latency, SQL, template and payload metrics for one app.
+
+    Request timing runs from the first before_request hook to after_request; a
+    streamed body (CSV export, report ZIP) is timed until the stream closes and
+    its size is unknown (0).
+
+    Counters live in this process only. Under several gunicorn workers a scrape
+    reaches one of them, so every sample carries a `pid` label: series from
+    different workers never overwrite each other, sum() over `pid` gives the
+    app-wide total, and a restarted worker shows up as a new series.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}  # (endpoint, method) -> EndpointStats
+        self.started_at = time.time()
+
+    def observe(self, endpoint, method, **values):
+        with self.lock:
+            stats = self.endpoints.get((endpoint, method))
+            if stats is None:
+                stats = self.endpoints[(endpoint, method)] = EndpointStats()
+            stats.observe(**values)
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+            self.started_at = time.time()
+
+    # ---------- reads ----------
+    def slowest(self, limit=SLOWEST_ROUTES):
+        """Endpoints ranked by p95 latency over their recent requests (milliseconds)"""
+        with self.lock:
+            rows = []
+            for (endpoint, method), stats in self.endpoints.items():
+                rows.append({
+                    'endpoint': endpoint,
+                    'method': method,
+                    'count': stats.count,
+                    'avg_ms': round(stats.duration_sum / stats.count * 1000, 2),
+                    'p50_ms': round(stats.percentile(0.5) * 1000, 2),
+                    'p95_ms': round(stats.percentile(0.95) * 1000, 2),
+                    'max_ms': round(stats.duration_max * 1000, 2),
+                    'avg_sql_queries': round(stats.sql_count / stats.count, 2),
+                    'avg_sql_ms': round(stats.sql_seconds / stats.count * 1000, 2),
+                    'avg_template_ms': round(stats.template_seconds / stats.count * 1000, 2),
+                    'avg_response_bytes': round(stats.response_bytes / stats.count),
+                    'statuses': {str(status): n for status, n in sorted(stats.statuses.items())}
+                })
+        rows.sort(key=lambda row: (row['p95_ms'], row['avg_ms']), reverse=True)
+        return rows[:limit]
+
+    def prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        p = METRIC_PREFIX
+        pid = os.getpid()  # read per scrape: the app may be created before workers fork
+        lines = [
+            f'# HELP {p}_request_duration_seconds Request latency by endpoint.',
+            f'# TYPE {p}_request_duration_seconds histogram'
+        ]
+        counters = {
+            'requests_total': ('Requests by endpoint and status.', []),
+            'sql_queries_total': ('SQL statements executed while serving requests.', []),
+            'sql_seconds_total': ('Time spent in SQL statements while serving requests.', []),
+            'template_render_seconds_total': ('Time spent rendering templates.', []),
+            'response_bytes_total': ('Response payload bytes (streamed bodies excluded).', [])
+        }
+        with self.lock:
+            for (endpoint, method), stats in sorted(self.endpoints.items()):
+                labels = f'endpoint="{_escape(endpoint)}",method="{method}",pid="{pid}"'
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f'{p}_request_duration_seconds_sum{{{labels}}} {stats.duration_sum:.6f}')
+                lines.append(f'{p}_request_duration_seconds_count{{{labels}}} {stats.count}')
+
+                for status, n in sorted(stats.statuses.items()):
+                    counters['requests_total'][1].append(f'{{{labels},status="{status}"}} {n}')
+                counters['sql_queries_total'][1].append(f'{{{labels}}} {stats.sql_count}')
+                counters['sql_seconds_total'][1].append(f'{{{labels}}} {stats.sql_seconds:.6f}')
+                counters['template_render_seconds_total'][1].append(f'{{{labels}}} {stats.template_seconds:.6f}')
+                counters['response_bytes_total'][1].append(f'{{{labels}}} {stats.response_bytes}')
+
+        for name, (help_text, samples) in counters.items():
+            lines.append(f'# HELP {p}_{name} {help_text}')
+            lines.append(f'# TYPE {p}_{name} counter')
+            lines.extend(f'{p}_{name}{sample}' for sample in samples)
+        return '\n'.join(lines) + '\n'
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+# -------------------------------
+# Repeated Statements (N+1)
+# -------------------------------
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUES_ROWS = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+
+def statement_shape(statement):
+    """SQL with literals and IN/VALUES lists collapsed, so per-row copies of one query match"""
+    shape = ' '.join(statement.split())
+    shape = _STRING_LITERAL.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('?', shape)
+    return _VALUES_ROWS.sub(r'\1', shape)
+
+def repeated_statements(shapes, threshold):
+    """[(count, shape)] for shapes run at least `threshold` times, most repeated first"""
+    return sorted(((n, shape) for shape, n in shapes.items() if n >= threshold), reverse=True)
+
+# -------------------------------
+# Hooks
+# -------------------------------
+def _start_request():
+    g.request_audit = {
+        'started': time.perf_counter(),
+        'sql_count': 0,
+        'sql_seconds': 0.0,
+        'template_seconds': 0.0,
+        'shapes': Counter()
+    }
+
+def _finish_request(metrics, response):
+    audit = g.get('request_audit')
+    if audit is None or 'endpoint' in audit:
+        return response
+    app = current_app._get_current_object()
+    audit.update(endpoint=request.endpoint or 'unmatched', method=request.method,
+                 path=request.path, status=response.status_code)
+
+    if response.is_streamed:
+        # The body's queries run after this hook (stream_with_context keeps g),
+        # so the request is recorded once the stream is closed
+        response.call_on_close(lambda: _record(app, metrics, audit, 0))
+        return response
+
+    repeated = _record(app, metrics, audit, response.calculate_content_length() or 0)
+    if app.config.get('QUERY_AUDIT_HEADERS', app.debug or app.testing):
+        response.headers['X-Query-Count'] = str(audit['sql_count'])
+        for count, shape in repeated:
+            response.headers.add('X-Repeated-Query', f'{count}x {shape[:200]}')
+    return response
+
+def _record(app, metrics, audit, size):
+    metrics.observe(
+        audit['endpoint'], audit['method'],
+        duration=time.perf_counter() - audit['started'],
+        status=audit['status'],
+        sql_count=audit['sql_count'],
+        sql_seconds=audit['sql_seconds'],
+        template_seconds=audit['template_seconds'],
+        size=size
+    )
+    repeated = repeated_statements(audit['shapes'], app.config.get('N_PLUS_ONE_THRESHOLD', N_PLUS_ONE_THRESHOLD))
+    for count, shape in repeated:
+        app.logger.warning("⚠️ Possible N+1 on %s %s: %d x %s", audit['method'], audit['path'], count, shape)
+    return repeated
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['metrics_query_start'].pop()
+    # Background jobs share the engine; only statements run for a request count
+    audit = g.get('request_audit') if has_request_context() else None
+    if audit is not None:
+        audit['sql_count'] += 1
+        audit['sql_seconds'] += time.perf_counter() - started
+        audit['shapes'][statement_shape(statement)] += 1
+
+def _cursor_failed(context):
+    # after_cursor_execute never fires for a failed statement
+    stack = context.connection.info.get('metrics_query_start') if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+def _template_started(sender, template, context, **extra):
+    if 'request_audit' in g:
+        g.template_started = time.perf_counter()
+
+def _template_finished(sender, template, context, **extra):
+    started = g.pop('template_started', None)
+    if started is not None and 'request_audit' in g:
+        g.request_audit['template_seconds'] += time.perf_counter() - started
+
+def init_request_metrics(app):
+    """Attach request metrics to the app (app.extensions['request_metrics']).
+
+    Call before setup_routes() so timing starts ahead of the access check.
+    """
+    metrics = RequestMetrics()
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(metrics, response))
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(db.engine, 'handle_error', _cursor_failed)
+    before_render_template.connect(_template_started, app, weak=False)
+    template_rendered.connect(_template_finished, app, weak=False)
+
+    app.extensions['request_metrics'] = metrics
+    return metrics
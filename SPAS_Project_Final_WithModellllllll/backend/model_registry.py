@@ -0,0 +1,110 @@
+import copy
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+import joblib
+
+# Absolute path, so it resolves the same whether the app runs from backend/ or the project root
+MODEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models', 'rf_model.pkl'))
+
+# -------------------------------
+# In-Process Model Registry
+# -------------------------------
+class ModelRegistry:
+    """Loads each model file once per process and reloads it only when it changes.
+
+    A cheap os.stat() per lookup detects a newly published file (mtime, size and
+    inode all change on an atomic rename), so requests never pay joblib.load()
+    for an unchanged model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # abs path -> {'model', 'signature', 'version', 'loaded_at'}
+
+    @staticmethod
+    def _signature(path):
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def get(self, path=MODEL_PATH):
+        """Return the current model at `path` (None if there is no model file)"""
+        path = os.path.abspath(path)
+        try:
+            signature = self._signature(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+
+        entry = self._entries.get(path)
+        if entry and entry['signature'] == signature:
+            return entry['model']
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry['signature'] == signature:
+                return entry['model']
+            model = joblib.load(path)
+            self._entries[path] = {
+                'model': model,
+                'signature': signature,
+                'version': getattr(model, 'spas_version_', None) or f"legacy-{signature[0]}",
+                'loaded_at': datetime.now().isoformat(timespec='seconds')
+            }
+            return model
+
+    def info(self, path=MODEL_PATH):
+        """Version and load time of the model currently cached for `path`"""
+        path = os.path.abspath(path)
+        if self.get(path) is None:
+            return None
+        entry = self._entries[path]
+        return {
+            'path': path,
+            'version': entry['version'],
+            'loaded_at': entry['loaded_at'],
+            'file_mtime': datetime.fromtimestamp(entry['signature'][0] / 1e9).isoformat(timespec='seconds')
+        }
+
+    def publish(self, model, path=MODEL_PATH, version=None):
+        """Atomically write a new model: dump to a temp file in the same folder, then rename.
+
+        Readers see either the old file or the new one, never a half-written pickle.
+        The caller's object is never modified: a model that does not already carry
+        `version` is stamped on a shallow copy. Returns the published version.
+        """
+        path = os.path.abspath(path)
+        version = version or getattr(model, 'spas_version_', None) or new_model_version()
+        if getattr(model, 'spas_version_', None) != version:
+            model = copy.copy(model)  # the estimator may be shared, e.g. cached by this registry
+            model.spas_version_ = version
+
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.rf_model-', suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump(model, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return version
+
+def new_model_version():
+    return datetime.now().strftime('%Y%m%d%H%M%S%f')
+
+registry = ModelRegistry()
+
+def load_model(path=MODEL_PATH):
+    return registry.get(path)
+
+def publish_model(model, path=MODEL_PATH, version=None):
+    return registry.publish(model, path, version)
+
+def model_info(path=MODEL_PATH):
+    return registry.info(path)
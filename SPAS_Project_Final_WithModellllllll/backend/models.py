@@ -28,6 +28,14 @@ class Student(db.Model):
 # ------------------ PERFORMANCE MODEL ------------------
 class Performance(db.Model):
     __tablename__ = 'performances'
+    __table_args__ = (
+        # One record per student, subject and test date (the bulk upsert conflict key)
+        db.Index(
+            'uq_performance_student_subject_date',
+            'student_enrollment_no', 'subject', 'date',
+            unique=True
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_enrollment_no = db.Column(
@@ -41,6 +49,77 @@ class Performance(db.Model):
     def __repr__(self):
         return f"<Performance {self.subject} - {self.marks}>"
 
+# ------------------ STUDENT FEATURE MODEL ------------------
+class StudentFeature(db.Model):
+    __tablename__ = 'student_features'
+
+    # Per-student model inputs, refreshed only for students touched by an import/delete
+    enrollment_no = db.Column(
+        db.String(50), db.ForeignKey('students.enrollment_no'), primary_key=True
+    )
+    avg_marks = db.Column(db.Float, nullable=False)
+    avg_attendance = db.Column(db.Float, nullable=False)
+    avg_assign_ratio = db.Column(db.Float, nullable=False, default=0.0)
+    subject_mix = db.Column(db.Text, nullable=False, default='{}')  # JSON {"sub_maths": 0.5, ...}
+    test_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StudentFeature {self.enrollment_no}>"
+
+# ------------------ PERFORMANCE ROLLUP MODEL ------------------
+class PerformanceRollup(db.Model):
+    __tablename__ = 'performance_rollups'
+
+    # Sums of performances per (department, college, subject, month), kept in step
+    # by the import and delete paths. Any coarser rollup (per department, per month,
+    # per college in one department, ...) is a SUM over these rows.
+    department = db.Column(db.String(100), primary_key=True)
+    college = db.Column(db.String(150), primary_key=True)
+    subject = db.Column(db.String(100), primary_key=True)
+    month = db.Column(db.String(7), primary_key=True)  # 'YYYY-MM', '' when undated
+    test_count = db.Column(db.Integer, nullable=False, default=0)
+    marks_sum = db.Column(db.Float, nullable=False, default=0.0)
+    marks_sq_sum = db.Column(db.Float, nullable=False, default=0.0)
+    attendance_sum = db.Column(db.Float, nullable=False, default=0.0)
+    attendance_sq_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<PerformanceRollup {self.department}/{self.college}/{self.subject}/{self.month}>"
+
+# ------------------ PREDICTION MODEL ------------------
+class Prediction(db.Model):
+    __tablename__ = 'predictions'
+
+    # Batch-scored after every retrain; only the current model version's rows are kept
+    student_enrollment_no = db.Column(
+        db.String(50), db.ForeignKey('students.enrollment_no'), primary_key=True
+    )
+    model_version = db.Column(db.String(50), primary_key=True)
+    predicted_marks = db.Column(db.Float, nullable=False)
+    scored_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Prediction {self.student_enrollment_no} - {self.predicted_marks}>"
+
+# ------------------ ALERT MODEL ------------------
+class Alert(db.Model):
+    __tablename__ = 'alerts'
+
+    # Students currently at risk: stored prediction (or average, when not scored yet)
+    # below the alert threshold. Re-evaluated for the students an import touched and
+    # for everyone after a retrain; rows are removed once a student recovers.
+    student_enrollment_no = db.Column(
+        db.String(50), db.ForeignKey('students.enrollment_no'), primary_key=True
+    )
+    predicted_marks = db.Column(db.Float, nullable=False)
+    threshold = db.Column(db.Float, nullable=False)
+    first_seen = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_seen = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Alert {self.student_enrollment_no} - {self.predicted_marks}>"
+
 # ------------------ USER MODEL ------------------
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
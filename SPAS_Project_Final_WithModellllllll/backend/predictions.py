@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert
+
+from backend.models import db, Prediction
+from backend.analytics import predict_for_aggregated
+from backend.features import feature_frame
+from backend.model_registry import MODEL_PATH, model_info
+
+# -------------------------------
+# Config
+# -------------------------------
+SCORE_CHUNK_SIZE = 500  # enrollment numbers per IN (...) query
+
+# -------------------------------
+# Batch Scoring
+# -------------------------------
+def _prediction_rows(features, version, model_path):
+    scored = predict_for_aggregated(features, model_path).dropna(subset=['predicted_marks'])
+    scored_at = datetime.utcnow()
+    return [
+        {
+            'student_enrollment_no': enrollment_no,
+            'model_version': version,
+            'predicted_marks': float(predicted),
+            'scored_at': scored_at
+        }
+        for enrollment_no, predicted in zip(scored['enrollment_no'], scored['predicted_marks'])
+    ]
+
+def score_all_students(model_path=MODEL_PATH):
+    """Run predict_for_aggregated() over every student and store the results.
+
+    Replaces the predictions table with one row per student for the current model
+    version, so dashboards, alerts and charts read predictions with a join instead
+    of running inference per request. The caller commits.
+    Returns (model_version, students_scored).
+    """
+    info = model_info(model_path)
+    if info is None:
+        return None, 0
+
+    features = feature_frame()
+    if features.empty:
+        return info['version'], 0
+
+    rows = _prediction_rows(features, info['version'], model_path)
+
+    # Swap old versions for the new scores in the same transaction
+    db.session.query(Prediction).delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(Prediction), rows)
+    return info['version'], len(rows)
+
+def score_students(enrollment_nos, model_path=None):
+    """Re-score just these students with the current model (call inside the writing transaction).
+
+    An import changes the touched students' features, so their stored predictions
+    are replaced before alerts are evaluated. Without a loadable model their old
+    predictions are dropped and they fall back to their actual average.
+    Returns the number of students scored.
+    """
+    model_path = model_path or current_app.config.get('MODEL_PATH', MODEL_PATH)
+    try:
+        info = model_info(model_path)
+    except Exception as e:
+        print(f"⚠️ Could not load model: {e}")
+        info = None
+
+    scored = 0
+    enrollment_nos = list(dict.fromkeys(enrollment_nos))
+    for start in range(0, len(enrollment_nos), SCORE_CHUNK_SIZE):
+        chunk = enrollment_nos[start:start + SCORE_CHUNK_SIZE]
+        db.session.query(Prediction).filter(
+            Prediction.student_enrollment_no.in_(chunk)
+        ).delete(synchronize_session=False)
+        if info is None:
+            continue
+        features = feature_frame(chunk)
+        rows = _prediction_rows(features, info['version'], model_path) if not features.empty else []
+        if rows:
+            db.session.execute(insert(Prediction), rows)
+        scored += len(rows)
+    return scored
@@ -0,0 +1,157 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import g, request, session
+
+# -------------------------------
+# Config
+# -------------------------------
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'profiles')
+PROFILE_RING_SIZE = 50        # profiles kept on disk; the oldest are deleted beyond this
+PROFILE_TOP_FUNCTIONS = 15    # cumulative-time rows kept in each summary
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_FLAG = '_profile'
+
+_PROFILE_ID = re.compile(r'^[0-9T]+-[0-9a-f]{8}$')
+
+# -------------------------------
+# Summaries
+# -------------------------------
+def top_functions(profile, limit=PROFILE_TOP_FUNCTIONS):
+    """[{function, calls, total_ms, cumulative_ms}] sorted by cumulative time"""
+    stats = pstats.Stats(profile, stream=io.StringIO()).sort_stats('cumulative')
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, calls, total, cumulative, _ = stats.stats[func]
+        filename, line, name = func
+        rows.append({
+            'function': f'{name} ({os.path.basename(filename)}:{line})' if line else name,
+            'calls': calls,
+            'total_ms': round(total * 1000, 2),
+            'cumulative_ms': round(cumulative * 1000, 2)
+        })
+    return rows
+
+# -------------------------------
+# Ring Buffer of Profiles
+# -------------------------------
+class RequestProfiler:
+    """cProfile for single requests, kept as <id>.prof + <id>.json in a bounded directory.
+
+    A streamed body (CSV export, report ZIP) is profiled up to its first byte.
+    A request whose view raises is not recorded, but its profiler is still
+    switched off at teardown so the worker thread does not stay profiled.
+    """
+
+    def __init__(self, directory=PROFILE_DIR, ring_size=PROFILE_RING_SIZE):
+        self.directory = directory
+        self.ring_size = ring_size
+        self.lock = threading.Lock()
+
+    # ---------- recording ----------
+    def start(self):
+        """Profile the current request (the caller checked it is an admin asking for it)"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return False  # another profiler is already active on this thread
+        g.request_profile = (profile, time.perf_counter())
+        return True
+
+    def finish(self, response):
+        state = g.pop('request_profile', None)
+        if state is None:
+            return response
+        profile, started = state
+        profile.disable()
+        profile_id = self.save(profile, {
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'user': session.get('username'),
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+        })
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    def stop(self, exc=None):
+        """teardown_request: switch off a profiler that finish() never reached"""
+        state = g.pop('request_profile', None)
+        if state is not None:
+            state[0].disable()
+
+    def save(self, profile, meta):
+        """Write the raw stats and a JSON summary, then trim the ring; returns the profile id"""
+        os.makedirs(self.directory, exist_ok=True)
+        now = datetime.now()
+        profile_id = f"{now.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+        profile.dump_stats(os.path.join(self.directory, f'{profile_id}.prof'))
+        summary = {
+            'id': profile_id,
+            'created_at': now.isoformat(timespec='seconds'),
+            **meta,
+            'top_functions': top_functions(profile)
+        }
+        with open(os.path.join(self.directory, f'{profile_id}.json'), 'w') as f:
+            json.dump(summary, f)
+        self.trim()
+        return profile_id
+
+    def trim(self):
+        with self.lock:
+            for profile_id in self.ids()[self.ring_size:]:
+                for ext in ('.prof', '.json'):
+                    try:
+                        os.remove(os.path.join(self.directory, profile_id + ext))
+                    except FileNotFoundError:
+                        pass  # trimmed by another worker
+
+    # ---------- reads ----------
+    def ids(self):
+        """Stored profile ids, newest first (ids sort by creation time)"""
+        names = os.listdir(self.directory) if os.path.isdir(self.directory) else []
+        return sorted((n[:-5] for n in names if n.endswith('.json') and _PROFILE_ID.match(n[:-5])), reverse=True)
+
+    def recent(self, limit=None):
+        summaries = []
+        for profile_id in self.ids()[:limit]:
+            try:
+                with open(os.path.join(self.directory, f'{profile_id}.json')) as f:
+                    summaries.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue  # trimmed or half-written
+        return summaries
+
+    def path(self, profile_id):
+        """Raw .prof path for a stored id, None for anything else"""
+        if not _PROFILE_ID.match(profile_id or ''):
+            return None
+        path = os.path.join(self.directory, f'{profile_id}.prof')
+        return path if os.path.exists(path) else None
+
+def profile_requested():
+    """The header or query flag that asks for this request to be profiled"""
+    flag = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_FLAG)
+    return flag not in (None, '', '0', 'false')
+
+def init_request_profiler(app):
+    """Attach the on-demand profiler to the app (app.extensions['request_profiler'])"""
+    profiler = RequestProfiler(
+        directory=app.config.get('PROFILE_DIR', PROFILE_DIR),
+        ring_size=app.config.get('PROFILE_RING_SIZE', PROFILE_RING_SIZE)
+    )
+    app.after_request(profiler.finish)
+    app.teardown_request(profiler.stop)
+    app.extensions['request_profiler'] = profiler
+    return profiler
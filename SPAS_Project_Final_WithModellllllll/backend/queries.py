@@ -0,0 +1,338 @@
+import base64
+import json
+
+from sqlalchemy import func, case, and_, or_, select
+from backend.models import db, Student, Performance, Prediction
+from backend.search import student_search_clause
+
+# Per-student aggregate expressions (valid inside a query grouped by student)
+AVG_MARKS = func.coalesce(func.avg(Performance.marks), 0)
+AVG_ATTENDANCE = func.coalesce(func.avg(Performance.attendance), 0)
+TOTAL_TESTS = func.count(Performance.id)
+
+# performance_status() bands as [low, high) ranges on the average mark
+STATUS_RANGES = {
+    'Excellent': (75, None),
+    'Good': (60, 75),
+    'Average': (40, 60),
+    'Needs Improvement': (None, 40)
+}
+
+# /api/students sort keys; column keys go in WHERE, aggregate keys in HAVING
+SORT_KEYS = {
+    'enrollment': Student.enrollment_no,
+    'name': Student.name,
+    'email': Student.email,
+    'department': func.coalesce(Student.department, ''),
+    'college': func.coalesce(Student.college, ''),
+    'semester': func.coalesce(Student.semester, ''),
+    'avg_marks': AVG_MARKS,
+    'avg_attendance': AVG_ATTENDANCE,
+    'total_tests': TOTAL_TESTS
+}
+AGGREGATE_SORT_KEYS = {'avg_marks', 'avg_attendance', 'total_tests'}
+
+FILTER_COLUMNS = ('college', 'department', 'semester')
+MARKS_BINS = [0, 40, 50, 60, 70, 80, 90, 100]
+
+# -------------------------------
+# Current Predictions
+# -------------------------------
+def current_predictions():
+    """Predictions reduced to exactly one row per student (its latest scoring run).
+
+    The predictions key is (student, model_version), so outer-joining the table
+    itself would repeat a student's performance rows once per stored version.
+    """
+    latest = (
+        select(Prediction.student_enrollment_no, func.max(Prediction.scored_at).label('scored_at'))
+        .group_by(Prediction.student_enrollment_no)
+        .subquery()
+    )
+    return (
+        select(Prediction.student_enrollment_no.label('enrollment_no'),
+               func.max(Prediction.predicted_marks).label('predicted_marks'))
+        .join(latest, and_(latest.c.student_enrollment_no == Prediction.student_enrollment_no,
+                           latest.c.scored_at == Prediction.scored_at))
+        .group_by(Prediction.student_enrollment_no)
+        .subquery('current_predictions')
+    )
+
+CURRENT_PREDICTIONS = current_predictions()
+
+# -------------------------------
+# Scope Filters
+# -------------------------------
+def student_scope_clauses(scope=None):
+    """Translate a {'department': ..., 'college': ...} scope into Student filter clauses"""
+    return [getattr(Student, column) == value for column, value in (scope or {}).items()]
+
+# -------------------------------
+# Per-Student Aggregates (one GROUP BY)
+# -------------------------------
+def student_aggregate_query(scope=None):
+    """Students LEFT JOIN performances grouped per student: averages and test counts in SQL"""
+    return (
+        db.session.query(
+            Student.enrollment_no,
+            Student.name,
+            Student.email,
+            Student.department,
+            Student.college,
+            Student.semester,
+            AVG_MARKS.label('avg_marks'),
+            AVG_ATTENDANCE.label('avg_attendance'),
+            TOTAL_TESTS.label('total_tests'),
+            func.max(CURRENT_PREDICTIONS.c.predicted_marks).label('predicted_marks')
+        )
+        .outerjoin(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+        .outerjoin(CURRENT_PREDICTIONS, CURRENT_PREDICTIONS.c.enrollment_no == Student.enrollment_no)
+        .filter(*student_scope_clauses(scope))
+        .group_by(Student.enrollment_no)
+        .order_by(Student.enrollment_no)
+    )
+
+def status_clause(status, expression=AVG_MARKS):
+    """HAVING clause for one performance_status() label"""
+    if status not in STATUS_RANGES:
+        raise ValueError(f"Unknown status: {status}")
+    low, high = STATUS_RANGES[status]
+    clauses = []
+    if low is not None:
+        clauses.append(expression >= low)
+    if high is not None:
+        clauses.append(expression < high)
+    return and_(*clauses)
+
+def filtered_student_query(scope, filters=None, q=''):
+    """student_aggregate_query() narrowed by college/department/semester/status and search"""
+    filters = filters or {}
+    query = student_aggregate_query(scope).order_by(None)
+    query = query.filter(*[getattr(Student, column) == filters[column]
+                           for column in FILTER_COLUMNS if filters.get(column)])
+    if q:
+        query = query.filter(student_search_clause(q))
+    if filters.get('status'):
+        query = query.having(status_clause(filters['status']))
+    return query
+
+# -------------------------------
+# Keyset Pagination
+# -------------------------------
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor):
+    """[sort value, enrollment_no] from an opaque cursor; ValueError if it was tampered with"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Invalid cursor")
+    return values
+
+def student_page(scope, filters=None, q='', sort='enrollment', descending=False, after=None, limit=50):
+    """One keyset page of student_summary() rows plus the cursor for the next page.
+
+    Rows are ordered by (sort key, enrollment_no); the cursor carries the last
+    row's pair, so each page is a range scan instead of an OFFSET.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    key = SORT_KEYS[sort]
+    query = filtered_student_query(scope, filters, q)
+
+    if after:
+        value, enrollment_no = decode_cursor(after)
+        if descending:
+            clause = or_(key < value, and_(key == value, Student.enrollment_no < enrollment_no))
+        else:
+            clause = or_(key > value, and_(key == value, Student.enrollment_no > enrollment_no))
+        query = query.having(clause) if sort in AGGREGATE_SORT_KEYS else query.filter(clause)
+
+    if descending:
+        query = query.order_by(key.desc(), Student.enrollment_no.desc())
+    else:
+        query = query.order_by(key.asc(), Student.enrollment_no.asc())
+
+    rows = query.add_columns(key.label('sort_value')).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].sort_value, rows[-1].enrollment_no])
+    return [student_summary(row) for row in rows], next_cursor
+
+# -------------------------------
+# Filtered Overview (statistics + chart series)
+# -------------------------------
+def student_overview(scope, filters=None, q='', scatter_limit=1000, include_charts=True):
+    """Statistics and chart series for the filtered students, aggregated in SQL.
+
+    With include_charts=False only the statistics are computed; the dashboard
+    loads each chart separately from /api/charts/<name>.
+    """
+    per_student = filtered_student_query(scope, filters, q).subquery()
+    avg_marks, avg_attendance = per_student.c.avg_marks, per_student.c.avg_attendance
+
+    totals = db.session.execute(select(
+        func.count(),
+        func.avg(avg_marks),
+        func.avg(avg_attendance),
+        *[func.sum(case((status_clause(status, avg_marks), 1), else_=0)) for status in STATUS_RANGES],
+        # Same buckets as the browser histogram: [low, high), with 100 in the last one
+        *[func.sum(case((and_(avg_marks >= low, avg_marks < high if high < 100 else avg_marks <= high), 1), else_=0))
+          for low, high in zip(MARKS_BINS, MARKS_BINS[1:])]
+    )).one()
+    total = totals[0]
+    status_counts = dict(zip(STATUS_RANGES, (int(v or 0) for v in totals[3:3 + len(STATUS_RANGES)])))
+    bin_counts = [int(v or 0) for v in totals[3 + len(STATUS_RANGES):]]
+    statistics = {
+        'total_students': total,
+        'avg_marks': round(totals[1] or 0, 2),
+        'avg_attendance': round(totals[2] or 0, 2),
+        'status_counts': status_counts
+    }
+    if not include_charts:
+        return {'statistics': statistics}
+
+    def grouped(column):
+        rows = db.session.execute(
+            select(func.coalesce(column, 'Unknown').label('label'), func.avg(avg_marks),
+                   func.avg(avg_attendance), func.count())
+            .group_by('label').order_by('label')
+        ).all()
+        return {
+            'labels': [r[0] for r in rows],
+            'avg_marks': [round(r[1], 2) for r in rows],
+            'avg_attendance': [round(r[2], 2) for r in rows],
+            'student_count': [r[3] for r in rows]
+        }
+
+    top = db.session.execute(
+        select(per_student.c.name, avg_marks, avg_attendance)
+        .order_by(avg_marks.desc(), per_student.c.enrollment_no).limit(10)
+    ).all()
+    scatter = db.session.execute(
+        select(per_student.c.name, avg_attendance, avg_marks)
+        .order_by(per_student.c.enrollment_no).limit(scatter_limit)
+    ).all()
+
+    return {
+        'statistics': statistics,
+        'charts': {
+            'department': grouped(per_student.c.department),
+            'college': grouped(per_student.c.college),
+            'semester': grouped(per_student.c.semester),
+            'marks_distribution': {
+                'labels': [f"{low}-{high}" for low, high in zip(MARKS_BINS, MARKS_BINS[1:])],
+                'counts': bin_counts
+            },
+            'top_students': {
+                'labels': [r[0] for r in top],
+                'avg_marks': [round(r[1], 2) for r in top],
+                'avg_attendance': [round(r[2], 2) for r in top]
+            },
+            # Capped: a scatter of every student would ship the whole dataset again
+            'attendance_correlation': {
+                'students': [r[0] for r in scatter],
+                'attendance': [round(r[1], 2) for r in scatter],
+                'marks': [round(r[2], 2) for r in scatter],
+                'total': total
+            }
+        }
+    }
+
+def filter_options(scope):
+    """Distinct departments, colleges and semesters in scope, for the dashboard filter menus"""
+    def distinct(column):
+        values = (
+            db.session.query(column).filter(*student_scope_clauses(scope))
+            .filter(column.isnot(None), column != '', column != 'N/A').distinct().all()
+        )
+        return sorted(v[0] for v in values)
+    return distinct(Student.department), distinct(Student.college), distinct(Student.semester)
+
+def student_export_query(q=''):
+    """One GROUP BY row per student, in the /export/students.csv column order"""
+    query = (
+        db.session.query(
+            Student.enrollment_no,
+            Student.name,
+            func.coalesce(Student.email, '').label('email'),
+            func.coalesce(Student.college, '').label('college'),
+            func.coalesce(Student.department, '').label('department'),
+            func.coalesce(Student.semester, '').label('semester'),
+            func.coalesce(func.avg(Performance.marks), 0.0).label('avg_marks'),
+            func.coalesce(func.avg(Performance.attendance), 0.0).label('avg_attendance'),
+            func.count(Performance.id).label('performance_records_count')
+        )
+        .outerjoin(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+        .group_by(Student.enrollment_no)
+        .order_by(Student.enrollment_no)
+    )
+    if q:
+        query = query.filter(student_search_clause(q))
+    return query
+
+def performance_detail_query(scope=None):
+    """Every performance row joined with its student's details, for the analytics charts"""
+    return (
+        db.session.query(
+            Student.enrollment_no,
+            Student.name,
+            Student.department,
+            Student.college,
+            Performance.subject,
+            Performance.marks,
+            Performance.attendance,
+            Performance.date,
+            Student.semester
+        )
+        .join(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+        .filter(*student_scope_clauses(scope))
+    )
+
+# -------------------------------
+# Status Labels
+# -------------------------------
+def performance_status(avg_marks):
+    """Return (label, color) for an average mark"""
+    if avg_marks >= 75:
+        return "Excellent", "#00ff99"
+    elif avg_marks >= 60:
+        return "Good", "#58a6ff"
+    elif avg_marks >= 40:
+        return "Average", "#ffaa00"
+    return "Needs Improvement", "#ff4444"
+
+def attendance_status(avg_attendance):
+    """Return (label, color) for an average attendance"""
+    if avg_attendance >= 80:
+        return "Good", "#00ff99"
+    elif avg_attendance >= 60:
+        return "Average", "#ffaa00"
+    return "Poor", "#ff4444"
+
+def student_summary(row):
+    """Build the dashboard's per-student dict from a student_aggregate_query() row"""
+    performance_label, status_color = performance_status(row.avg_marks)
+    attendance_label, attendance_color = attendance_status(row.avg_attendance)
+    return {
+        "enrollment": row.enrollment_no,
+        "name": row.name,
+        "email": row.email,
+        "department": row.department,
+        "college": row.college,
+        "semester": row.semester,
+        "avg_marks": round(row.avg_marks, 2),
+        "avg_attendance": round(row.avg_attendance, 2),
+        "performance_status": performance_label,
+        "status_color": status_color,
+        "attendance_status": attendance_label,
+        "attendance_color": attendance_color,
+        "total_tests": row.total_tests,
+        # Stored batch prediction; students not scored yet fall back to their actual average
+        "predicted_marks": round(row.predicted_marks, 2) if row.predicted_marks is not None else round(row.avg_marks, 2),
+        "has_prediction": row.predicted_marks is not None
+    }
@@ -0,0 +1,199 @@
+import hashlib
+import io
+import multiprocessing
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from backend.models import db, Student, Performance, StudentFeature
+
+# -------------------------------
+# Config
+# -------------------------------
+DEFAULT_REPORT_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+INLINE_REPORT_LIMIT = 20    # smaller batches render in-process (a pool costs ~1s to start)
+REPORT_CHUNK_SIZE = 16      # reports per task sent to a worker
+REPORT_TASKS_PER_WORKER = 2  # chunks queued per worker; more are submitted as results are consumed
+REPORT_SCOPE_COLUMNS = ('department', 'college', 'semester')
+
+# -------------------------------
+# Rendering
+# -------------------------------
+def render_student_report(student, performances):
+    """One student's PDF as bytes.
+
+    `student` is a dict (enrollment_no, name, department, college, semester) and
+    `performances` a list of (subject, marks, attendance, date) tuples, so this
+    runs in a worker process without a database session.
+    """
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    p.setFont('Helvetica', 12)
+    p.drawString(50, 750, f"Student Performance Report - {student['name']} ({student['enrollment_no']})")
+    p.drawString(50, 732, f"{student['department']} | {student['college']} | Semester {student['semester']}")
+    y = 705
+    for subject, marks, attendance, date in performances:
+        p.drawString(50, y, f'Subject: {subject} | Marks: {marks} | Attendance: {attendance} | Date: {date}')
+        y -= 20
+        if y < 50:
+            p.showPage()
+            p.setFont('Helvetica', 12)
+            y = 750
+    if not performances:
+        p.drawString(50, y, 'No performance records yet.')
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+def _render(item):
+    student, performances = item
+    return student['enrollment_no'], render_student_report(student, performances)
+
+def _render_chunk(items):
+    return [_render(item) for item in items]
+
+# -------------------------------
+# Selection
+# -------------------------------
+def report_cohort(scope=None):
+    """Every student in a department/college/semester scope with all their performances.
+
+    One students LEFT JOIN performances query; returns [(student, performances)]
+    ordered by enrollment number, ready to hand to worker processes.
+    """
+    rows = (
+        db.session.query(
+            Student.enrollment_no, Student.name, Student.department, Student.college, Student.semester,
+            Performance.subject, Performance.marks, Performance.attendance, Performance.date
+        )
+        .outerjoin(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+        .filter(*[getattr(Student, column) == value for column, value in (scope or {}).items()])
+        .order_by(Student.enrollment_no, Performance.date, Performance.id)
+    )
+    cohort = []
+    for row in rows:
+        if not cohort or cohort[-1][0]['enrollment_no'] != row.enrollment_no:
+            cohort.append(({
+                'enrollment_no': row.enrollment_no, 'name': row.name, 'department': row.department,
+                'college': row.college, 'semester': row.semester
+            }, []))
+        if row.subject is not None:
+            cohort[-1][1].append((row.subject, row.marks, row.attendance, str(row.date)))
+    return cohort
+
+def report_version(enrollment_no):
+    """(enrollment_no, name, department, college, semester, updated_at) for a student, None if unknown.
+
+    updated_at is when the student's performances were last written: imports and
+    deletes refresh the student's feature row. It is None for a student without
+    performances.
+    """
+    return (
+        db.session.query(Student.enrollment_no, Student.name, Student.department, Student.college,
+                         Student.semester, StudentFeature.updated_at)
+        .outerjoin(StudentFeature, StudentFeature.enrollment_no == Student.enrollment_no)
+        .filter(Student.enrollment_no == enrollment_no)
+        .first()
+    )
+
+def report_etag(version):
+    """ETag covering everything render_student_report() prints for a report_version() row.
+
+    The student's details are hashed in because an upload can change them
+    without touching the performances (and so without moving updated_at).
+    """
+    updated_at = version.updated_at.strftime('%Y%m%d%H%M%S%f') if version.updated_at else 'empty'
+    details = '\x1f'.join(str(value) for value in (
+        version.name, version.department, version.college, version.semester, updated_at
+    ))
+    return f"{version.enrollment_no}-{hashlib.sha1(details.encode()).hexdigest()[:16]}"
+
+def student_report_pdf(enrollment_no):
+    """One student's report, rendered in-process"""
+    cohort = report_cohort({'enrollment_no': enrollment_no})
+    return render_student_report(*cohort[0]) if cohort else None
+
+# -------------------------------
+# Batch Rendering
+# -------------------------------
+def render_reports(cohort, workers=DEFAULT_REPORT_WORKERS, progress=None):
+    """Yield (enrollment_no, pdf_bytes) in cohort order, rendering across a process pool.
+
+    `progress(done, total)` is called after every report. Closing the generator
+    early (e.g. the client dropped a download) cancels the outstanding work.
+    """
+    total = len(cohort)
+    if workers <= 1 or total <= INLINE_REPORT_LIMIT:
+        results, executor = map(_render, cohort), None
+    else:
+        # spawn: a fresh interpreter, safe next to the web server's threads
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        results = _windowed(executor, cohort, workers * REPORT_TASKS_PER_WORKER)
+    try:
+        for done, result in enumerate(results, start=1):
+            yield result
+            if progress:
+                progress(done, total)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def _windowed(executor, cohort, window):
+    """Render chunks with at most `window` submitted at once, in cohort order.
+
+    Unlike executor.map, a slow consumer (a client reading a ZIP) never has
+    every rendered PDF of a large cohort waiting in memory.
+    """
+    chunks = (cohort[start:start + REPORT_CHUNK_SIZE] for start in range(0, len(cohort), REPORT_CHUNK_SIZE))
+    pending = deque(executor.submit(_render_chunk, chunk) for chunk in islice(chunks, window))
+    while pending:
+        rendered = pending.popleft().result()
+        for chunk in islice(chunks, 1):
+            pending.append(executor.submit(_render_chunk, chunk))
+        yield from rendered
+
+def write_reports(cohort, directory, workers=DEFAULT_REPORT_WORKERS, progress=None):
+    """Render a cohort into `directory` as <enrollment_no>_report.pdf; returns the count"""
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for enrollment_no, pdf in render_reports(cohort, workers, progress):
+        with open(os.path.join(directory, f'{enrollment_no}_report.pdf'), 'wb') as f:
+            f.write(pdf)
+        count += 1
+    return count
+
+class _ZipStream(io.RawIOBase):
+    """Write-only sink that hands zipfile's output to a generator as it is produced"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+def stream_reports_zip(cohort, workers=DEFAULT_REPORT_WORKERS, progress=None):
+    """Yield a ZIP of the cohort's reports chunk by chunk, one PDF at a time.
+
+    The archive is never held in memory: zipfile writes to an unseekable stream
+    (data descriptors instead of seeking back), and each finished entry is
+    flushed to the caller. PDFs are already compressed, so entries are stored.
+    """
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for enrollment_no, pdf in render_reports(cohort, workers, progress):
+            archive.writestr(f'{enrollment_no}_report.pdf', pdf)
+            yield sink.drain()
+    yield sink.drain()
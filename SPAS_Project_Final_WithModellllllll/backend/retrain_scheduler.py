@@ -0,0 +1,220 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from backend.models import db, Performance
+from backend.database import make_engine
+from backend.analytics import train_model_from_features
+from backend.features import read_feature_frame
+from backend.model_registry import MODEL_PATH, model_info
+from backend.predictions import score_all_students
+from backend.alerts import evaluate_alerts
+
+# -------------------------------
+# Config
+# -------------------------------
+DEFAULT_RETRAIN_DEBOUNCE_SECONDS = 30     # requests inside this window share one training
+DEFAULT_RETRAIN_MIN_CHANGE_FRACTION = 0.05  # skip when fewer rows than this changed
+MIN_TRAINING_RECORDS = 5
+STALE_LOCK_SECONDS = 3600
+
+# -------------------------------
+# Training Process
+# -------------------------------
+def _acquire_training_lock(model_path):
+    """Cross-process guard so several app workers never train over the same pickle"""
+    lock_path = model_path + '.lock'
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    try:
+        if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_SECONDS:
+            os.remove(lock_path)  # left behind by a crashed trainer
+    except OSError:
+        pass
+    try:
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return lock_path
+    except FileExistsError:
+        return None
+
+def train_in_subprocess(database_uri, model_path):
+    """Runs in the training process: read the feature store, fit, publish.
+
+    Returns (version, mse, students); version is None when nothing was trained.
+    """
+    lock_path = _acquire_training_lock(model_path)
+    if lock_path is None:
+        return None, None, 0
+    try:
+        engine = make_engine(database_uri)
+        try:
+            with engine.connect() as connection:
+                features = read_feature_frame(connection)
+        finally:
+            engine.dispose()
+        model, mse = train_model_from_features(features, model_path)
+        if model is None:
+            return None, None, len(features)
+        return model.spas_version_, mse, len(features)
+    finally:
+        os.remove(lock_path)
+
+# -------------------------------
+# Scheduler
+# -------------------------------
+class RetrainScheduler:
+    """Coalesces retrain requests and runs at most one training at a time.
+
+    The first request opens a window of `debounce_seconds`; every request that
+    arrives before it closes joins the same run. Training happens in a separate
+    process so it neither blocks web workers nor holds the GIL. Runs where the
+    changed rows are below `min_change_fraction` of all rows are skipped (the
+    change count keeps accumulating), unless forced from the admin page.
+    """
+
+    def __init__(self, app, debounce_seconds=DEFAULT_RETRAIN_DEBOUNCE_SECONDS,
+                 min_change_fraction=DEFAULT_RETRAIN_MIN_CHANGE_FRACTION):
+        self.app = app
+        self.debounce_seconds = debounce_seconds
+        self.min_change_fraction = min_change_fraction
+        self.lock = threading.Lock()
+        self.pending_rows = 0
+        self.force = False
+        self.timer = None
+        self.next_run_at = None
+        self.running = False
+        self.rerun = False
+        self.last_run = None
+        self.executor = None
+
+    # ---------- public API ----------
+    def request(self, changed_rows=0, force=False, delay=None):
+        """Ask for a retrain after `changed_rows` rows were written"""
+        with self.lock:
+            self.pending_rows += changed_rows
+            self.force = self.force or force
+            if self.running:
+                self.rerun = True
+            elif self.timer is None or delay is not None:
+                self._schedule(self.debounce_seconds if delay is None else delay)
+
+    def status(self):
+        with self.lock:
+            return {
+                'pending_rows': self.pending_rows,
+                'running': self.running,
+                'next_run_at': self.next_run_at,
+                'debounce_seconds': self.debounce_seconds,
+                'min_change_fraction': self.min_change_fraction,
+                'last_run': dict(self.last_run) if self.last_run else None
+            }
+
+    def wait(self, timeout=60):
+        """Block until nothing is scheduled or running (tests and CLI use)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self.lock:
+                if not self.running and self.timer is None:
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def shutdown(self):
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+        if self.executor:
+            self.executor.shutdown(wait=True)
+
+    # ---------- internals ----------
+    def _schedule(self, delay):
+        if self.timer:
+            self.timer.cancel()
+        self.timer = threading.Timer(delay, self._run)
+        self.timer.daemon = True
+        self.next_run_at = (datetime.now() + timedelta(seconds=delay)).isoformat(timespec='seconds')
+        self.timer.start()
+
+    def _finish(self, outcome, **details):
+        self.last_run = {'outcome': outcome, 'finished_at': datetime.now().isoformat(timespec='seconds'), **details}
+        print(f"🧠 Retrain {outcome}: {details}")
+
+    def _run(self):
+        with self.lock:
+            self.timer = None
+            self.next_run_at = None
+            self.running = True
+            changed, force = self.pending_rows, self.force
+
+        claimed = False  # this run took the force flag; handed back unless it trains
+        try:
+            with self.app.app_context():
+                model_path = self.app.config.get('MODEL_PATH', MODEL_PATH)
+                total_rows = Performance.query.count()
+                db.session.remove()
+
+                if total_rows < MIN_TRAINING_RECORDS:
+                    self._finish('skipped', reason='Not enough data (minimum 5 records required)')
+                elif not force and self._has_model(model_path) and changed < self.min_change_fraction * total_rows:
+                    self._finish('skipped', reason=f'Only {changed} of {total_rows} rows changed',
+                                 changed_rows=changed)
+                else:
+                    with self.lock:
+                        self.force = False
+                    claimed = True
+                    version, mse, students = self._train(model_path)
+                    if version is None:
+                        self._finish('skipped', reason='Another worker is training or too few students')
+                    else:
+                        # Only rows a published model has seen stop counting
+                        with self.lock:
+                            self.pending_rows -= changed
+                        claimed = False
+                        _, scored = score_all_students(model_path)
+                        evaluate_alerts()  # every prediction moved
+                        db.session.commit()
+                        # Every student's predicted marks changed
+                        self.app.extensions['dashboard_cache'].clear()
+                        self._finish('trained', version=version, mse=round(mse, 4),
+                                     students=students, scored=scored, changed_rows=changed)
+        except Exception as e:
+            with self.app.app_context():
+                db.session.rollback()
+            self._finish('failed', error=str(e))
+        finally:
+            with self.app.app_context():
+                db.session.remove()
+            with self.lock:
+                self.force = self.force or (claimed and force)
+                self.running = False
+                if self.rerun:
+                    self.rerun = False
+                    self._schedule(self.debounce_seconds)
+
+    def _has_model(self, model_path):
+        try:
+            return model_info(model_path) is not None
+        except Exception as e:
+            # An unreadable pickle counts as no model, so this run replaces it
+            print(f"⚠️ Could not load model: {e}")
+            return False
+
+    def _train(self, model_path):
+        if self.executor is None:
+            # spawn: a fresh interpreter, safe next to the web server's threads
+            self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        database_uri = self.app.config['SQLALCHEMY_DATABASE_URI']
+        return self.executor.submit(train_in_subprocess, database_uri, model_path).result()
+
+def init_retrain_scheduler(app):
+    """Attach the retrain scheduler to the app (app.extensions['retrain_scheduler'])"""
+    scheduler = RetrainScheduler(
+        app,
+        debounce_seconds=app.config.get('RETRAIN_DEBOUNCE_SECONDS', DEFAULT_RETRAIN_DEBOUNCE_SECONDS),
+        min_change_fraction=app.config.get('RETRAIN_MIN_CHANGE_FRACTION', DEFAULT_RETRAIN_MIN_CHANGE_FRACTION)
+    )
+    app.extensions['retrain_scheduler'] = scheduler
+    return scheduler
@@ -0,0 +1,165 @@
+import math
+from contextlib import contextmanager
+
+import pandas as pd
+from sqlalchemy import func, insert, tuple_, false
+
+from backend.models import db, Student, Performance, PerformanceRollup
+
+# -------------------------------
+# Config
+# -------------------------------
+REFRESH_CHUNK_SIZE = 500  # enrollment numbers / rollup keys per IN (...) query
+
+ROLLUP_KEYS = ['department', 'college', 'subject', 'month']
+ROLLUP_SUMS = ['test_count', 'marks_sum', 'marks_sq_sum', 'attendance_sum', 'attendance_sq_sum']
+ROLLUP_DIMENSIONS = ('department', 'college', 'subject', 'month')
+
+# -------------------------------
+# Contributions
+# -------------------------------
+def _raw_rows(enrollment_nos=None):
+    """students JOIN performances with the rollup keys, optionally limited to some students"""
+    query = (
+        db.session.query(Student.department, Student.college, Performance.subject,
+                         Performance.date, Performance.marks, Performance.attendance)
+        .join(Performance, Performance.student_enrollment_no == Student.enrollment_no)
+    )
+    columns = ['department', 'college', 'subject', 'date', 'marks', 'attendance']
+    if enrollment_nos is None:
+        return pd.DataFrame(query.all(), columns=columns)
+    frames = [
+        pd.DataFrame(query.filter(Student.enrollment_no.in_(enrollment_nos[start:start + REFRESH_CHUNK_SIZE])).all(),
+                     columns=columns)
+        for start in range(0, len(enrollment_nos), REFRESH_CHUNK_SIZE)
+    ]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+def _contributions(enrollment_nos=None):
+    """Rollup sums over the current performances (of these students only, if given)"""
+    raw = _raw_rows(enrollment_nos)
+    if raw.empty:
+        return pd.DataFrame(columns=ROLLUP_SUMS, index=pd.MultiIndex.from_tuples([], names=ROLLUP_KEYS))
+    marks, attendance = raw['marks'].astype(float), raw['attendance'].astype(float)
+    raw = raw.assign(
+        month=pd.to_datetime(raw['date'], errors='coerce').dt.strftime('%Y-%m').fillna(''),
+        test_count=1,
+        marks_sum=marks, marks_sq_sum=marks ** 2,
+        attendance_sum=attendance, attendance_sq_sum=attendance ** 2
+    )
+    return raw.groupby(ROLLUP_KEYS)[ROLLUP_SUMS].sum()
+
+def _stored(keys):
+    """Current rollup rows for these keys"""
+    frames = []
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        chunk = keys[start:start + REFRESH_CHUNK_SIZE]
+        rows = PerformanceRollup.query.filter(
+            tuple_(*(getattr(PerformanceRollup, k) for k in ROLLUP_KEYS)).in_(chunk)
+        ).with_entities(*(getattr(PerformanceRollup, c) for c in ROLLUP_KEYS + ROLLUP_SUMS)).all()
+        frames.append(pd.DataFrame(rows, columns=ROLLUP_KEYS + ROLLUP_SUMS))
+    stored = pd.concat(frames, ignore_index=True)
+    return stored.set_index(ROLLUP_KEYS)
+
+def _apply_delta(delta):
+    """Add `delta` onto the stored rollups; groups left without tests are removed"""
+    # Re-summing unchanged rows can differ in the last bits; that is not a change
+    delta = delta[(delta.abs() > 1e-9).any(axis=1)]
+    if delta.empty:
+        return 0
+    keys = list(delta.index)
+    merged = _stored(keys).reindex(delta.index, fill_value=0).add(delta, fill_value=0)
+
+    for start in range(0, len(keys), REFRESH_CHUNK_SIZE):
+        db.session.query(PerformanceRollup).filter(
+            tuple_(*(getattr(PerformanceRollup, k) for k in ROLLUP_KEYS)).in_(keys[start:start + REFRESH_CHUNK_SIZE])
+        ).delete(synchronize_session=False)
+    rows = merged[merged['test_count'] > 0].reset_index()
+    rows['test_count'] = rows['test_count'].round().astype(int)
+    if not rows.empty:
+        db.session.execute(insert(PerformanceRollup), rows.astype(object).to_dict('records'))
+    return len(keys)
+
+# -------------------------------
+# Incremental Maintenance
+# -------------------------------
+@contextmanager
+def updating_rollups(enrollment_nos):
+    """Keep the rollups in step with a write to these students (inside the writing transaction).
+
+    Takes their contributions before the write and again after it and applies
+    the difference, so updated marks, moved students (new department/college)
+    and deletions all land in the right groups without touching anyone else.
+    """
+    enrollment_nos = list(dict.fromkeys(enrollment_nos))
+    before = _contributions(enrollment_nos)
+    yield
+    db.session.flush()
+    _apply_delta(_contributions(enrollment_nos).sub(before, fill_value=0))
+
+def rebuild_rollups():
+    """Full rebuild from the performances table"""
+    db.session.query(PerformanceRollup).delete(synchronize_session=False)
+    rows = _contributions().reset_index()
+    if not rows.empty:
+        rows['test_count'] = rows['test_count'].astype(int)
+        db.session.execute(insert(PerformanceRollup), rows.astype(object).to_dict('records'))
+    return len(rows)
+
+def backfill_rollups():
+    """Populate an empty rollup table from existing performances; no-op otherwise"""
+    if PerformanceRollup.query.first() is None and Performance.query.first() is not None:
+        count = rebuild_rollups()
+        db.session.commit()
+        print(f"✅ Built {count} performance rollups.")
+
+# -------------------------------
+# Reads
+# -------------------------------
+def _scoped(query, scope=None, filters=None):
+    """Rollup rows in a dept/college scope, narrowed by department/college filters"""
+    conditions = dict(scope or {})
+    for column in ('department', 'college'):
+        if (filters or {}).get(column):
+            conditions.setdefault(column, filters[column])
+            if conditions[column] != filters[column]:
+                return query.filter(false())  # filter outside the caller's scope
+    return query.filter(*[getattr(PerformanceRollup, column) == value for column, value in conditions.items()])
+
+def _stddev(sq_sum, total, count):
+    mean = total / count
+    return math.sqrt(max(sq_sum / count - mean * mean, 0.0))
+
+def rollup_totals(scope=None):
+    """Test count and mean/stddev of marks and attendance over every performance in scope"""
+    count, marks, marks_sq, attendance, attendance_sq = _scoped(db.session.query(
+        func.sum(PerformanceRollup.test_count), func.sum(PerformanceRollup.marks_sum),
+        func.sum(PerformanceRollup.marks_sq_sum), func.sum(PerformanceRollup.attendance_sum),
+        func.sum(PerformanceRollup.attendance_sq_sum)
+    ), scope).one()
+    if not count:
+        return {'test_count': 0, 'avg_marks': 0, 'avg_attendance': 0, 'marks_stddev': 0, 'attendance_stddev': 0}
+    return {
+        'test_count': int(count),
+        'avg_marks': marks / count,
+        'avg_attendance': attendance / count,
+        'marks_stddev': _stddev(marks_sq, marks, count),
+        'attendance_stddev': _stddev(attendance_sq, attendance, count)
+    }
+
+def rollup_series(dimension, scope=None, filters=None):
+    """Per-department/college/subject/month averages (over tests) from the rollups"""
+    if dimension not in ROLLUP_DIMENSIONS:
+        raise ValueError(f"Unknown rollup dimension: {dimension}")
+    column = getattr(PerformanceRollup, dimension)
+    rows = _scoped(db.session.query(
+        column, func.sum(PerformanceRollup.test_count), func.sum(PerformanceRollup.marks_sum),
+        func.sum(PerformanceRollup.marks_sq_sum), func.sum(PerformanceRollup.attendance_sum)
+    ), scope, filters).filter(column != '').group_by(column).order_by(column).all()
+    return {
+        'labels': [r[0] for r in rows],
+        'avg_marks': [round(r[2] / r[1], 2) for r in rows],
+        'avg_attendance': [round(r[4] / r[1], 2) for r in rows],
+        'marks_stddev': [round(_stddev(r[3], r[2], r[1]), 2) for r in rows],
+        'test_count': [int(r[1]) for r in rows]
+    }
@@ -1,17 +1,18 @@
 # backend/routes.py
 from flask import (
     render_template, request, redirect, url_for, jsonify,
-    session, flash, current_app, Response
+    session, flash, current_app, Response, stream_with_context, abort, send_file
 )
 from werkzeug.security import check_password_hash, generate_password_hash
 from werkzeug.utils import secure_filename
 import os
-import pandas as pd
-from sqlalchemy import func, desc
+import shutil
+import tempfile
+from sqlalchemy import desc
 from sqlalchemy.exc import IntegrityError
-import io, base64
+import io, base64, hmac, csv
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
 # 🔹 For email verification and password reset
@@ -19,15 +20,40 @@ from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadSignature
 from flask_mail import Mail, Message
 
 # Import models
-from backend.models import db, Student, Performance, User, Teacher
+from backend.models import db, Student, Performance, User, Teacher, Prediction, StudentFeature, Alert
 
-from backend.analytics import load_csv,train_model, predict_for_aggregated
+from backend.analytics import load_csv, predict_for_aggregated
+from backend.queries import (
+    student_aggregate_query, student_summary, student_export_query,
+    student_page, student_overview, filter_options
+)
+from backend.charts import CHART_NAMES, chart_series
+from backend.rollups import updating_rollups, rollup_totals
+from backend.reports import (
+    DEFAULT_REPORT_WORKERS, REPORT_SCOPE_COLUMNS, report_cohort, stream_reports_zip,
+    report_version, report_etag, student_report_pdf
+)
+from backend.alerts import active_alerts, alert_threshold, cohort_recommendations, recommendation_model_version
+from backend.model_registry import MODEL_PATH, model_info
+from backend.profiler import profile_requested
+from backend.ingest import is_provisioned, DEFAULT_STUDENT_PASSWORD
 
 # ------------------- CONFIG -------------------
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'data')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-ALLOWED_EXTENSIONS = ['csv', 'xlsx', 'xls', 'json'] 
+ALLOWED_EXTENSIONS = ['csv', 'xlsx', 'xls', 'json', 'jsonl', 'ndjson'] 
+
+# /api/students page sizes
+STUDENTS_PAGE_SIZE = 50
+MAX_STUDENTS_PAGE_SIZE = 500
+
+# Students per fetch/flush while streaming /export/students.csv
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    'enrollment_no', 'name', 'email', 'college', 'department', 'semester',
+    'avg_marks', 'avg_attendance', 'performance_records_count'
+]
     
 def allowed_file(filename):
  return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -52,6 +78,15 @@ def setup_routes(app):
     mail.init_app(app)
     serializer = URLSafeTimedSerializer(app.secret_key)
 
+    def load_reset_token(token):
+        """Decode a reset link: ('email', ...) from forgot-password, ('enrollment_no', ...) from first login"""
+        try:
+            return 'email', serializer.loads(token, salt='password-reset-salt', max_age=600)
+        except SignatureExpired:
+            raise
+        except BadSignature:
+            return 'enrollment_no', serializer.loads(token, salt='account-setup-salt', max_age=600)
+
     # ---------------- HOME ----------------
     @app.route('/')
     def index():
@@ -97,6 +132,9 @@ def setup_routes(app):
             try:
                 db.session.add(new_student)
                 db.session.commit()
+                current_app.extensions['dashboard_cache'].invalidate_students(
+                    [(department, college)], [enrollment_no]
+                )
                 flash("Student registered successfully!", "success")
                 return redirect(url_for('login'))
             except Exception as e:
@@ -127,7 +165,16 @@ def setup_routes(app):
             # If not found, check Student table
             elif not user:
                 student = Student.query.filter_by(enrollment_no=username).first()
-                if student and check_password_hash(student.password, password):
+
+                # Imported students start without a real password: the default one
+                # only unlocks the set-password form (existing reset-token flow)
+                if student and is_provisioned(student.password):
+                    if hmac.compare_digest(password or '', DEFAULT_STUDENT_PASSWORD):
+                        token = serializer.dumps(student.enrollment_no, salt='account-setup-salt')
+                        flash("🔑 Please choose your own password to activate your account.", "info")
+                        return redirect(url_for('reset_password', token=token))
+
+                elif student and check_password_hash(student.password, password):
                     session['user_id'] = student.enrollment_no  # primary key
                     session['username'] = student.enrollment_no
                     session['role'] = 'Student'
@@ -161,6 +208,9 @@ def setup_routes(app):
         
         # Sort performances by date or creation order
         sorted_performances = sorted(performances, key=lambda x: x.date if hasattr(x, 'date') else x.id)
+
+        # Stored batch prediction for this student (see backend/predictions.py)
+        stored_prediction = student.get('predicted_marks') if student.get('has_prediction') else None
         
         # Prepare chart data
         labels = []
@@ -173,7 +223,7 @@ def setup_routes(app):
             test_label = f"Test {i+1}"
             labels.append(test_label)
             actual_marks.append(performance.marks)
-            predicted_marks.append(getattr(performance, 'predicted_marks', performance.marks))
+            predicted_marks.append(stored_prediction if stored_prediction is not None else performance.marks)
             attendance_data.append(performance.attendance)
             
             # Handle dates - use actual date if available, otherwise generate placeholder
@@ -255,141 +305,35 @@ def setup_routes(app):
         
         return student_info, chart_data
 
-    # ---------------- DASHBOARD (FULL ANALYTICS + SEARCH) ----------------
-    @app.route('/dashboard', methods=['GET', 'POST'])
-    def dashboard():
-        username = session.get('username')
-        role = session.get('role')
-
-        # ---------------- CSV UPLOAD (Teacher only) ----------------
-        if role == 'Teacher' and request.method == 'POST' and 'csv_file' in request.files:
-            return redirect(url_for('upload'))
-
-        # ---------------- STUDENTS DATA ----------------
-        students_query = []
-        student_obj = None
-        
+    def resolve_scope(role, username):
+        """(scope, teacher) for the logged-in user; scope is None when nothing is visible"""
         if role == 'Teacher':
             # ✅ FIXED: Teacher lookup by email instead of teacher_id
             teacher = Teacher.query.filter_by(email=username).first()  # CHANGED: teacher_id → email
             if teacher:
-                # Get teacher's college and department
-                teacher_college = getattr(teacher, 'college', 'Unknown College')
-                teacher_department = getattr(teacher, 'department', 'Unknown Department')
-                
-                students_query = Student.query.filter_by(
-                    department=teacher_department, 
-                    college=teacher_college
-                ).all()
-                
-                print(f"✅ Teacher {teacher.name} viewing {len(students_query)} students from {teacher_department}, {teacher_college}")
-            else:
-                students_query = []
-                flash("⚠️ Teacher profile not found! Please contact administrator.", "warning")
-                print(f"❌ Teacher not found with email: {username}")
-                
+                return {'department': teacher.department, 'college': teacher.college}, teacher
+            return None, None
         elif role == 'Admin':
             # Admin sees all students
-            students_query = Student.query.all()
-        else:
+            return {}, None
+        elif role == 'Student':
             # Student sees only themselves
-            student_obj = Student.query.filter_by(enrollment_no=username).first()
-            students_query = [student_obj] if student_obj else []
+            return {'enrollment_no': username}, None
+        return None, None
 
-        # Format students for template display
+    def build_dashboard_context(role, scope):
+        """Template context for a dashboard scope (everything except the user's name and role)"""
+        # Admin/Teacher tables page through /api/students instead of embedding
+        # every student; only a student's own row is loaded here.
         students_data = []
-        performance_data_list = []  # For analytics
-        
-        for s in students_query:
-            performances = s.performances if s.performances else []
-            avg_attendance = sum(p.attendance for p in performances) / len(performances) if performances else 0
-            avg_marks = sum(p.marks for p in performances) / len(performances) if performances else 0
-            
-            # Get semester from student
-            semester = getattr(s, 'semester', 'N/A')
-            
-            # Calculate performance status
-            if avg_marks >= 75:
-                performance_status = "Excellent"
-                status_color = "#00ff99"
-            elif avg_marks >= 60:
-                performance_status = "Good"
-                status_color = "#58a6ff"
-            elif avg_marks >= 40:
-                performance_status = "Average"
-                status_color = "#ffaa00"
-            else:
-                performance_status = "Needs Improvement"
-                status_color = "#ff4444"
-            
-            # Attendance status
-            if avg_attendance >= 80:
-                attendance_status = "Good"
-                attendance_color = "#00ff99"
-            elif avg_attendance >= 60:
-                attendance_status = "Average"
-                attendance_color = "#ffaa00"
-            else:
-                attendance_status = "Poor"
-                attendance_color = "#ff4444"
-            
-            # Add to students data for display
-            students_data.append({
-                "enrollment": s.enrollment_no,
-                "name": s.name,
-                "email": s.email,
-                "department": getattr(s, 'department', 'N/A'),
-                "college": getattr(s, 'college', 'N/A'),
-                "semester": semester,
-                "avg_marks": round(avg_marks, 2),
-                "avg_attendance": round(avg_attendance, 2),
-                "performance_status": performance_status,
-                "status_color": status_color,
-                "attendance_status": attendance_status,
-                "attendance_color": attendance_color,
-                "total_tests": len(performances)
-            })
-            
-            # Collect performance data for analytics
-            for performance in performances:
-                performance_data_list.append({
-                    "enrollment_no": s.enrollment_no,
-                    "name": s.name,
-                    "department": getattr(s, 'department', 'N/A'),
-                    "college": getattr(s, 'college', 'N/A'),
-                    "subject": getattr(performance, 'subject', 'N/A'),
-                    "marks": performance.marks,
-                    "attendance": performance.attendance,
-                    "date": getattr(performance, 'date', None),
-                    "semester": semester
-                })
-
-        # Create JSON-safe version for JavaScript charts
-        students_json = []
-        for s in students_data:
-            students_json.append({
-                "enrollment": s["enrollment"],
-                "name": s["name"],
-                "email": s["email"],
-                "department": s["department"],
-                "college": s["college"],
-                "semester": s["semester"],
-                "avg_marks": s["avg_marks"],
-                "avg_attendance": s["avg_attendance"],
-                "performance_status": s["performance_status"],
-                "status_color": s["status_color"],
-                "attendance_status": s["attendance_status"],
-                "attendance_color": s["attendance_color"],
-                "total_tests": s["total_tests"]
-            })
+        if role == 'Student' and scope is not None:
+            students_data = [student_summary(row) for row in student_aggregate_query(scope)]
 
         # ---------------- TEACHERS DATA ----------------
-        teachers_query = Teacher.query.all()
+        # Admin: every teacher; Teacher: colleagues in the same department and college
         teachers_data = []
-        for t in teachers_query:
-            if hasattr(t, 'to_dict'):
-                teachers_data.append(t.to_dict())
-            else:
+        if role in ('Admin', 'Teacher') and scope is not None:
+            for t in Teacher.query.filter_by(**scope).all():
                 teachers_data.append({
                     'teacher_id': t.teacher_id,
                     'name': getattr(t, 'name', 'N/A'),
@@ -402,58 +346,27 @@ def setup_routes(app):
         departments = []
         colleges = []
         semesters = []
-        
-        # For Teacher: Only show their department and college
-        if role == 'Teacher':
-            teacher = Teacher.query.filter_by(email=username).first()  # CHANGED: teacher_id → email
-            if teacher:
-                teacher_dept = getattr(teacher, 'department', None)
-                teacher_college = getattr(teacher, 'college', None)
-                
-                if teacher_dept and teacher_dept not in departments and teacher_dept != 'N/A':
-                    departments.append(teacher_dept)
-                if teacher_college and teacher_college not in colleges and teacher_college != 'N/A':
-                    colleges.append(teacher_college)
-        
-        # For Admin: Show all departments and colleges
-        elif role == 'Admin':
-            for s in students_query:
-                dept = getattr(s, 'department', None)
-                coll = getattr(s, 'college', None)
-                sem = getattr(s, 'semester', None)
-                
-                if dept and dept not in departments and dept != 'N/A':
-                    departments.append(dept)
-                if coll and coll not in colleges and coll != 'N/A':
-                    colleges.append(coll)
-                if sem and sem not in semesters and sem != 'N/A':
-                    semesters.append(sem)
-        
-        # Always collect semesters from students
-        for s in students_query:
-            sem = getattr(s, 'semester', None)
-            if sem and sem not in semesters and sem != 'N/A':
-                semesters.append(sem)
-        
-        departments = sorted(departments)
-        colleges = sorted(colleges)
-        semesters = sorted(semesters)
+        if role in ('Admin', 'Teacher') and scope is not None:
+            departments, colleges, semesters = filter_options(scope)
 
         # ---------------- STUDENT PERFORMANCE DATA WITH HISTORICAL TRACKING ----------------
         student_info = None
         student_chart_data = None
         student_chart_json = None
         performance_history = None
+        student_performances = []
         
         if role == 'Student' and students_data:
             student_info = students_data[0]
+            student_performances = Performance.query.filter_by(
+                student_enrollment_no=student_info['enrollment']
+            ).order_by(Performance.date, Performance.id).all()
             
-            current_student_obj = student_obj or Student.query.filter_by(enrollment_no=student_info['enrollment']).first()
-            if current_student_obj and current_student_obj.performances:
+            if student_performances:
                 # Use the new historical data preparation function
                 historical_info, chart_data = prepare_student_historical_data(
-                    current_student_obj, 
-                    current_student_obj.performances
+                    student_info, 
+                    student_performances
                 )
                 
                 # Merge historical data with existing student info
@@ -462,13 +375,13 @@ def setup_routes(app):
                 
                 # Prepare performance history for the table
                 performance_history = []
-                for i, performance in enumerate(current_student_obj.performances):
+                for i, performance in enumerate(student_performances):
                     test_label = f"Test {i+1}"
                     
                     # Calculate progress from previous test
                     progress = 0
                     if i > 0:
-                        prev_mark = current_student_obj.performances[i-1].marks
+                        prev_mark = student_performances[i-1].marks
                         current_mark = performance.marks
                         progress = current_mark - prev_mark
                     
@@ -477,7 +390,7 @@ def setup_routes(app):
                         "subject": getattr(performance, 'subject', 'N/A'),
                         "semester": getattr(performance, 'semester', 'N/A'),
                         "marks": performance.marks,
-                        "predicted_marks": getattr(performance, 'predicted_marks', performance.marks),
+                        "predicted_marks": chart_data["predicted_marks"][i],
                         "attendance": performance.attendance,
                         "date": chart_data["dates"][i] if i < len(chart_data["dates"]) else 'N/A',
                         "progress": progress
@@ -551,26 +464,11 @@ def setup_routes(app):
                 statistics["top_performer"] = max(students_data, key=lambda x: x['avg_marks'])
                 statistics["most_consistent"] = max(students_data, key=lambda x: x['total_tests'])
 
-        # ---------------- CHART DATA FOR ANALYTICS ----------------
-        chart_data = {}
-        try:
-            from analytics import generate_all_chart_data
-            current_student_obj_for_analytics = student_obj if role == 'Student' else None
-            
-            chart_data = generate_all_chart_data(
-                students_data=students_data,
-                student_performances=current_student_obj_for_analytics.performances if current_student_obj_for_analytics else None,
-                performance_data=performance_data_list if performance_data_list else None
-            )
-        except Exception as e:
-            print(f"Error generating chart data: {e}")
-            chart_data = {}
-
         # ---------------- RECENT ACTIVITY DATA ----------------
         recent_activity = []
         if role in ['Admin', 'Teacher']:
             try:
-                recent_students = Student.query.order_by(Student.enrollment_no.desc()).limit(5).all()
+                recent_students = Student.query.filter_by(**(scope or {})).order_by(Student.enrollment_no.desc()).limit(5).all()
                 for student in recent_students:
                     recent_activity.append({
                         "type": "new_student",
@@ -582,11 +480,8 @@ def setup_routes(app):
                 recent_activity = []
 
         # Ensure all template variables are defined with safe defaults
-        template_vars = {
-            'username': username or '',
-            'role': role or '',
+        return {
             'students': students_data or [],
-            'students_json': students_json or [],
             'teachers': teachers_data or [],
             'departments': departments or [],
             'colleges': colleges or [],
@@ -602,10 +497,37 @@ def setup_routes(app):
             },
             'performance_history': performance_history or [],
             'statistics': statistics or {},
-            'chart_data': chart_data or {},
             'recent_activity': recent_activity or []
         }
 
+    # ---------------- DASHBOARD (FULL ANALYTICS + SEARCH) ----------------
+    @app.route('/dashboard', methods=['GET', 'POST'])
+    def dashboard():
+        username = session.get('username')
+        role = session.get('role')
+
+        # ---------------- CSV UPLOAD (Teacher only) ----------------
+        if role == 'Teacher' and request.method == 'POST' and 'csv_file' in request.files:
+            return redirect(url_for('upload'))
+
+        # ---------------- STUDENTS DATA ----------------
+        # One GROUP BY query for every student in the caller's scope, so the
+        # query count stays constant however many students there are.
+        scope, teacher = resolve_scope(role, username)
+        if role == 'Teacher' and not teacher:
+            flash("⚠️ Teacher profile not found! Please contact administrator.", "warning")
+            print(f"❌ Teacher not found with email: {username}")
+
+        if teacher:
+            print(f"✅ Teacher {teacher.name} viewing students from {teacher.department}, {teacher.college}")
+
+        # Everything below depends only on the scope, so teachers of one
+        # department+college (and all admins) share one cached context
+        context = current_app.extensions['dashboard_cache'].get_or_compute(
+            scope, 'dashboard', lambda: build_dashboard_context(role, scope)
+        )
+        template_vars = {'username': username or '', 'role': role or '', **context}
+
         return render_template('dashboard.html', **template_vars)
 
     # ---------------- ADMIN DASHBOARD ----------------
@@ -615,14 +537,315 @@ def setup_routes(app):
             flash("🚫 Access denied!", "danger")
             return redirect(url_for('dashboard'))
 
+        # Marks/attendance come from the performance rollups, not a scan of every performance
+        totals = rollup_totals()
         stats = {
             'total_students': Student.query.count(),
             'total_teachers': Teacher.query.count(),
-            'avg_marks': round(db.session.query(func.avg(Performance.marks)).scalar() or 0, 2),
-            'avg_attendance': round(db.session.query(func.avg(Performance.attendance)).scalar() or 0, 2)
+            'total_tests': totals['test_count'],
+            'avg_marks': round(totals['avg_marks'], 2),
+            'avg_attendance': round(totals['avg_attendance'], 2),
+            'marks_stddev': round(totals['marks_stddev'], 2),
+            'at_risk': Alert.query.count(),
+            'alert_threshold': alert_threshold(),
+            'model': None,
+            'retrain': current_app.extensions['retrain_scheduler'].status()
         }
+        try:
+            stats['model'] = model_info(current_app.config.get('MODEL_PATH', MODEL_PATH))
+        except Exception as e:
+            # An unreadable pickle (e.g. from another scikit-learn version) must not break the page
+            print(f"⚠️ Could not load model: {e}")
         return render_template('admin_dashboard.html', **stats)
 
+    # ---------------- RETRAIN NOW (Admin) ----------------
+    @app.route('/admin/retrain', methods=['POST'])
+    def retrain_now():
+        if session.get('role') != 'Admin':
+            flash("🚫 Access denied!", "danger")
+            return redirect(url_for('dashboard'))
+        # Skips the debounce window and the changed-rows threshold
+        current_app.extensions['retrain_scheduler'].request(force=True, delay=0)
+        flash("🧠 Model retraining started in the background.", "info")
+        return redirect(url_for('admin_dashboard'))
+
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        """Dashboard cache hit/miss counters (Admin)"""
+        if session.get('role') != 'Admin':
+            return jsonify({'error': 'Access denied'}), 403
+        return jsonify(current_app.extensions['dashboard_cache'].stats())
+
+    # ---------------- METRICS ----------------
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus scrape target for this worker process.
+
+        Needs the METRICS_TOKEN bearer token or an admin session; without a token
+        configured it is only open in debug/testing.
+        """
+        token = current_app.config.get('METRICS_TOKEN')
+        if token:
+            allowed = hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}')
+        else:
+            allowed = current_app.debug or current_app.testing
+        if not allowed and session.get('role') != 'Admin':
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(current_app.extensions['request_metrics'].prometheus(),
+                        mimetype='text/plain; version=0.0.4')
+
+    @app.route('/api/metrics/slowest')
+    def slowest_routes():
+        """Endpoints ranked by p95 latency, with their SQL/template/payload averages (Admin)"""
+        if session.get('role') != 'Admin':
+            return jsonify({'error': 'Access denied'}), 403
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+        metrics = current_app.extensions['request_metrics']
+        return jsonify({
+            'since': datetime.fromtimestamp(metrics.started_at).isoformat(timespec='seconds'),
+            'routes': metrics.slowest(limit)
+        })
+
+    # ---------------- REQUEST PROFILES (Admin) ----------------
+    @app.route('/admin/profiles')
+    def request_profiles():
+        """Recent profiled requests with their top cumulative functions"""
+        if session.get('role') != 'Admin':
+            flash("🚫 Access denied!", "danger")
+            return redirect(url_for('dashboard'))
+        profiler = current_app.extensions['request_profiler']
+        return render_template('profiles.html', profiles=profiler.recent(), ring_size=profiler.ring_size)
+
+    @app.route('/admin/profiles/<profile_id>.prof')
+    def download_profile(profile_id):
+        """Raw cProfile stats (pstats / snakeviz)"""
+        if session.get('role') != 'Admin':
+            flash("🚫 Access denied!", "danger")
+            return redirect(url_for('dashboard'))
+        path = current_app.extensions['request_profiler'].path(profile_id)
+        if path is None:
+            abort(404)
+        return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                         download_name=f'{profile_id}.prof')
+
+    @app.route('/api/retrain/status')
+    def retrain_status():
+        if session.get('role') != 'Admin':
+            return jsonify({'error': 'Access denied'}), 403
+        return jsonify(current_app.extensions['retrain_scheduler'].status())
+
+    # ---------------- ALERTS (Admin + Teacher) ----------------
+    @app.route('/api/alerts')
+    def api_alerts():
+        """Open at-risk alerts in the caller's scope, lowest predicted marks first"""
+        role = session.get('role')
+        if role not in ('Admin', 'Teacher'):
+            return jsonify({'error': 'Access denied'}), 403
+        scope, _ = resolve_scope(role, session.get('username'))
+        alerts = []
+        if scope is not None:
+            for alert, name, department, college in active_alerts(scope):
+                alerts.append({
+                    'enrollment_no': alert.student_enrollment_no,
+                    'name': name,
+                    'department': department,
+                    'college': college,
+                    'predicted_marks': round(alert.predicted_marks, 2),
+                    'first_seen': alert.first_seen.isoformat(timespec='seconds'),
+                    'last_seen': alert.last_seen.isoformat(timespec='seconds')
+                })
+        return jsonify({'threshold': alert_threshold(), 'alerts': alerts})
+
+    def cohort_scope(scope):
+        """The caller's scope narrowed by ?department=&college=&semester=; None when that
+        asks for students outside it (another teacher's department or college)"""
+        cohort = dict(scope)
+        for key in ('department', 'college', 'semester'):
+            value = request.args.get(key, '').strip()
+            if not value:
+                continue
+            if cohort.get(key, value) != value:
+                return None
+            cohort[key] = value
+        return cohort
+
+    # ---------------- RECOMMENDATIONS (whole cohort at once) ----------------
+    @app.route('/api/recommendations')
+    def api_recommendations():
+        """Recommendations for every student in ?department=&college=&semester= within the caller's scope"""
+        if not session.get('user_id'):
+            return jsonify({'error': 'Login required'}), 401
+        scope, _ = resolve_scope(session.get('role'), session.get('username'))
+        model_version = recommendation_model_version()
+        cohort = cohort_scope(scope) if scope is not None else None
+        if cohort is None:
+            return jsonify({'model_version': model_version, 'students': []})
+
+        # Partitioned by the caller's scope (writes there invalidate it) and keyed
+        # by the model version behind the stored predictions
+        students = current_app.extensions['dashboard_cache'].get_or_compute(
+            scope, 'recommendations', lambda: cohort_recommendations(cohort),
+            params=(model_version,) + tuple(sorted(cohort.items()))
+        )
+        return jsonify({'model_version': model_version, 'students': students})
+
+    # ---------------- BATCH REPORTS (ZIP of PDFs) ----------------
+    @app.route('/reports/batch.zip')
+    def batch_reports_zip():
+        """One PDF per student in ?department=&college=&semester= (within the caller's scope), streamed as a ZIP"""
+        role = session.get('role')
+        if role not in ('Admin', 'Teacher'):
+            flash("🚫 Access denied!", "danger")
+            return redirect(url_for('dashboard'))
+        scope, _ = resolve_scope(role, session.get('username'))
+        cohort = cohort_scope(scope) if scope is not None else None
+        if cohort is None:
+            flash("🚫 You can download reports only for your own department!", "danger")
+            return redirect(url_for('dashboard'))
+
+        # Everything the workers need is loaded here, in one query
+        students = report_cohort(cohort)
+        label = '_'.join(secure_filename(str(cohort[key])) for key in REPORT_SCOPE_COLUMNS if cohort.get(key)) or 'all'
+
+        def progress(done, total):
+            if done % 100 == 0 or done == total:
+                print(f"📄 Reports {label}: {done}/{total}")
+
+        workers = current_app.config.get('REPORT_WORKERS', DEFAULT_REPORT_WORKERS)
+        return Response(
+            stream_reports_zip(students, workers, progress),
+            mimetype='application/zip',
+            headers={
+                'Content-Disposition': f'attachment; filename=reports_{label}.zip',
+                # Lets a client show "n of N" progress while the archive streams
+                'X-Report-Count': str(len(students))
+            }
+        )
+
+    # ---------------- STUDENT REPORT (PDF, cached per data version) ----------------
+    @app.route('/reports/<enrollment_no>.pdf')
+    def student_report(enrollment_no):
+        """A student's PDF report: Admin any, Teacher their department and college, Student their own"""
+        if not session.get('user_id'):
+            flash("⚠️ Please log in first!", "warning")
+            return redirect(url_for('login'))
+        scope, _ = resolve_scope(session.get('role'), session.get('username'))
+        student = report_version(enrollment_no)
+        if student is None or scope is None or any(getattr(student, key) != value for key, value in scope.items()):
+            flash("⚠️ Report not available!", "warning")
+            return redirect(url_for('dashboard'))
+
+        # The version changes whenever the student's details or performances are
+        # written, so an unchanged report is answered from the browser's copy or the cache
+        updated_at = student.updated_at
+        etag = report_etag(student)
+        last_modified = updated_at.replace(microsecond=0, tzinfo=timezone.utc) if updated_at else None
+        if request.if_none_match.contains(etag) or (
+            not request.if_none_match and last_modified and request.if_modified_since
+            and request.if_modified_since >= last_modified
+        ):
+            response = Response(status=304)
+        else:
+            # Cached in the student's partition, which uploads touching them invalidate
+            pdf = current_app.extensions['dashboard_cache'].get_or_compute(
+                {'enrollment_no': enrollment_no}, 'report_pdf',
+                lambda: student_report_pdf(enrollment_no), params=(etag,)
+            )
+            response = Response(pdf, mimetype='application/pdf', headers={
+                'Content-Disposition': f'inline; filename={secure_filename(enrollment_no)}_report.pdf'
+            })
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True  # always revalidate; unchanged reports cost a 304
+        return response
+
+    # ---------------- STUDENTS API (keyset pages + filters) ----------------
+    def student_api_args():
+        """(scope, filters, q) for /api/students*; scope is None when nothing is visible"""
+        scope, _ = resolve_scope(session.get('role'), session.get('username'))
+        filters = {key: request.args.get(key, '').strip() for key in ('college', 'department', 'semester', 'status')}
+        return scope, filters, request.args.get('q', '').strip()
+
+    @app.route('/api/students')
+    def api_students():
+        """One page of students in the caller's scope: ?college=&department=&semester=&status=&q=
+        &sort=<key>&order=asc|desc&limit=<n>&after=<cursor from the previous page>"""
+        if not session.get('user_id'):
+            return jsonify({'error': 'Login required'}), 401
+        scope, filters, q = student_api_args()
+        if scope is None:
+            return jsonify({'students': [], 'next_cursor': None})
+
+        try:
+            limit = min(max(int(request.args.get('limit', STUDENTS_PAGE_SIZE)), 1), MAX_STUDENTS_PAGE_SIZE)
+            page = current_app.extensions['dashboard_cache'].get_or_compute(
+                scope, 'students_page', lambda: student_page(
+                    scope, filters, q,
+                    sort=request.args.get('sort', 'enrollment'),
+                    descending=request.args.get('order', 'asc') == 'desc',
+                    after=request.args.get('after') or None,
+                    limit=limit
+                ),
+                params=tuple(sorted(request.args.items()))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        students, next_cursor = page
+        return jsonify({'students': students, 'next_cursor': next_cursor})
+
+    @app.route('/api/students/overview')
+    def api_students_overview():
+        """Statistics and chart series for the same filters as /api/students"""
+        if not session.get('user_id'):
+            return jsonify({'error': 'Login required'}), 401
+        scope, filters, q = student_api_args()
+        if scope is None:
+            scope = {'enrollment_no': None}  # matches nobody, keeps the response shape
+        # ?charts=0: statistics only (the dashboard fetches each chart from /api/charts/<name>)
+        include_charts = request.args.get('charts', '1') != '0'
+        try:
+            overview = current_app.extensions['dashboard_cache'].get_or_compute(
+                scope, 'overview', lambda: student_overview(scope, filters, q, include_charts=include_charts),
+                params=tuple(sorted(request.args.items()))
+            )
+            return jsonify(overview)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    # ---------------- CHART API (one chart per request, fetched lazily) ----------------
+    @app.route('/api/charts/<name>')
+    def api_chart(name):
+        """Series for one analytics chart in the caller's scope, with the /api/students filters"""
+        if not session.get('user_id'):
+            return jsonify({'error': 'Login required'}), 401
+        if name not in CHART_NAMES:
+            return jsonify({'error': f'Unknown chart: {name}'}), 404
+        scope, filters, q = student_api_args()
+        if scope is None:
+            return jsonify({'name': name, 'data': None})
+        try:
+            data = current_app.extensions['dashboard_cache'].get_or_compute(
+                scope, f'chart:{name}', lambda: chart_series(name, scope, filters, q),
+                params=tuple(sorted(request.args.items()))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({'name': name, 'data': data})
+
+    # ---------------- MODEL INFO (Admin) ----------------
+    @app.route('/api/model')
+    def model_status():
+        if session.get('role') != 'Admin':
+            return jsonify({'error': 'Access denied'}), 403
+        try:
+            info = model_info(current_app.config.get('MODEL_PATH', MODEL_PATH))
+        except Exception as e:
+            print(f"⚠️ Could not load model: {e}")
+            return jsonify({'version': None, 'error': 'Model file could not be loaded'}), 500
+        return jsonify(info or {'version': None})
+
     # ---------------- TEACHER MANAGEMENT ----------------
     @app.route('/manage-teachers')
     def manage_teachers():
@@ -682,6 +905,7 @@ def setup_routes(app):
                 db.session.add(teacher)
                 db.session.add(user)
                 db.session.commit()
+                current_app.extensions['dashboard_cache'].invalidate_teachers([(department, college)])
                 flash("✅ Teacher created successfully!", "success")
                 return redirect(url_for('manage_teachers'))
             except Exception as e:
@@ -705,8 +929,10 @@ def setup_routes(app):
         user = User.query.filter_by(username=teacher.email, role='Teacher').first()
         if user:
             db.session.delete(user)
+        scope = (teacher.department, teacher.college)
         db.session.delete(teacher)
         db.session.commit()
+        current_app.extensions['dashboard_cache'].invalidate_teachers([scope])
         flash("✅ Teacher deleted successfully!", "success")
         return redirect(url_for('manage_teachers'))
 
@@ -748,14 +974,20 @@ def setup_routes(app):
         # ---------------------------
         # DELETE ALL RELATED DATA
         # ---------------------------
-        Performance.query.filter_by(student_enrollment_no=student.enrollment_no).delete()
+        with updating_rollups([student.enrollment_no]):
+            Performance.query.filter_by(student_enrollment_no=student.enrollment_no).delete()
+        Prediction.query.filter_by(student_enrollment_no=student.enrollment_no).delete()
+        Alert.query.filter_by(student_enrollment_no=student.enrollment_no).delete()
+        StudentFeature.query.filter_by(enrollment_no=student.enrollment_no).delete()
 
         user = User.query.filter_by(username=student.email, role='Student').first()
         if user:
             db.session.delete(user)
 
+        scope = (student.department, student.college)
         db.session.delete(student)
         db.session.commit()
+        current_app.extensions['dashboard_cache'].invalidate_students([scope], [student_id])
 
         flash("✅ Student deleted successfully!", "success")
         return redirect(url_for('dashboard'))
@@ -776,8 +1008,12 @@ def setup_routes(app):
                 flash("⚠️ No files selected!", "danger")
                 return redirect(request.url)
 
-            parsed_frames = []
-            success_count = 0
+            saved_files = []
+            upload_folder = current_app.config.get('UPLOAD_FOLDER', UPLOAD_FOLDER)
+            os.makedirs(upload_folder, exist_ok=True)
+            # Each upload gets its own directory, so concurrent uploads of the same
+            # filename never overwrite each other; the job deletes it when done
+            upload_dir = tempfile.mkdtemp(prefix='upload-', dir=upload_folder)
 
             for file in uploaded_files:
                 filename = secure_filename(file.filename)
@@ -788,212 +1024,35 @@ def setup_routes(app):
                     previews.append({'filename': filename, 'error': 'Invalid file type!'})
                     continue
 
-                try:
-                    ext = filename.rsplit('.', 1)[1].lower()
-                    if ext == 'csv':
-                        df = pd.read_csv(file)
-                    elif ext in ['xlsx', 'xls']:
-                        df = pd.read_excel(file)
-                    elif ext == 'json':
-                        df = pd.read_json(file)
-
-                    # ✅ FIX: Normalize column names (handle different naming conventions)
-                    df.columns = df.columns.str.strip().str.lower()
-                    column_mapping = {
-                        'enrollment': 'enrollment_no',
-                        'enrollno': 'enrollment_no',
-                        'studentid': 'enrollment_no',
-                        'student_id': 'enrollment_no',
-                        'avg marks': 'marks',
-                        'avg_marks': 'marks',
-                        'average marks': 'marks',
-                        'avg attendance': 'attendance',
-                        'avg_attendance': 'attendance',
-                        'average attendance': 'attendance',
-                        'date': 'date',
-                        'test_date': 'date',
-                        'exam_date': 'date'
-                    }
-                    df.rename(columns=column_mapping, inplace=True)
-
-                    parsed_frames.append((filename, df))
-
-                    previews.append({
-                        'filename': filename,
-                        'head_html': df.head(5).to_html(classes="preview-table", index=False),
-                        'rows': len(df)
-                    })
-
-                    file_path = os.path.join(UPLOAD_FOLDER, filename)
-                    file.seek(0)
-                    file.save(file_path)
-
-                except Exception as e:
-                    previews.append({'filename': filename, 'error': str(e)})
-                    continue
-
-            # Import all parsed files into DB with duplicate handling
-            any_error = False
-            
-            for filename, df in parsed_frames:
-                try:
-                    file_success_count = 0
-                    for _, row in df.iterrows():
-                        # ✅ FIX: Handle different column names for enrollment_no
-                        enrollment_no = None
-                        for col in ['enrollment_no', 'enrollment', 'enrollno', 'studentid']:
-                            if col in row and pd.notna(row[col]):
-                                enrollment_no = str(row[col]).strip()
-                                break
-                        
-                        if not enrollment_no:
-                            continue
-
-                        # ✅ FIX: Check for required fields with flexible column names
-                        name = row.get('name') or row.get('student_name') or 'Unknown'
-                        department = row.get('department') or row.get('dept') or 'General'
-                        college = row.get('college') or row.get('college_name') or 'Unknown College'
-                        semester = str(row.get('semester') or '1')
-
-                        if not all([enrollment_no, name, department, college, semester]):
-                            continue
-
-                        # Update existing student or create new
-                        student = Student.query.filter_by(enrollment_no=enrollment_no).first()
-                        if student:
-                            student.name = name
-                            student.email = row.get('email', student.email)
-                            student.department = department
-                            student.semester = semester
-                            student.college = college
-                        else:
-                            # Hash the password properly
-                            from werkzeug.security import generate_password_hash
-                            hashed_password = generate_password_hash('default123')
-                            
-                            student = Student(
-                                enrollment_no=enrollment_no,
-                                name=name,
-                                email=row.get('email', ''),
-                                password=hashed_password,
-                                department=department,
-                                semester=semester,
-                                college=college
-                            )
-                            db.session.add(student)
-                        
-                        db.session.flush()
-
-                        # ✅ FIX: Handle performance data - check if subject data exists
-                        subject_name = row.get('subject', 'General')
-                        marks_value = row.get('marks', 0)
-                        attendance_value = row.get('attendance', 0)
-                        
-                        # ✅ NEW: Handle date field for historical tracking
-                        date_value = row.get('date')
-                        if date_value and pd.notna(date_value):
-                            try:
-                                # Try to parse the date
-                                if isinstance(date_value, str):
-                                    date_value = datetime.strptime(date_value, '%Y-%m-%d').date()
-                                else:
-                                    # Handle Excel serial dates
-                                    date_value = date_value.date() if hasattr(date_value, 'date') else datetime.now().date()
-                            except:
-                                date_value = datetime.now().date()
-                        else:
-                            date_value = datetime.now().date()
-
-                        # Safe conversion for marks and attendance
-                        try:
-                            marks_value = float(marks_value) if pd.notna(marks_value) else 0.0
-                        except (ValueError, TypeError):
-                            marks_value = 0.0
-                        
-                        try:
-                            attendance_value = float(attendance_value) if pd.notna(attendance_value) else 0.0
-                        except (ValueError, TypeError):
-                            attendance_value = 0.0
-
-                        # Only create performance record if we have valid data
-                        if subject_name and (marks_value > 0 or attendance_value > 0):
-                            perf = Performance.query.filter_by(
-                                student_enrollment_no=student.enrollment_no, 
-                                subject=subject_name,
-                                date=date_value
-                            ).first()
-                            
-                            if perf:
-                                perf.marks = marks_value
-                                perf.attendance = attendance_value
-                                perf.date = date_value
-                            else:
-                                perf = Performance(
-                                    student_enrollment_no=student.enrollment_no,
-                                    subject=subject_name,
-                                    marks=marks_value,
-                                    attendance=attendance_value,
-                                    date=date_value  # ✅ NEW: Store date for historical tracking
-                                )
-                                db.session.add(perf)
-
-                        file_success_count += 1
+                file_path = os.path.join(upload_dir, filename)
+                file.save(file_path)
+                saved_files.append((filename, file_path))
 
-                    db.session.commit()
-                    success_count += file_success_count
+            if not saved_files:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                flash("⚠️ No valid files to import!", "warning")
+                return render_template("upload.html", previews=previews)
 
-                except Exception as e:
-                    db.session.rollback()
-                    any_error = True
-                    previews.append({'filename': filename, 'error': str(e)})
-
-            # Model retraining (keep your existing fixed code here)
-            model_trained = False
-            mse_value = 0.0
-            
-            try:
-                # Your existing model training code
-                student_count = Student.query.count()
-                performance_count = Performance.query.count()
-                
-                if student_count > 0 and performance_count > 0:
-                    from sqlalchemy import text
-                    query = text("""
-                        SELECT s.enrollment_no, s.department, s.semester, s.college, 
-                            p.subject, p.marks, p.attendance, p.date
-                        FROM students s
-                        JOIN performances p ON s.enrollment_no = p.student_enrollment_no
-                    """)
-                    
-                    students_df = pd.read_sql(query, db.session.bind)
-                    
-                    if not students_df.empty and len(students_df) >= 5:
-                        model, mse_value = train_model(students_df)
-                        model_trained = True
-                        flash(f"✅ Model retrained successfully! MSE: {mse_value:.4f}", "success")
-                    else:
-                        flash("ℹ️ Not enough data for model retraining (minimum 5 records required)", "info")
-                else:
-                    flash("ℹ️ Not enough student or performance data for model retraining", "info")
-                    
-            except Exception as e:
-                flash(f"⚠️ Model retraining failed: {str(e)}", "warning")
+            # Parse → import → retrain runs on the upload worker pool; the page
+            # polls /upload/status/<job_id> for progress (see backend/jobs.py)
+            job_id = current_app.extensions['upload_jobs'].submit(
+                saved_files, owner=session.get('username'), previews=previews, workdir=upload_dir
+            )
+            flash("⏳ Upload queued! Import progress is shown below.", "info")
+            return render_template("upload.html", previews=previews, job_id=job_id)
 
-            # Success messages
-            if any_error:
-                flash("⚠️ Some files failed to import. See previews for details.", "warning")
-            else:
-                if success_count > 0:
-                    if model_trained:
-                        flash(f"✅ {success_count} records processed successfully! Model retrained with MSE: {mse_value:.4f}", "success")
-                    else:
-                        flash(f"✅ {success_count} records processed successfully!", "success")
-                else:
-                    flash("⚠️ No valid data found in uploaded files. Please check if files contain required columns.", "warning")
+        return render_template("upload.html", previews=previews)
 
-            return render_template("upload.html", previews=previews)
+    # ---------------- UPLOAD JOB STATUS (polled by upload.html) ----------------
+    @app.route('/upload/status/<job_id>')
+    def upload_status(job_id):
+        if session.get('role') not in ['Admin', 'Teacher']:
+            return jsonify({'error': 'Access denied'}), 403
 
-        return render_template("upload.html", previews=previews)
+        job = current_app.extensions['upload_jobs'].get(job_id)
+        if not job or (session.get('role') != 'Admin' and job['owner'] != session.get('username')):
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
 
     # ---------------- SERVER-SIDE CSV EXPORT FOR STUDENTS ----------------
     @app.route('/export/students.csv')
@@ -1006,83 +1065,40 @@ def setup_routes(app):
                 flash("🚫 Access denied!", "danger")
                 return redirect(url_for('dashboard'))
 
-            # Get search query
+            # Get search query (matches name, enrollment, email, college, department)
             q = request.args.get('q', '').strip()
-            students_q = Student.query
-            
-            # Apply search filter if provided
-            if q:
-                students_q = students_q.filter(
-                    (Student.name.ilike(f'%{q}%')) |
-                    (Student.enrollment_no.ilike(f'%{q}%')) |
-                    (Student.email.ilike(f'%{q}%')) |
-                    (Student.college.ilike(f'%{q}%')) |  # ✅ Added college search
-                    (Student.department.ilike(f'%{q}%'))  # ✅ Added department search
-                )
-            
-            students = students_q.all()
-
-            rows = []
-            for student in students:
-                perfs = Performance.query.filter_by(student_enrollment_no=student.enrollment_no).all()
-                
-                # Calculate averages safely
-                if perfs:
-                    try:
-                        marks = round(sum(p.marks for p in perfs) / len(perfs), 2)
-                        attendance = round(sum(p.attendance for p in perfs) / len(perfs), 2)
-                    except (ZeroDivisionError, TypeError):
-                        marks = 0.0
-                        attendance = 0.0
-                else:
-                    marks = 0.0
-                    attendance = 0.0
-                
-                # ✅ FIXED: Added all missing fields from Student model
-                rows.append({
-                    'enrollment_no': student.enrollment_no,
-                    'name': student.name,
-                    'email': student.email or '',
-                    'college': student.college or '',  # ✅ Added college field
-                    'department': student.department or '',  # ✅ Added department field
-                    'semester': student.semester or '',  # ✅ Added semester field
-                    'avg_marks': marks,
-                    'avg_attendance': attendance,
-                    'performance_records_count': len(perfs)  # ✅ Added count for context
-                })
-
-            # ✅ FIXED: Updated columns to include all fields
-            df = pd.DataFrame(rows, columns=[
-                'enrollment_no', 
-                'name', 
-                'email', 
-                'college',  # ✅ Added
-                'department',  # ✅ Added
-                'semester',  # ✅ Added
-                'avg_marks', 
-                'avg_attendance',
-                'performance_records_count'  # ✅ Added
-            ])
-            
-            csv_data = df.to_csv(index=False)
-            
-            # ✅ FIXED: Add timestamp to filename to avoid caching issues
-            from datetime import datetime
+            batch_size = current_app.config.get('EXPORT_BATCH_SIZE', EXPORT_BATCH_SIZE)
+            # One aggregated query, fetched in batches while the response is written
+            rows = student_export_query(q).yield_per(batch_size)
+
+            def generate():
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(EXPORT_COLUMNS)
+                for i, row in enumerate(rows, start=1):
+                    writer.writerow([
+                        *row[:6], round(row.avg_marks, 2), round(row.avg_attendance, 2),
+                        row.performance_records_count
+                    ])
+                    if i % batch_size == 0:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                yield buffer.getvalue()
+
+            # Timestamped filename to avoid caching issues
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"students_export_{timestamp}.csv"
-            
+
             return Response(
-                csv_data,
+                stream_with_context(generate()),
                 mimetype="text/csv",
                 headers={"Content-disposition": f"attachment; filename={filename}"}
             )
-        
+
         except Exception as e:
-            # ✅ FIXED: Added error handling
             flash(f"❌ Error exporting CSV: {str(e)}", "danger")
-            return redirect(url_for('manage_students'))
-
-   
+            return redirect(url_for('dashboard'))
 
     # ---------------- FORGET PASSWORD ROUTES ----------------
 
@@ -1226,7 +1242,7 @@ def setup_routes(app):
         """Reset password with token - 10 minute expiration"""
         try:
             # 10 minutes = 600 seconds
-            email_from_token = serializer.loads(token, salt='password-reset-salt', max_age=600)
+            token_kind, email_from_token = load_reset_token(token)
         except SignatureExpired:
             flash("❌ Password reset link has expired. Please request a new one.", "danger")
             return redirect(url_for('forgot_password'))
@@ -1255,17 +1271,26 @@ def setup_routes(app):
                 # Update password in appropriate table
                 user_updated = False
                 
+                # First-login link for an imported student (keyed by enrollment number)
+                if token_kind == 'enrollment_no':
+                    student = Student.query.filter_by(enrollment_no=email_from_token).first()
+                    if student:
+                        student.password = generate_password_hash(password)
+                        user_updated = True
+
                 # Check User table (Admin/Teacher) - search by username or email
-                user = User.query.filter_by(username=email_from_token).first()
-                if not user and hasattr(User, 'email'):
-                    user = User.query.filter_by(email=email_from_token).first()
+                user = None
+                if token_kind == 'email':
+                    user = User.query.filter_by(username=email_from_token).first()
+                    if not user and hasattr(User, 'email'):
+                        user = User.query.filter_by(email=email_from_token).first()
                 
                 if user:
                     user.password = generate_password_hash(password)
                     user_updated = True
                 
                 # Check Student table
-                if not user_updated:
+                if not user_updated and token_kind == 'email':
                     student = Student.query.filter_by(email=email_from_token).first()
                     if student:
                         student.password = generate_password_hash(password)
@@ -1290,10 +1315,16 @@ def setup_routes(app):
     # ---------------- ACCESS CONTROL ----------------
     @app.before_request
     def restrict_access():
-        public = ['/', '/login', '/register', '/forgot-password', '/reset-password']
+        public = ['/', '/login', '/register', '/forgot-password', '/reset-password', '/metrics']
         if not any(request.path.startswith(p) for p in public):
             if not session.get('user_id'):
                 flash("⚠️ Please log in first!", "warning")
                 return redirect(url_for('login'))
 
+    @app.before_request
+    def start_profiler():
+        """Admins can profile one request with an X-Profile header or ?_profile=1"""
+        if session.get('role') == 'Admin' and profile_requested():
+            current_app.extensions['request_profiler'].start()
+
     # end setup_routes
\ No newline at end of file
@@ -0,0 +1,90 @@
+from flask import current_app
+from sqlalchemy import text, select, literal_column, table, or_
+
+from backend.models import db, Student
+
+# -------------------------------
+# Config
+# -------------------------------
+SEARCH_TABLE = 'student_search'
+SEARCH_FIELDS = ('name', 'enrollment_no', 'email', 'college', 'department')
+
+# The trigram tokenizer indexes every 3-character window, so it can only
+# answer queries of at least this length; shorter ones fall back to LIKE.
+MIN_INDEXED_QUERY = 3
+
+# External-content FTS5 table over students: the rows live in `students`, the
+# index is kept in step by triggers, so every writer (register, the bulk upload
+# upsert, delete) updates it in the same transaction without extra code.
+SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        {', '.join(SEARCH_FIELDS)}, content='students', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON students BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, {', '.join(SEARCH_FIELDS)})
+        VALUES (new.rowid, {', '.join('new.' + f for f in SEARCH_FIELDS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON students BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {', '.join(SEARCH_FIELDS)})
+        VALUES ('delete', old.rowid, {', '.join('old.' + f for f in SEARCH_FIELDS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE ON students BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, {', '.join(SEARCH_FIELDS)})
+        VALUES ('delete', old.rowid, {', '.join('old.' + f for f in SEARCH_FIELDS)});
+        INSERT INTO {SEARCH_TABLE}(rowid, {', '.join(SEARCH_FIELDS)})
+        VALUES (new.rowid, {', '.join('new.' + f for f in SEARCH_FIELDS)});
+    END"""
+]
+
+# -------------------------------
+# Index Setup
+# -------------------------------
+def init_search_index():
+    """Create the FTS5 index and its triggers (SQLite only); rebuild it if it drifted.
+
+    Records whether the index is usable in app.extensions['student_search'].
+    Other databases, or SQLite builds without FTS5 trigram, keep the LIKE search.
+    """
+    available = False
+    if db.engine.dialect.name == 'sqlite':
+        try:
+            with db.engine.begin() as connection:
+                for statement in SEARCH_DDL:
+                    connection.execute(text(statement))
+                try:
+                    # Compares the index against `students` (e.g. after a VACUUM renumbered rowids)
+                    connection.execute(text(
+                        f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES ('integrity-check', 1)"
+                    ))
+                except Exception:
+                    rebuild_search_index(connection)
+            available = True
+        except Exception as e:
+            print(f"⚠️ Full-text search unavailable, using LIKE search: {e}")
+    current_app.extensions['student_search'] = available
+    return available
+
+def rebuild_search_index(connection):
+    """Re-read every student into the index"""
+    connection.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+    print("✅ Student search index rebuilt.")
+
+# -------------------------------
+# Search Filter
+# -------------------------------
+def _match_expression(q):
+    """Quote the query as one FTS5 phrase so user input is never parsed as syntax"""
+    return '"' + q.replace('"', '""') + '"'
+
+def student_search_clause(q):
+    """Student filter matching `q` as a substring of name, enrollment, email, college or department"""
+    if current_app.extensions.get('student_search') and len(q) >= MIN_INDEXED_QUERY:
+        matches = (
+            select(literal_column('rowid'))
+            .select_from(table(SEARCH_TABLE))
+            .where(text(f"{SEARCH_TABLE} MATCH :search_q").bindparams(search_q=_match_expression(q)))
+        )
+        return literal_column('students.rowid').in_(matches)
+
+    pattern = f'%{q}%'
+    return or_(*(getattr(Student, field).ilike(pattern) for field in SEARCH_FIELDS))
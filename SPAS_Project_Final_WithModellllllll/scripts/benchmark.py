@@ -0,0 +1,209 @@
+# Command line: python scripts/benchmark.py [--rows 1k 100k 1m] [--repeats 3] [--output results.json] [--baseline old.json]
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+# ✅ Fix import path so backend is accessible
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.app import create_app
+from backend.models import db, Teacher
+from backend.analytics import train_model, predict_for_aggregated
+from backend.features import feature_frame
+from backend.ingest import normalize_columns
+from scripts.synthetic_data import parse_size, write_upload_csv
+
+# -------------------------------
+# Config
+# -------------------------------
+DEFAULT_SIZES = ['1k', '100k', '1m']
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'benchmarks')
+UPLOAD_TIMEOUT = 3600
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def login(client, role, username):
+    with client.session_transaction() as sess:
+        sess['user_id'] = username
+        sess['username'] = username
+        sess['role'] = role
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def best_of(fn, repeats):
+    return min(timed(fn)[0] for _ in range(repeats))
+
+def fetch(client, url):
+    """GET and read the whole body (streamed responses included)"""
+    response = client.get(url)
+    body = response.get_data()
+    response.close()
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} answered {response.status_code}')
+    return body
+
+def upload(client, path):
+    """POST a file to /upload and wait for its background job"""
+    with open(path, 'rb') as f:
+        response = client.post('/upload', data={'files': (f, os.path.basename(path))},
+                               content_type='multipart/form-data')
+    job_id = response.get_data(as_text=True).split('data-status-url="/upload/status/', 1)[1].split('"', 1)[0]
+    deadline = time.time() + UPLOAD_TIMEOUT
+    while time.time() < deadline:
+        job = client.get(f'/upload/status/{job_id}').get_json()
+        if job['status'] in ('done', 'failed'):
+            if job['status'] == 'failed':
+                raise RuntimeError(f'upload failed: {job}')
+            return job
+        time.sleep(0.05)
+    raise RuntimeError('upload did not finish')
+
+# -------------------------------
+# One Size
+# -------------------------------
+def run_size(rows, repeats=3, seed=42):
+    """Time ingest, dashboards, export, training and prediction on `rows` synthetic rows"""
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, 'synthetic.csv')
+        generate_seconds, students = timed(lambda: write_upload_csv(csv_path, rows, seed))
+        model_path = os.path.join(workdir, 'rf_model.pkl')
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(workdir, 'benchmark.db')}",
+            'UPLOAD_FOLDER': workdir,
+            'MODEL_PATH': model_path,
+            'RETRAIN_DEBOUNCE_SECONDS': 10 ** 6  # training is timed on its own below
+        })
+        client = app.test_client()
+        cache = app.extensions['dashboard_cache']
+        try:
+            # ---------- ingest ----------
+            login(client, 'Admin', 'admin')
+            ingest_seconds, _ = timed(lambda: upload(client, csv_path))
+
+            # ---------- dashboards (cold = cache cleared, warm = cached context) ----------
+            frame = normalize_columns(pd.read_csv(csv_path))
+            first = frame.iloc[0]
+            with app.app_context():
+                db.session.add(Teacher(teacher_id='BENCH', name='Benchmark Teacher', department=first['department'],
+                                       college=first['college'], email='bench@spas.test', position='Lecturer'))
+                db.session.commit()
+            dashboards = {}
+            for role, username in [('Admin', 'admin'), ('Teacher', 'bench@spas.test'), ('Student', first['enrollment_no'])]:
+                login(client, role, username)
+
+                def cold():
+                    cache.clear()
+                    fetch(client, '/dashboard')
+
+                dashboards[role] = {
+                    'cold_seconds': best_of(cold, repeats),
+                    'warm_seconds': best_of(lambda: fetch(client, '/dashboard'), repeats)
+                }
+
+            # ---------- export ----------
+            login(client, 'Admin', 'admin')
+            export_seconds = best_of(lambda: fetch(client, '/export/students.csv'), repeats)
+
+            # ---------- training + prediction ----------
+            train_seconds, (_, mse) = timed(lambda: train_model(frame, model_path))
+            with app.app_context():
+                features = feature_frame()
+            predict_seconds = best_of(lambda: predict_for_aggregated(features, model_path), repeats)
+        finally:
+            app.extensions['upload_jobs'].executor.shutdown(wait=True)
+            app.extensions['retrain_scheduler'].shutdown()
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+
+    return {
+        'rows': rows,
+        'students': students,
+        'generate_seconds': generate_seconds,
+        'ingest_seconds': ingest_seconds,
+        'ingest_rows_per_second': rows / ingest_seconds,
+        'dashboard': dashboards,
+        'export_seconds': export_seconds,
+        'train_model_seconds': train_seconds,
+        'train_model_mse': mse,
+        'predict_for_aggregated_seconds': predict_seconds
+    }
+
+# -------------------------------
+# Comparison
+# -------------------------------
+def flatten_timings(result, prefix=''):
+    """{'dashboard.Admin.cold_seconds': 0.12, ...} for every *_seconds value"""
+    timings = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            timings.update(flatten_timings(value, f'{prefix}{key}.'))
+        elif key.endswith('_seconds'):
+            timings[prefix + key] = value
+    return timings
+
+def compare(results, baseline):
+    """Print each timing next to the baseline run's for the same row count"""
+    previous = {r['rows']: flatten_timings(r) for r in baseline['results']}
+    for result in results['results']:
+        if result['rows'] not in previous:
+            continue
+        print(f"\n📊 {result['rows']} rows vs baseline")
+        for name, seconds in flatten_timings(result).items():
+            before = previous[result['rows']].get(name)
+            if before:
+                print(f'   {name:40s} {before * 1000:10.1f} ms → {seconds * 1000:10.1f} ms ({before / seconds:5.2f}x)')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark SPAS on seeded synthetic data.')
+    parser.add_argument('--rows', nargs='+', default=DEFAULT_SIZES, help='1k, 100k, 1m or row counts')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='JSON results path (default data/benchmarks/benchmark_<time>.json)')
+    parser.add_argument('--baseline', help='earlier results JSON to compare against')
+    args = parser.parse_args(argv)
+
+    results = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeats': args.repeats,
+        'results': []
+    }
+    for size in args.rows:
+        rows = parse_size(size)
+        print(f'⏱️ Benchmarking {rows} rows...')
+        result = run_size(rows, args.repeats, args.seed)
+        results['results'].append(result)
+        print(f"   ingest {result['ingest_seconds']:.2f}s ({result['ingest_rows_per_second']:.0f} rows/s), "
+              f"export {result['export_seconds'] * 1000:.1f} ms, train {result['train_model_seconds']:.2f}s, "
+              f"predict {result['predict_for_aggregated_seconds'] * 1000:.1f} ms")
+        for role, timings in result['dashboard'].items():
+            print(f"   dashboard {role}: {timings['cold_seconds'] * 1000:.1f} ms cold, "
+                  f"{timings['warm_seconds'] * 1000:.1f} ms warm")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'✅ Results saved to {output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+    return results
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Command line: python scripts/benchmark_charts.py [students] [repeats]
+import os
+import sys
+import time
+import random
+
+# ✅ Fix import path so backend is accessible
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.analytics import (
+    generate_department_comparison_chart, generate_college_performance_chart,
+    generate_marks_distribution_chart, generate_attendance_correlation_chart,
+    generate_performance_prediction_chart, compute_student_charts
+)
+
+DEPARTMENTS = ['CSE', 'ECE', 'ME', 'CE', 'EE', 'IT', 'AI', 'DS']
+COLLEGES = ['NIIST', 'LNCT', 'OIST', 'TIT', 'SIRT']
+
+def synthetic_students(count, seed=42):
+    """Rows shaped like the dashboard's students_data (a few departments missing)"""
+    rng = random.Random(seed)
+    students = []
+    for i in range(count):
+        marks = round(rng.uniform(20, 100), 2)
+        students.append({
+            'enrollment': f'E{i:07d}',
+            'name': f'Student {i}',
+            'department': rng.choice(DEPARTMENTS) if rng.random() > 0.01 else None,
+            'college': rng.choice(COLLEGES),
+            'avg_marks': marks,
+            'avg_attendance': round(rng.uniform(40, 100), 2),
+            'predicted_marks': round(marks + rng.uniform(-5, 5), 2)
+        })
+    return students
+
+def legacy_charts(students):
+    return {
+        "department_comparison": generate_department_comparison_chart(students),
+        "college_performance": generate_college_performance_chart(students),
+        "marks_distribution": generate_marks_distribution_chart(students),
+        "attendance_correlation": generate_attendance_correlation_chart(students),
+        "performance_prediction": generate_performance_prediction_chart(students),
+    }
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(count=100_000, repeats=3):
+    students = synthetic_students(count)
+    legacy = best_of(lambda: legacy_charts(students), repeats)
+    engine = best_of(lambda: compute_student_charts(students), repeats)
+    print(f"📊 {count} students, best of {repeats}")
+    print(f"   per-chart builders: {legacy * 1000:8.1f} ms")
+    print(f"   shared-frame engine: {engine * 1000:7.1f} ms")
+    print(f"   speedup: {legacy / engine:.2f}x")
+    return {'students': count, 'legacy_seconds': legacy, 'engine_seconds': engine}
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) >= 2 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) >= 3 else 3
+    run(count, repeats)
@@ -1,31 +1,17 @@
 # Command line: python scripts/generate_report.py S001
-import sys, os, io
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from backend.models import db, Student, Performance
-from flask import Flask
+from backend.app import create_app
+from backend.reports import report_cohort, render_student_report
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///../database/app.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+app = create_app()
 
 def generate(enrollment_no, out_path):
     with app.app_context():
-        s = Student.query.filter_by(enrollment_no=enrollment_no).first()
-        if not s:
+        cohort = report_cohort({'enrollment_no': enrollment_no})
+        if not cohort:
             print('Student not found'); return
-        perfs = Performance.query.filter_by(enrollment_no=s.id).all()
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter); p.setFont('Helvetica', 12)
-        p.drawString(50,750, f'Student Performance Report - {s.name} ({s.enrollment_no})')
-        y = 720
-        for r in perfs:
-            p.drawString(50, y, f'Subject: {r.subject} | Marks: {r.marks} | Attendance: {r.attendance} | Date: {r.date}'); y -= 20
-            if y < 50: p.showPage(); y = 750
-        p.showPage(); p.save(); buffer.seek(0)
-        with open(out_path, 'wb') as f: f.write(buffer.getvalue())
+        with open(out_path, 'wb') as f: f.write(render_student_report(*cohort[0]))
         print('Report saved to', out_path)
 
 if __name__ == '__main__':
@@ -0,0 +1,39 @@
+# Command line: python scripts/generate_reports.py OUTPUT_DIR [--department CSE] [--college NIIST] [--semester 5] [--workers 4]
+import argparse
+import os
+import sys
+import time
+
+# ✅ Fix import path so backend is accessible
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.app import create_app
+from backend.reports import DEFAULT_REPORT_WORKERS, REPORT_SCOPE_COLUMNS, report_cohort, write_reports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write one PDF report per student in a department/college/semester.')
+    parser.add_argument('output_dir')
+    for column in REPORT_SCOPE_COLUMNS:
+        parser.add_argument(f'--{column}')
+    parser.add_argument('--workers', type=int, default=DEFAULT_REPORT_WORKERS)
+    args = parser.parse_args(argv)
+
+    scope = {column: getattr(args, column) for column in REPORT_SCOPE_COLUMNS if getattr(args, column)}
+    app = create_app()
+    with app.app_context():
+        cohort = report_cohort(scope)
+    if not cohort:
+        print('⚠️ No students match', scope or 'the database')
+        return 0
+
+    started = time.time()
+
+    def progress(done, total):
+        print(f'\r📄 {done}/{total} reports ({done / max(time.time() - started, 1e-6):.1f}/s)', end='', flush=True)
+
+    count = write_reports(cohort, args.output_dir, args.workers, progress)
+    print(f'\n✅ {count} reports saved to {args.output_dir}')
+    return count
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# Command line: python scripts/synthetic_data.py OUTPUT.csv [--rows 1k|100k|1m|N] [--seed 42]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# ✅ Fix import path so backend is accessible
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# -------------------------------
+# Config
+# -------------------------------
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+TESTS_PER_STUDENT = 10
+WRITE_CHUNK_ROWS = 100_000
+
+DEPARTMENTS = ['CSE', 'ECE', 'ME', 'CE', 'EE', 'IT', 'AI', 'DS']
+COLLEGES = ['NIIST', 'LNCT', 'OIST', 'TIT', 'SIRT']
+SUBJECTS = ['Maths', 'Physics', 'Chemistry', 'English', 'Programming',
+            'Electronics', 'Mechanics', 'Statistics', 'Networks', 'Databases']
+
+# Same headers as a teacher's upload (see backend/ingest.py). Email is included
+# because students.email is unique: new students without one would collide on ''.
+UPLOAD_COLUMNS = ['Enrollment', 'Name', 'Email', 'Department', 'College', 'Semester',
+                  'Subject', 'Marks', 'Attendance', 'Date']
+
+def parse_size(value):
+    """'1k' / '100k' / '1m' or a plain row count"""
+    return SIZES.get(str(value).lower()) or int(value)
+
+def synthetic_roster(count, seed=42):
+    """Per-student attributes: department, college, semester and an ability that drives marks"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Enrollment': [f'SYN{i:07d}' for i in range(count)],
+        'Name': [f'Student {i}' for i in range(count)],
+        'Email': [f'syn{i:07d}@spas.test' for i in range(count)],
+        'Department': rng.choice(DEPARTMENTS, count),
+        'College': rng.choice(COLLEGES, count),
+        'Semester': rng.integers(1, 9, count),
+        'ability': rng.normal(65, 12, count),
+        'diligence': rng.normal(78, 10, count)
+    })
+
+def synthetic_rows(rows, seed=42, chunk_rows=WRITE_CHUNK_ROWS):
+    """Yield upload-format DataFrames totalling `rows` rows, deterministic for a seed.
+
+    Each student sits TESTS_PER_STUDENT tests, each in a different subject on its
+    own date, so no two rows share the (student, subject, date) upsert key.
+    """
+    students = synthetic_roster(max(1, -(-rows // TESTS_PER_STUDENT)), seed)
+    rng = np.random.default_rng(seed + 1)
+    for start in range(0, rows, chunk_rows):
+        index = np.arange(start, min(start + chunk_rows, rows))
+        student, test = index // TESTS_PER_STUDENT, index % TESTS_PER_STUDENT
+        chunk = students.iloc[student].reset_index(drop=True)
+        attendance = np.clip(chunk['diligence'] + rng.normal(0, 8, len(index)), 0, 100)
+        # Attendance pulls marks up, as in the real data
+        marks = np.clip(chunk['ability'] + 0.2 * (attendance - 75) + rng.normal(0, 10, len(index)), 0, 100)
+        days = test * 30 + rng.integers(0, 28, len(index))
+        yield chunk.assign(
+            Subject=np.array(SUBJECTS)[test],
+            Marks=marks.round(1),
+            Attendance=attendance.round(1),
+            Date=(pd.Timestamp('2025-01-01') + pd.to_timedelta(days, unit='D')).strftime('%Y-%m-%d')
+        )[UPLOAD_COLUMNS]
+
+def write_upload_csv(path, rows, seed=42):
+    """Write `rows` synthetic performance rows to `path`; returns the number of students"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    students = set()
+    with open(path, 'w', newline='') as f:
+        for i, chunk in enumerate(synthetic_rows(rows, seed)):
+            chunk.to_csv(f, header=i == 0, index=False)
+            students.update(chunk['Enrollment'].unique())
+    return len(students)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a seeded synthetic upload CSV.')
+    parser.add_argument('output')
+    parser.add_argument('--rows', default='1k', help='1k, 100k, 1m or a row count')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rows = parse_size(args.rows)
+    started = time.perf_counter()
+    students = write_upload_csv(args.output, rows, args.seed)
+    print(f'✅ {rows} rows for {students} students written to {args.output} '
+          f'in {time.perf_counter() - started:.1f}s')
+    return rows
+
+if __name__ == '__main__':
+    main()
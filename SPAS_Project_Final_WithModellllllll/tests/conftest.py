@@ -0,0 +1,141 @@
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import event, insert
+
+# ✅ Fix import path so backend is accessible
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.app import create_app
+from backend.models import db, Student, Performance, Teacher
+from backend.features import refresh_student_features
+from backend.rollups import rebuild_rollups
+from backend.metrics import statement_shape
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'UPLOAD_FOLDER': str(tmp_path),
+        'MODEL_PATH': str(tmp_path / 'rf_model.pkl'),
+        'PROFILE_DIR': str(tmp_path / 'profiles'),
+        # Uploads only queue a retrain; tests that need one trigger it explicitly
+        'RETRAIN_DEBOUNCE_SECONDS': 3600
+    })
+    yield app
+    app.extensions['upload_jobs'].executor.shutdown(wait=True)
+    app.extensions['retrain_scheduler'].shutdown()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def login_as(client, role, username):
+    """Put a logged-in role straight into the test client's session"""
+    with client.session_transaction() as sess:
+        sess['user_id'] = username
+        sess['username'] = username
+        sess['role'] = role
+
+
+def seed_students(app, count, department='CSE', college='NIIST', tests_per_student=3):
+    """Insert `count` students with a few performance rows each"""
+    enrollment_nos = []
+    with app.app_context():
+        if not Teacher.query.filter_by(email='teacher@spas.test').first():
+            db.session.add(Teacher(
+                teacher_id='T001', name='Test Teacher', department=department,
+                college=college, email='teacher@spas.test', position='Lecturer'
+            ))
+        students, performances = [], []
+        for i in range(count):
+            enrollment_no = f"{college}{department}{i:05d}"
+            enrollment_nos.append(enrollment_no)
+            students.append(dict(
+                enrollment_no=enrollment_no,
+                name=f"Student {i}",
+                email=f"{enrollment_no.lower()}@spas.test",
+                password='x',
+                department=department,
+                semester=str(i % 8 + 1),
+                college=college
+            ))
+            for t in range(tests_per_student):
+                performances.append(dict(
+                    student_enrollment_no=enrollment_no,
+                    subject=f"Subject {t}",
+                    marks=float((i * 7 + t * 13) % 100),
+                    attendance=float((i * 3 + t * 11) % 100),
+                    date=date(2025, t % 12 + 1, 1)
+                ))
+        # executemany inserts, so thousands of students seed quickly
+        if students:
+            db.session.execute(insert(Student), students)
+        if performances:
+            db.session.execute(insert(Performance), performances)
+        db.session.flush()
+        refresh_student_features(enrollment_nos)
+        rebuild_rollups()
+        db.session.commit()
+    # Direct inserts bypass the write paths that invalidate the dashboard cache
+    app.extensions['dashboard_cache'].clear()
+
+
+def upload_and_wait(client, files, timeout=30):
+    """POST files to /upload and poll the background job until it finishes"""
+    response = client.post('/upload', data={'files': files}, content_type='multipart/form-data')
+    assert response.status_code == 200
+    status_url = re.search(r'data-status-url="([^"]+)"', response.get_data(as_text=True)).group(1)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(status_url).get_json()
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"upload job did not finish: {job}")
+
+
+@contextmanager
+def count_queries(app):
+    """Collect the SQL statements executed on the app's engine (every thread)"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', _record)
+
+
+@contextmanager
+def assert_max_queries(app, limit):
+    """Fail if the block runs more than `limit` SQL statements on the app's engine.
+
+    Counts every thread (upload jobs included); the failure lists the most
+    repeated statement shapes, which is where an N+1 shows up.
+    """
+    with count_queries(app) as statements:
+        yield statements
+    shapes = Counter(statement_shape(s) for s in statements).most_common(3)
+    assert len(statements) <= limit, (
+        f"{len(statements)} SQL statements (limit {limit}); most repeated: "
+        + "; ".join(f"{n}x {shape[:120]}" for shape, n in shapes)
+    )
@@ -0,0 +1,111 @@
+import io
+
+import pandas as pd
+
+from backend.alerts import evaluate_alerts, generate_alerts
+from backend.analytics import predict_for_aggregated, train_model_from_features
+from backend.features import feature_frame
+from backend.ingest import import_frame
+from backend.models import db, Alert, Prediction
+from backend.predictions import score_all_students
+from conftest import login_as, seed_students
+
+HEADER = "Enrollment,Name,Department,College,Semester,Subject,Marks,Attendance,Date\n"
+
+
+def _alerts():
+    return {a.student_enrollment_no: a for a in Alert.query.all()}
+
+
+def test_alerts_are_persisted_and_follow_imports(app):
+    seed_students(app, 10)
+    with app.app_context():
+        evaluate_alerts()
+        db.session.commit()
+        expected = {a['student_id'] for a in generate_alerts(threshold=50.0)}
+        assert set(_alerts()) == expected and expected
+        first_seen = {e: a.first_seen for e, a in _alerts().items()}
+        at_risk, safe = sorted(expected)[0], sorted(set(f"NIISTCSE{i:05d}" for i in range(10)) - expected)[0]
+
+        # Lift one at-risk student, sink one safe student
+        csv = HEADER + (
+            f"{at_risk},X,CSE,NIIST,1,Subject 0,100,90,2025-01-01\n"
+            f"{at_risk},X,CSE,NIIST,1,Subject 1,100,90,2025-02-01\n"
+            f"{at_risk},X,CSE,NIIST,1,Subject 2,100,90,2025-03-01\n"
+            f"{safe},Y,CSE,NIIST,1,Subject 0,1,10,2025-01-01\n"
+            f"{safe},Y,CSE,NIIST,1,Subject 1,1,10,2025-02-01\n"
+            f"{safe},Y,CSE,NIIST,1,Subject 2,1,10,2025-03-01\n"
+        )
+        import_frame(pd.read_csv(io.StringIO(csv)))
+        db.session.commit()
+
+        alerts = _alerts()
+        assert set(alerts) == expected - {at_risk} | {safe}
+        assert set(alerts) == {a['student_id'] for a in generate_alerts(threshold=50.0)}
+        # Untouched students keep their timestamps; only the changed ones were re-evaluated
+        untouched = expected - {at_risk}
+        assert all(alerts[e].first_seen == first_seen[e] and alerts[e].last_seen == first_seen[e] for e in untouched)
+        assert alerts[safe].first_seen == alerts[safe].last_seen > max(first_seen.values())
+
+
+def test_imports_rescore_touched_students_with_the_current_model(app):
+    seed_students(app, 20)
+    with app.app_context():
+        train_model_from_features(feature_frame(), app.config['MODEL_PATH'])
+        version, _ = score_all_students(app.config['MODEL_PATH'])
+        evaluate_alerts()
+        db.session.commit()
+        stored = {p.student_enrollment_no: p.predicted_marks for p in Prediction.query.all()}
+        safe = max(stored, key=stored.get)
+        assert safe not in _alerts()
+
+        csv = HEADER + "".join(f"{safe},Y,CSE,NIIST,1,Subject {t},1,10,2025-0{t + 1}-01\n" for t in range(3))
+        import_frame(pd.read_csv(io.StringIO(csv)))
+        db.session.commit()
+
+        expected = predict_for_aggregated(feature_frame([safe]), app.config['MODEL_PATH'])['predicted_marks'][0]
+        rescored = Prediction.query.filter_by(student_enrollment_no=safe).one()
+        assert rescored.model_version == version
+        assert rescored.predicted_marks == expected < 50.0 < stored[safe]
+        # Alerts read the fresh prediction, not the one scored before the import
+        assert {a['student_id']: a['predicted_marks'] for a in generate_alerts(threshold=50.0)}[safe] == expected
+        assert _alerts()[safe].predicted_marks == expected
+        # Untouched students keep their batch predictions
+        others = {p.student_enrollment_no: p.predicted_marks for p in Prediction.query.all() if p.student_enrollment_no != safe}
+        assert others == {e: v for e, v in stored.items() if e != safe}
+
+
+def test_reevaluation_keeps_first_seen(app):
+    seed_students(app, 6)
+    with app.app_context():
+        evaluate_alerts()
+        db.session.commit()
+        before = _alerts()
+        evaluate_alerts()
+        db.session.commit()
+        after = _alerts()
+        assert set(before) == set(after)
+        assert all(after[e].first_seen == before[e].first_seen for e in after)
+        assert all(after[e].last_seen >= before[e].last_seen for e in after)
+
+
+def test_alerts_api_is_scoped(app, client):
+    seed_students(app, 6)
+    seed_students(app, 6, department='ME', college='GEC')
+    with app.app_context():
+        evaluate_alerts()
+        db.session.commit()
+        total = Alert.query.count()
+
+    login_as(client, 'Admin', 'admin')
+    assert len(client.get('/api/alerts').get_json()['alerts']) == total
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    alerts = client.get('/api/alerts').get_json()['alerts']
+    assert alerts and {a['department'] for a in alerts} == {'CSE'}
+    login_as(client, 'Student', 'NIISTCSE00001')
+    assert client.get('/api/alerts').status_code == 403
+
+    login_as(client, 'Admin', 'admin')
+    client.post(f"/students/delete/{alerts[0]['enrollment_no']}")
+    with app.app_context():
+        assert Alert.query.count() == total - 1
@@ -0,0 +1,40 @@
+import json
+
+import pandas as pd
+
+from backend.ingest import normalize_columns
+from scripts.benchmark import flatten_timings, main
+from scripts.synthetic_data import TESTS_PER_STUDENT, parse_size, write_upload_csv
+
+
+def test_synthetic_csv_is_seeded_and_upload_shaped(tmp_path):
+    first, second, other = tmp_path / 'a.csv', tmp_path / 'b.csv', tmp_path / 'c.csv'
+    assert write_upload_csv(first, 95, seed=7) == 10
+    write_upload_csv(second, 95, seed=7)
+    write_upload_csv(other, 95, seed=8)
+    assert first.read_bytes() == second.read_bytes() != other.read_bytes()
+
+    frame = normalize_columns(pd.read_csv(first))
+    assert {'enrollment_no', 'name', 'department', 'college', 'semester',
+            'subject', 'marks', 'attendance', 'date'} <= set(frame.columns)
+    assert len(frame) == 95
+    assert not frame.duplicated(['enrollment_no', 'subject', 'date']).any()
+    assert frame.groupby('enrollment_no').size().max() == TESTS_PER_STUDENT
+    assert frame['marks'].between(0, 100).all() and frame['attendance'].between(0, 100).all()
+    assert parse_size('100k') == 100_000 and parse_size('250') == 250
+
+
+def test_benchmark_writes_comparable_json(tmp_path):
+    output = tmp_path / 'results.json'
+    main(['--rows', '200', '--repeats', '1', '--output', str(output)])
+    results = json.loads(output.read_text())
+    [result] = results['results']
+    assert result['rows'] == 200 and result['students'] == 20
+    assert set(result['dashboard']) == {'Admin', 'Teacher', 'Student'}
+    timings = flatten_timings(result)
+    for name in ('ingest_seconds', 'export_seconds', 'train_model_seconds',
+                 'predict_for_aggregated_seconds', 'dashboard.Teacher.cold_seconds'):
+        assert timings[name] > 0
+
+    # A second run compares against the first
+    main(['--rows', '200', '--repeats', '1', '--output', str(tmp_path / 'next.json'), '--baseline', str(output)])
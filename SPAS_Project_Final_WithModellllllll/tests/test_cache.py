@@ -0,0 +1,92 @@
+import io
+import time
+
+from backend.cache import ScopedCache
+from backend.models import db, Teacher
+from conftest import login_as, seed_students, upload_and_wait
+
+
+def partitions(app):
+    return set(app.extensions['dashboard_cache'].stats()['partitions'])
+
+
+def test_lru_and_ttl():
+    cache = ScopedCache(max_entries=2, ttl=0.2)
+    calls = []
+    compute = lambda name: cache.get_or_compute({}, name, lambda: calls.append(name) or name)
+
+    compute('a'), compute('b'), compute('a'), compute('c')  # 'b' is least recently used
+    assert cache.stats()['evictions'] == 1
+    compute('a')
+    compute('b')
+    assert calls == ['a', 'b', 'c', 'b']
+
+    time.sleep(0.25)
+    compute('b')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (2, 5, 1)
+
+
+def test_teachers_of_one_department_share_a_cached_dashboard(app, client):
+    seed_students(app, 5)
+    with app.app_context():
+        db.session.add(Teacher(teacher_id='T002', name='Second Teacher', department='CSE',
+                               college='NIIST', email='second@spas.test', position='Lecturer'))
+        db.session.commit()
+    cache = app.extensions['dashboard_cache']
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert client.get('/dashboard').status_code == 200
+    login_as(client, 'Teacher', 'second@spas.test')
+    assert client.get('/dashboard').status_code == 200
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+    login_as(client, 'Admin', 'admin')
+    client.get('/api/students/overview')
+    client.get('/api/students/overview')
+    stats = client.get('/api/cache/stats').get_json()
+    assert (stats['hits'], stats['misses']) == (2, 2)
+    assert set(stats['partitions']) == {'admin', 'dept:CSE:NIIST'}
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert client.get('/api/cache/stats').status_code == 403
+
+
+def test_writes_invalidate_only_the_affected_scopes(app, client):
+    seed_students(app, 3)
+    seed_students(app, 2, department='ME', college='GEC')
+    with app.app_context():
+        db.session.add(Teacher(teacher_id='T003', name='ME Teacher', department='ME',
+                               college='GEC', email='me@spas.test', position='Lecturer'))
+        db.session.commit()
+
+    def warm():
+        for role, user in [('Admin', 'admin'), ('Teacher', 'teacher@spas.test'),
+                           ('Teacher', 'me@spas.test'), ('Student', 'NIISTCSE00001')]:
+            login_as(client, role, user)
+            client.get('/dashboard')
+    warm()
+    assert partitions(app) == {'admin', 'dept:CSE:NIIST', 'dept:ME:GEC', 'student:NIISTCSE00001'}
+
+    # Upload touching one ME student
+    login_as(client, 'Admin', 'admin')
+    csv = "enrollment_no,name,email,department,college,subject,marks\nGECME00000,Student 0,x@spas.test,ME,GEC,Maths,70\n"
+    upload_and_wait(client, [(io.BytesIO(csv.encode()), 'me.csv')])
+    assert partitions(app) == {'dept:CSE:NIIST', 'student:NIISTCSE00001'}
+
+    # The new marks show up for the ME teacher right away
+    login_as(client, 'Teacher', 'me@spas.test')
+    rows = client.get('/api/students?q=GECME00000').get_json()['students']
+    assert rows[0]['total_tests'] == 4
+
+    warm()
+    login_as(client, 'Admin', 'admin')
+    client.post('/students/delete/NIISTCSE00001')
+    assert partitions(app) == {'dept:ME:GEC'}
+
+    warm()
+    with app.app_context():
+        teacher_id = Teacher.query.filter_by(email='me@spas.test').one().id
+    login_as(client, 'Admin', 'admin')
+    client.post(f'/teachers/delete/{teacher_id}')
+    assert partitions(app) == {'dept:CSE:NIIST', 'student:NIISTCSE00001'}
@@ -0,0 +1,38 @@
+import math
+
+from backend.analytics import compute_student_charts, generate_all_chart_data
+from scripts.benchmark_charts import synthetic_students, legacy_charts
+
+
+def _same(a, b):
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a):
+        return math.isnan(b)
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, abs_tol=1e-9)
+    return a == b
+
+
+def test_engine_matches_per_chart_builders():
+    students = synthetic_students(500, seed=7)
+    students[3]['avg_marks'] = None
+    students[4]['predicted_marks'] = None
+    assert _same(compute_student_charts(students), legacy_charts(students))
+
+
+def test_engine_without_optional_columns():
+    students = [{'enrollment': 'E1', 'name': 'A', 'avg_marks': 70.0, 'avg_attendance': 80.0}]
+    charts = compute_student_charts(students)
+    assert charts['department_comparison'] is None
+    assert charts['college_performance'] is None
+    assert charts['performance_prediction']['predicted_marks'] == [70.0]
+    assert _same(charts, legacy_charts(students))
+
+
+def test_generate_all_chart_data_uses_engine_and_drops_empty_charts():
+    assert generate_all_chart_data([], [], []) == {}
+    data = generate_all_chart_data(synthetic_students(20), [], [])
+    assert set(data) >= {'department_comparison', 'marks_distribution', 'performance_prediction'}
@@ -0,0 +1,84 @@
+import io
+
+import pandas as pd
+import pytest
+
+from backend.charts import CHART_NAMES
+from backend.ingest import import_frame
+from backend.models import db
+from conftest import login_as, seed_students
+
+
+@pytest.fixture
+def seeded(app):
+    seed_students(app, 20)
+    seed_students(app, 6, department='ME', college='GEC')
+
+
+def chart(client, name, **params):
+    response = client.get(f'/api/charts/{name}', query_string=params)
+    assert response.status_code == 200
+    return response.get_json()['data']
+
+
+def test_charts_are_scoped_by_role(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    assert chart(client, 'department_comparison')['labels'] == ['CSE', 'ME']
+    assert chart(client, 'college_performance')['student_count'] == [6, 20]
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert chart(client, 'department_comparison')['labels'] == ['CSE']
+    assert chart(client, 'marks_distribution')['total_students'] == 20
+
+    login_as(client, 'Student', 'NIISTCSE00003')
+    assert chart(client, 'attendance_correlation')['students'] == ['Student 3']
+    assert chart(client, 'student_trend')['labels'] == ['Test 1', 'Test 2', 'Test 3']
+
+
+def test_chart_series_match_the_overview(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    overview = client.get('/api/students/overview', query_string={'department': 'CSE'}).get_json()['charts']
+    assert chart(client, 'semester_performance', department='CSE')['student_count'] == overview['semester']['student_count']
+    assert chart(client, 'top_students', department='CSE')['labels'] == overview['top_students']['labels']
+    assert chart(client, 'marks_distribution', department='CSE')['counts'] == overview['marks_distribution']['counts']
+    assert chart(client, 'subject_performance', department='ME')['subjects'] == ['Subject 0', 'Subject 1', 'Subject 2']
+    assert chart(client, 'monthly_trend')['months'] == ['2025-01', '2025-02', '2025-03']
+
+
+def test_every_chart_answers_and_unknown_names_404(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    for name in CHART_NAMES:
+        chart(client, name)
+    assert client.get('/api/charts/nope').status_code == 404
+    assert client.get('/api/charts/top_students?status=Bogus').status_code == 400
+
+
+def test_overview_can_skip_charts(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    overview = client.get('/api/students/overview?charts=0').get_json()
+    assert overview['statistics']['total_students'] == 26
+    assert 'charts' not in overview
+
+
+def test_charts_need_login(client):
+    assert client.get('/api/charts/marks_distribution').status_code == 401
+
+
+def test_group_charts_average_students_not_tests(app, client):
+    # One test at 100 against three at 40: 70 per student, 55 per test
+    csv = "Enrollment,Name,Email,Department,College,Semester,Subject,Marks,Attendance,Date\n" + (
+        "A001,A,a@spas.test,CSE,NIIST,1,Maths,100,90,2025-01-01\n"
+        + "".join(f"B001,B,b@spas.test,CSE,NIIST,1,Subject {t},40,60,2025-0{t + 1}-01\n" for t in range(3))
+    )
+    with app.app_context():
+        import_frame(pd.read_csv(io.StringIO(csv)))
+        db.session.commit()
+    login_as(client, 'Admin', 'admin')
+
+    grouped = chart(client, 'department_comparison')          # feature store path
+    per_student = chart(client, 'department_comparison', semester='1')  # per-student rows
+    overview = client.get('/api/students/overview').get_json()['charts']['department']
+    assert grouped == per_student
+    assert grouped['avg_marks'] == overview['avg_marks'] == [70.0]
+    assert grouped['avg_attendance'] == [75.0] and grouped['student_count'] == [2]
+    assert chart(client, 'college_performance') == chart(client, 'college_performance', semester='1')
@@ -0,0 +1,49 @@
+import time
+
+from backend.models import Student
+from backend.queries import student_aggregate_query, student_summary
+from conftest import count_queries, login_as, seed_students
+
+
+def dashboard_query_count(app, client, role, username):
+    login_as(client, role, username)
+    with count_queries(app) as statements:
+        start = time.perf_counter()
+        response = client.get('/dashboard')
+        elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    return len(statements), elapsed
+
+
+def test_dashboard_query_count_constant_as_students_grow(app, client):
+    seed_students(app, 5)
+    small = {role: dashboard_query_count(app, client, role, user)
+             for role, user in [('Admin', 'admin'), ('Teacher', 'teacher@spas.test')]}
+
+    seed_students(app, 500, department='IT')
+    large = {role: dashboard_query_count(app, client, role, user)
+             for role, user in [('Admin', 'admin'), ('Teacher', 'teacher@spas.test')]}
+
+    for role in small:
+        print(f"{role}: {small[role][0]} queries / {small[role][1]:.3f}s at 5 students, "
+              f"{large[role][0]} queries / {large[role][1]:.3f}s at 505 students")
+        assert small[role][0] == large[role][0]
+
+
+def test_student_summary_matches_per_student_computation(app):
+    seed_students(app, 20, tests_per_student=4)
+    seed_students(app, 3, department='IT', tests_per_student=0)
+
+    with app.app_context():
+        rows = {r['enrollment']: r for r in map(student_summary, student_aggregate_query({}))}
+        assert len(rows) == Student.query.count()
+
+        for s in Student.query.all():
+            perfs = s.performances
+            expected_marks = sum(p.marks for p in perfs) / len(perfs) if perfs else 0
+            expected_attendance = sum(p.attendance for p in perfs) / len(perfs) if perfs else 0
+            row = rows[s.enrollment_no]
+            assert row['avg_marks'] == round(expected_marks, 2)
+            assert row['avg_attendance'] == round(expected_attendance, 2)
+            assert row['total_tests'] == len(perfs)
+            assert (row['department'], row['college'], row['semester']) == (s.department, s.college, s.semester)
@@ -0,0 +1,134 @@
+import threading
+
+import pandas as pd
+import pytest
+from sqlalchemy import text
+
+import backend.database as database
+from backend.app import create_app
+from backend.config import SQLITE_DATABASE_URI, database_url
+from backend.database import engine_options
+from backend.ingest import import_frame
+from backend.models import db, StudentFeature
+from conftest import login_as, seed_students
+
+
+def test_sqlite_connections_get_wal_and_pragmas(app):
+    with app.app_context():
+        pragma = lambda name: db.session.execute(text(f'PRAGMA {name}')).scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == 30000
+        assert pragma('cache_size') == -64000
+        assert db.engine.pool.size() == 5
+
+
+def test_database_url_comes_from_the_environment():
+    assert database_url({}) == SQLITE_DATABASE_URI
+    assert database_url({'DATABASE_URL': 'postgres://spas:pw@db/spas'}) == 'postgresql://spas:pw@db/spas'
+    assert database_url({'DATABASE_URL': 'postgresql://a@x/one',
+                         'SPAS_DATABASE_URL': 'postgresql://b@y/two'}) == 'postgresql://b@y/two'
+
+    options = engine_options('postgresql://spas@db/spas', {'DB_POOL_SIZE': 8})
+    assert options['pool_size'] == 8 and options['pool_recycle'] == 1800
+    assert 'connect_args' not in options
+    assert engine_options('sqlite://') == {}
+
+
+def bulk_frame(count):
+    return pd.DataFrame({
+        'enrollment_no': [f'BULK{i:06d}' for i in range(count)],
+        'name': [f'Bulk {i}' for i in range(count)],
+        'email': [f'bulk{i}@spas.test' for i in range(count)],
+        'department': 'CSE', 'college': 'NIIST', 'semester': '3',
+        'subject': 'Maths', 'marks': 60.0, 'attendance': 80.0, 'date': '2025-05-01'
+    })
+
+
+def test_reads_proceed_during_a_bulk_import(app):
+    seed_students(app, 50)
+    written, reads_done, errors = threading.Event(), threading.Event(), []
+
+    def bulk_import():
+        try:
+            with app.app_context():
+                # A small page cache makes the writer spill to the file mid-transaction,
+                # which locks out readers of a rollback-journal database
+                db.session.execute(text('PRAGMA cache_size=-2000'))
+                import_frame(bulk_frame(20_000))  # written, not yet committed
+                written.set()
+                reads_done.wait(60)
+                db.session.commit()
+        except Exception as e:
+            errors.append(e)
+            written.set()
+
+    results = []
+
+    def read():
+        client = app.test_client()
+        login_as(client, 'Admin', 'admin')
+        for url in ('/dashboard', '/api/students?limit=20', '/api/students/overview?charts=0'):
+            response = client.get(url)
+            results.append((url, response.status_code, response.get_json(silent=True)))
+
+    writer = threading.Thread(target=bulk_import)
+    writer.start()
+    assert written.wait(60)
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join(60)
+    reads_done.set()
+    writer.join(60)
+
+    assert not errors
+    assert len(results) == 12 and all(status == 200 for _, status, _ in results)
+    # Readers saw the last committed snapshot while the import was in flight
+    totals = {body['statistics']['total_students'] for url, _, body in results if 'overview' in url}
+    assert totals == {50}
+
+    app.extensions['dashboard_cache'].clear()
+    client = app.test_client()
+    login_as(client, 'Admin', 'admin')
+    overview = client.get('/api/students/overview?charts=0').get_json()
+    assert overview['statistics']['total_students'] == 20_050
+
+
+def _old_database_with_duplicates(app):
+    """Drop the upsert key and store the same test twice, like a database from before it existed"""
+    seed_students(app, 1, tests_per_student=1)
+    with app.app_context():
+        db.session.execute(text('DROP INDEX uq_performance_student_subject_date'))
+        row = db.session.execute(text('SELECT student_enrollment_no, subject, date FROM performances')).one()
+        db.session.execute(text('INSERT INTO performances (student_enrollment_no, subject, marks, attendance, date) '
+                                'VALUES (:e, :s, 99, 99, :d)'), {'e': row[0], 's': row[1], 'd': row[2]})
+        db.session.commit()
+        db.session.remove()
+        db.engine.dispose()
+    return app.config['SQLALCHEMY_DATABASE_URI']
+
+
+def test_startup_dedupes_performances_before_adding_the_upsert_key(app, tmp_path):
+    uri = _old_database_with_duplicates(app)
+    migrated = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': uri, 'UPLOAD_FOLDER': str(tmp_path),
+                           'MODEL_PATH': str(tmp_path / 'rf_model.pkl')})
+    with migrated.app_context():
+        rows = db.session.execute(text('SELECT marks FROM performances')).scalars().all()
+        assert rows == [99]  # the latest copy is kept
+        indexes = db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+        assert 'uq_performance_student_subject_date' in indexes
+        assert StudentFeature.query.one().avg_marks == 99
+        db.session.remove()
+        db.engine.dispose()
+    migrated.extensions['upload_jobs'].executor.shutdown(wait=True)
+    migrated.extensions['retrain_scheduler'].shutdown()
+
+
+def test_startup_fails_when_the_upsert_key_cannot_be_created(app, tmp_path, monkeypatch):
+    uri = _old_database_with_duplicates(app)
+    monkeypatch.setattr(database, 'dedupe_performances', lambda: 0)
+    with pytest.raises(RuntimeError, match='uq_performance_student_subject_date'):
+        create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': uri, 'UPLOAD_FOLDER': str(tmp_path),
+                    'MODEL_PATH': str(tmp_path / 'rf_model.pkl')})
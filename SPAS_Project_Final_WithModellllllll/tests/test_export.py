@@ -0,0 +1,52 @@
+import csv
+import io
+
+from backend.models import db, Student
+from conftest import count_queries, login_as, seed_students
+
+
+def read_export(client, query=''):
+    response = client.get(f'/export/students.csv{query}')
+    assert response.status_code == 200
+    assert response.is_streamed
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+def test_export_streams_one_aggregate_query(app, client):
+    seed_students(app, 25, tests_per_student=4)
+    with app.app_context():
+        db.session.add(Student(enrollment_no='ZZ001', name='No Tests', email='zz@spas.test', password='x',
+                               department='ECE', semester='2', college='NIIST'))
+        db.session.commit()
+    app.config['EXPORT_BATCH_SIZE'] = 7  # several flushes
+    login_as(client, 'Admin', 'admin')
+
+    with count_queries(app) as statements:
+        rows = read_export(client)
+    assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) == 1
+
+    assert list(rows[0]) == [
+        'enrollment_no', 'name', 'email', 'college', 'department', 'semester',
+        'avg_marks', 'avg_attendance', 'performance_records_count'
+    ]
+    assert len(rows) == 26
+    first = rows[0]
+    marks = [float((0 * 7 + t * 13) % 100) for t in range(4)]
+    assert float(first['avg_marks']) == round(sum(marks) / 4, 2)
+    assert first['performance_records_count'] == '4'
+    assert rows[-1] == {
+        'enrollment_no': 'ZZ001', 'name': 'No Tests', 'email': 'zz@spas.test', 'college': 'NIIST',
+        'department': 'ECE', 'semester': '2', 'avg_marks': '0.0', 'avg_attendance': '0.0',
+        'performance_records_count': '0'
+    }
+
+
+def test_export_keeps_search_filter_and_access_rules(app, client):
+    seed_students(app, 3)
+    seed_students(app, 2, department='ME')
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert {r['department'] for r in read_export(client, '?q=me')} == {'ME'}
+    assert [r['enrollment_no'] for r in read_export(client, '?q=NIISTCSE00001')] == ['NIISTCSE00001']
+
+    login_as(client, 'Student', 'NIISTCSE00001')
+    assert client.get('/export/students.csv').status_code == 302
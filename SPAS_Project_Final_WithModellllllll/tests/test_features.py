@@ -0,0 +1,54 @@
+import io
+
+import pandas as pd
+
+from backend.analytics import aggregate_student_features
+from backend.features import feature_frame, refresh_student_features, _raw_rows
+from backend.ingest import import_frame
+from backend.models import db, StudentFeature
+from conftest import login_as, seed_students
+
+
+def _full_recompute():
+    raw = _raw_rows()
+    expected = aggregate_student_features(raw).sort_values('enrollment_no').reset_index(drop=True)
+    return expected[['enrollment_no'] + sorted(c for c in expected.columns if c != 'enrollment_no')]
+
+
+def _stored():
+    stored = feature_frame().sort_values('enrollment_no').reset_index(drop=True)
+    return stored[['enrollment_no'] + sorted(c for c in stored.columns if c != 'enrollment_no')]
+
+
+def test_feature_store_matches_full_recompute_after_incremental_updates(app, client):
+    seed_students(app, 8, tests_per_student=3)
+    csv = (
+        "Enrollment,Name,Department,College,Semester,Subject,Marks,Attendance,Date\n"
+        "NIISTCSE00001,Student 1,CSE,NIIST,2,Chemistry,91,80,2025-06-01\n"
+        "NEW001,Newcomer,CSE,NIIST,1,Maths,55,70,2025-06-01\n"
+    )
+    with app.app_context():
+        before = {f.enrollment_no: f.updated_at for f in StudentFeature.query.all()}
+        import_frame(pd.read_csv(io.StringIO(csv)))
+        db.session.commit()
+
+        after = {f.enrollment_no: f.updated_at for f in StudentFeature.query.all()}
+        touched = {e for e in after if before.get(e) != after[e]}
+        assert touched == {'NIISTCSE00001', 'NEW001'}
+        pd.testing.assert_frame_equal(_stored(), _full_recompute(), check_dtype=False)
+
+    login_as(client, 'Admin', 'admin')
+    client.post('/students/delete/NIISTCSE00002')
+    with app.app_context():
+        assert db.session.get(StudentFeature, 'NIISTCSE00002') is None
+        assert StudentFeature.query.count() == 8
+
+
+def test_refresh_drops_students_without_performances(app):
+    seed_students(app, 2)
+    with app.app_context():
+        from backend.models import Performance
+        Performance.query.filter_by(student_enrollment_no='NIISTCSE00000').delete()
+        refresh_student_features(['NIISTCSE00000'])
+        db.session.commit()
+        assert [f.enrollment_no for f in StudentFeature.query.all()] == ['NIISTCSE00001']
@@ -0,0 +1,147 @@
+import io
+import re
+import threading
+
+import pandas as pd
+
+from backend.ingest import import_frame, prepare_records, is_provisioned, iter_upload_chunks
+from backend.models import db, Student, Performance
+from conftest import login_as, upload_and_wait
+
+CSV = """Enrollment,Name,Email,Department,College,Semester,Subject,Avg Marks,Avg Attendance,Date
+E001,Asha,asha@spas.test,CSE,NIIST,7,Maths,81,90,2025-01-10
+E001,Asha,asha@spas.test,CSE,NIIST,7,Maths,85,92,2025-01-10
+E001,Asha,asha@spas.test,CSE,NIIST,7,Physics,64,88,2025-01-10
+E002,Ravi,ravi@spas.test,IT,NIIST,5,Maths,0,0,2025-01-10
+,Nobody,nobody@spas.test,IT,NIIST,5,Maths,50,50,2025-01-10
+"""
+
+
+def test_prepare_records_normalizes_vectorized():
+    records, valid_rows = prepare_records(pd.read_csv(io.StringIO(CSV)))
+    assert valid_rows == 4
+    assert records['semester'].tolist() == ['7', '7', '7', '5']
+    assert records['marks'].tolist() == [81.0, 85.0, 64.0, 0.0]
+    assert str(records['date'].iloc[0]) == '2025-01-10'
+
+
+def test_import_frame_upserts_students_and_performances(app):
+    with app.app_context():
+        result = import_frame(pd.read_csv(io.StringIO(CSV)))
+        db.session.commit()
+        assert result['rows'] == 4
+        assert result['students_created'] == 2
+        assert Student.query.count() == 2
+        # E002's zero marks/attendance row creates no performance record
+        assert Performance.query.count() == 2
+        maths = Performance.query.filter_by(student_enrollment_no='E001', subject='Maths').one()
+        assert (maths.marks, maths.attendance) == (85.0, 92.0)
+
+        # Re-importing updates in place instead of duplicating
+        updated = CSV.replace('Physics,64', 'Physics,70').replace(',Ravi,ravi@spas.test,IT', ',Ravi K,,IT')
+        result = import_frame(pd.read_csv(io.StringIO(updated)))
+        db.session.commit()
+        assert result['students_created'] == 0
+        assert Performance.query.count() == 2
+        assert Performance.query.filter_by(subject='Physics').one().marks == 70.0
+        ravi = db.session.get(Student, 'E002')
+        assert (ravi.name, ravi.email) == ('Ravi K', 'ravi@spas.test')
+
+
+def test_upload_runs_as_background_job(app, client):
+    login_as(client, 'Admin', 'admin')
+    job = upload_and_wait(client, [(io.BytesIO(CSV.encode()), 'semester.csv')])
+    assert job['status'] == 'done'
+    assert job['stages']['import'] == {'status': 'done', 'done': 1, 'total': 1}
+    assert (job['rows_total'], job['rows_imported']) == (5, 4)
+    assert job['previews'][0]['rows'] == 5
+    assert ['success', '✅ 4 records processed successfully!'] in job['messages']
+    with app.app_context():
+        assert Student.query.count() == 2
+
+    # Other teachers can't read someone else's job
+    login_as(client, 'Teacher', 'someone@spas.test')
+    assert client.get(f"/upload/status/{job['id']}").status_code == 404
+
+
+def test_imported_students_are_provisioned_without_hashing(app, client, monkeypatch):
+    import werkzeug.security
+
+    def _no_kdf(*args, **kwargs):
+        raise AssertionError("bulk import must not hash a password per student")
+
+    monkeypatch.setattr(werkzeug.security, 'generate_password_hash', _no_kdf)
+    with app.app_context():
+        import_frame(pd.read_csv(io.StringIO(CSV)))
+        db.session.commit()
+        assert is_provisioned(db.session.get(Student, 'E001').password)
+    monkeypatch.undo()
+
+    # Wrong password: rejected as usual
+    response = client.post('/login', data={'username': 'E001', 'password': 'nope'})
+    assert response.status_code == 200
+
+    # Default password: redirected to the set-password form instead of logging in
+    response = client.post('/login', data={'username': 'E001', 'password': 'default123'})
+    assert response.status_code == 302
+    assert '/reset-password/' in response.headers['Location']
+    with client.session_transaction() as sess:
+        assert 'user_id' not in sess
+
+    client.post(response.headers['Location'], data={'password': 'secret99', 'confirm_password': 'secret99'})
+    response = client.post('/login', data={'username': 'E001', 'password': 'secret99'})
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/dashboard')
+
+
+def test_iter_upload_chunks_streams_csv_and_json_lines(tmp_path):
+    csv_path = tmp_path / 'big.csv'
+    csv_path.write_text(CSV)
+    chunks = list(iter_upload_chunks(str(csv_path), 'big.csv', chunk_rows=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert 'enrollment_no' in chunks[0].columns
+
+    jsonl_path = tmp_path / 'big.jsonl'
+    pd.read_csv(io.StringIO(CSV)).to_json(jsonl_path, orient='records', lines=True)
+    chunks = list(iter_upload_chunks(str(jsonl_path), 'big.jsonl', chunk_rows=3))
+    assert [len(c) for c in chunks] == [3, 2]
+    assert 'marks' in chunks[0].columns
+
+
+def test_upload_job_commits_chunk_by_chunk(app, client):
+    app.config['UPLOAD_CHUNK_ROWS'] = 1
+    login_as(client, 'Admin', 'admin')
+    job = upload_and_wait(client, [(io.BytesIO(CSV.encode()), 'semester.csv')])
+    assert job['status'] == 'done'
+    assert (job['rows_total'], job['rows_imported']) == (5, 4)
+    # Preview comes from the first chunk only
+    assert job['previews'][0]['head_html'].count('<tr') == 2  # header + one row
+    with app.app_context():
+        # The duplicate Maths row in a later chunk still wins
+        assert Performance.query.filter_by(student_enrollment_no='E001', subject='Maths').one().marks == 85.0
+
+
+def test_concurrent_uploads_of_one_filename_keep_their_own_data(app, client, tmp_path):
+    # Hold both upload workers so the two files are saved before either job reads
+    queue = app.extensions['upload_jobs']
+    release = threading.Event()
+    blockers = [queue.executor.submit(release.wait, 10) for _ in range(2)]
+
+    login_as(client, 'Admin', 'admin')
+    job_ids = []
+    for enrollment_no, email in [('A001', 'a@spas.test'), ('B001', 'b@spas.test')]:
+        csv = ("Enrollment,Name,Email,Department,College,Semester,Subject,Marks,Attendance,Date\n"
+               f"{enrollment_no},Student,{email},CSE,NIIST,3,Maths,70,80,2025-01-10\n")
+        response = client.post('/upload', data={'files': [(io.BytesIO(csv.encode()), 'marks.csv')]},
+                               content_type='multipart/form-data')
+        job_ids.append(re.search(r'/upload/status/(\w+)', response.get_data(as_text=True)).group(1))
+    release.set()
+    for blocker in blockers:
+        blocker.result()
+    queue.executor.shutdown(wait=True)
+
+    assert [queue.get(job_id)['rows_imported'] for job_id in job_ids] == [1, 1]
+    with app.app_context():
+        assert {s.enrollment_no for s in Student.query.all()} == {'A001', 'B001'}
+    # Each upload's private directory is removed once its job finishes
+    assert not list(tmp_path.glob('upload-*'))
@@ -0,0 +1,50 @@
+import os
+
+from conftest import login_as, seed_students
+
+
+def test_requests_are_timed_per_endpoint(app, client):
+    seed_students(app, 5)
+    login_as(client, 'Admin', 'admin')
+    for _ in range(3):
+        assert client.get('/dashboard').status_code == 200
+    client.get('/api/students')
+
+    routes = {row['endpoint']: row for row in client.get('/api/metrics/slowest').get_json()['routes']}
+    dashboard = routes['dashboard']
+    assert dashboard['count'] == 3 and dashboard['statuses'] == {'200': 3}
+    assert dashboard['avg_sql_queries'] > 0
+    assert dashboard['avg_template_ms'] > 0
+    assert dashboard['avg_response_bytes'] > 0
+    assert routes['api_students']['avg_template_ms'] == 0
+
+
+def test_prometheus_exposition(app, client):
+    login_as(client, 'Admin', 'admin')
+    client.get('/api/students')
+    client.get('/api/students')
+
+    body = client.get('/metrics').get_data(as_text=True)
+    labels = f'endpoint="api_students",method="GET",pid="{os.getpid()}"'
+    assert '# TYPE spas_request_duration_seconds histogram' in body
+    assert f'spas_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in body
+    assert f'spas_request_duration_seconds_count{{{labels}}} 2' in body
+    assert f'spas_requests_total{{{labels},status="200"}} 2' in body
+    assert 'spas_sql_queries_total{' in body
+
+
+def test_access(app, client):
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+    # Without a token, production only serves admins
+    del app.config['METRICS_TOKEN']
+    app.testing = False
+    assert client.get('/metrics').status_code == 401
+    login_as(client, 'Admin', 'admin')
+    assert client.get('/metrics').status_code == 200
+    app.testing = True
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert client.get('/api/metrics/slowest').status_code == 403
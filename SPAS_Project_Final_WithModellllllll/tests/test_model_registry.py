@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from backend.analytics import train_model, predict_for_aggregated, aggregate_student_features
+from backend.model_registry import ModelRegistry, registry
+from conftest import login_as
+
+
+def _frame(n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'enrollment_no': [f"E{i % 10}" for i in range(n)],
+        'subject': rng.choice(['maths', 'physics'], n),
+        'marks': rng.uniform(30, 95, n),
+        'attendance': rng.uniform(50, 100, n)
+    })
+
+
+def test_model_loaded_once_and_reloaded_on_publish(tmp_path, monkeypatch):
+    path = str(tmp_path / 'rf_model.pkl')
+    train_model(_frame(), path)
+    first_version = registry.info(path)['version']
+
+    import backend.model_registry as mr
+    loads = []
+    real_load = mr.joblib.load
+    monkeypatch.setattr(mr.joblib, 'load', lambda p: loads.append(p) or real_load(p))
+
+    fresh = ModelRegistry()
+    model = fresh.get(path)
+    assert fresh.get(path) is model
+    assert len(loads) == 1
+
+    fresh.publish(model, path, version='v2')
+    assert fresh.get(path) is not model
+    assert fresh.info(path)['version'] == 'v2'
+    assert len(loads) == 2
+    assert first_version != 'v2'
+    # Only the final file is left behind, no temp pickles
+    assert os.listdir(tmp_path) == ['rf_model.pkl']
+
+
+def test_predict_for_aggregated_uses_cached_model(tmp_path):
+    path = str(tmp_path / 'rf_model.pkl')
+    train_model(_frame(), path)
+    agg = aggregate_student_features(_frame(seed=1)).drop(columns=['avg_marks'])
+    preds = predict_for_aggregated(agg, path)
+    assert preds['predicted_marks'].notna().all()
+    assert predict_for_aggregated(agg, str(tmp_path / 'missing.pkl'))['predicted_marks'].isna().all()
+
+
+def test_model_info_endpoint_is_admin_only(app, client):
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert client.get('/api/model').status_code == 403
+    train_model(_frame(), app.config['MODEL_PATH'])
+    login_as(client, 'Admin', 'admin')
+    info = client.get('/api/model').get_json()
+    assert info['version'] and info['loaded_at']
+
+
+def test_publish_never_stamps_the_callers_model(tmp_path):
+    path = str(tmp_path / 'rf_model.pkl')
+    model, _ = train_model(_frame(), path)
+    trained_version = model.spas_version_
+    assert registry.info(path)['version'] == trained_version
+
+    fresh = ModelRegistry()
+    shared = fresh.get(path)
+    fresh.publish(shared, path, version='v2')
+    # The cached object other requests still hold keeps its own version
+    assert shared.spas_version_ == trained_version
+    assert fresh.get(path).spas_version_ == 'v2'
+
+
+def test_alerts_load_the_configured_model(app, tmp_path):
+    from backend.alerts import load_model
+    with app.app_context():
+        assert load_model() is None  # nothing at the test app's MODEL_PATH yet
+        train_model(_frame(), app.config['MODEL_PATH'])
+        assert load_model() is registry.get(app.config['MODEL_PATH'])
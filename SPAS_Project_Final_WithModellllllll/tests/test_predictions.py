@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from backend.alerts import generate_alerts
+from backend.analytics import train_model_from_features
+from backend.features import feature_frame
+from backend.models import db, Prediction
+from backend.predictions import score_all_students
+from backend.queries import student_aggregate_query, student_summary
+from conftest import seed_students
+
+
+def test_batch_scoring_stores_one_prediction_per_student(app):
+    seed_students(app, 12, tests_per_student=3)
+    with app.app_context():
+        assert score_all_students(app.config['MODEL_PATH']) == (None, 0)
+
+        model, _ = train_model_from_features(feature_frame(), app.config['MODEL_PATH'])
+        assert model is not None
+        version, scored = score_all_students(app.config['MODEL_PATH'])
+        db.session.commit()
+        assert scored == 12
+        assert {p.model_version for p in Prediction.query.all()} == {version}
+
+        # Re-scoring replaces instead of piling up rows
+        score_all_students(app.config['MODEL_PATH'])
+        db.session.commit()
+        assert Prediction.query.count() == 12
+
+        rows = [student_summary(r) for r in student_aggregate_query()]
+        assert all(r['has_prediction'] for r in rows)
+        stored = {p.student_enrollment_no: round(p.predicted_marks, 2) for p in Prediction.query.all()}
+        assert {r['enrollment']: r['predicted_marks'] for r in rows} == stored
+
+        low = {a['student_id'] for a in generate_alerts(threshold=50.0)}
+        assert low == {e for e, marks in stored.items() if marks < 50.0}
+
+
+def test_unscored_students_fall_back_to_actual_average(app):
+    seed_students(app, 2)
+    with app.app_context():
+        row = student_summary(student_aggregate_query().first())
+        assert not row['has_prediction']
+        assert row['predicted_marks'] == row['avg_marks']
+
+
+def test_two_stored_versions_do_not_double_performance_rows(app):
+    seed_students(app, 1, tests_per_student=3)
+    with app.app_context():
+        enrollment = student_aggregate_query().first().enrollment_no
+        db.session.add_all([
+            Prediction(student_enrollment_no=enrollment, model_version='old', predicted_marks=10.0,
+                       scored_at=datetime(2025, 1, 1)),
+            Prediction(student_enrollment_no=enrollment, model_version='new', predicted_marks=90.0,
+                       scored_at=datetime(2025, 2, 1))
+        ])
+        db.session.commit()
+
+        row = student_summary(student_aggregate_query().first())
+        assert row['total_tests'] == 3
+        assert row['predicted_marks'] == 90.0
+        assert generate_alerts(threshold=50.0) == []
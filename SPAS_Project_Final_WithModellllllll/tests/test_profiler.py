@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+from conftest import login_as, seed_students
+
+
+def test_admins_can_profile_a_single_request(app, client):
+    seed_students(app, 5)
+    login_as(client, 'Admin', 'admin')
+
+    assert 'X-Profile-Id' not in client.get('/dashboard').headers
+    profiled = client.get('/dashboard?_profile=1')
+    profile_id = profiled.headers['X-Profile-Id']
+    assert client.get('/api/students', headers={'X-Profile': '1'}).headers['X-Profile-Id'] != profile_id
+
+    [latest, first] = app.extensions['request_profiler'].recent()
+    assert first['id'] == profile_id and first['endpoint'] == 'dashboard' and first['status'] == 200
+    assert latest['path'] == '/api/students'
+    assert any('dashboard' in row['function'] for row in first['top_functions'])
+
+    page = client.get('/admin/profiles').get_data(as_text=True)
+    assert '/dashboard?_profile=1' in page and 'Cumulative' in page
+    download = client.get(f'/admin/profiles/{profile_id}.prof')
+    assert download.status_code == 200 and len(download.data) > 0
+    assert client.get('/admin/profiles/..%2Fsecret.prof').status_code == 404
+
+
+def test_only_admins_trigger_profiles_and_the_ring_is_bounded(app, client):
+    seed_students(app, 2)
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert 'X-Profile-Id' not in client.get('/dashboard?_profile=1').headers
+    assert client.get('/admin/profiles').status_code == 302
+
+    profiler = app.extensions['request_profiler']
+    profiler.ring_size = 3
+    login_as(client, 'Admin', 'admin')
+    ids = [client.get('/api/students?_profile=1').headers['X-Profile-Id'] for _ in range(5)]
+    assert profiler.ids() == ids[:-4:-1]
+    assert sorted(os.listdir(profiler.directory)) == sorted(f'{i}{ext}' for i in ids[2:] for ext in ('.json', '.prof'))
+
+
+def test_a_failing_request_does_not_leave_the_profiler_on(app, client):
+    @app.route('/boom')
+    def boom():
+        raise RuntimeError('boom')
+
+    login_as(client, 'Admin', 'admin')
+    with pytest.raises(RuntimeError):
+        client.get('/boom?_profile=1')
+    assert sys.getprofile() is None
+    assert app.extensions['request_profiler'].ids() == []
+
+    # The next profiled request on this thread works as usual
+    assert 'X-Profile-Id' in client.get('/api/students?_profile=1').headers
+    assert sys.getprofile() is None
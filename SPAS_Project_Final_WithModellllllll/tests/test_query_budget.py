@@ -0,0 +1,72 @@
+import io
+import logging
+import math
+
+import pytest
+
+from backend.models import Student
+from conftest import assert_max_queries, login_as, seed_students, upload_and_wait
+
+SIZES = [10, 10_000]
+
+# Per request, independent of how many students are in scope
+DASHBOARD_QUERIES = 8
+EXPORT_QUERIES = 2
+# Uploads work in batches of 500 students: a constant per batch, never per row
+UPLOAD_BASE_QUERIES = 20
+UPLOAD_QUERIES_PER_BATCH = 10
+
+
+def fetch(client, url):
+    response = client.get(url)
+    response.get_data()
+    response.close()
+    assert response.status_code == 200
+    return response
+
+
+@pytest.mark.parametrize('students', SIZES)
+def test_read_paths_stay_within_budget(app, client, students):
+    seed_students(app, students)
+    for role, username in [('Admin', 'admin'), ('Teacher', 'teacher@spas.test')]:
+        login_as(client, role, username)
+        app.extensions['dashboard_cache'].clear()
+        with assert_max_queries(app, DASHBOARD_QUERIES):
+            fetch(client, '/dashboard')
+        with assert_max_queries(app, EXPORT_QUERIES):
+            fetch(client, '/export/students.csv')
+
+
+@pytest.mark.parametrize('students', SIZES)
+def test_upload_stays_within_budget(app, client, students):
+    seed_students(app, students)
+    csv = "Enrollment,Name,Department,College,Semester,Subject,Marks,Attendance,Date\n" + "".join(
+        f"NIISTCSE{i:05d},Student {i},CSE,NIIST,2,History,{i % 100},{i * 3 % 100},2025-09-01\n"
+        for i in range(students)
+    )
+    login_as(client, 'Admin', 'admin')
+    budget = UPLOAD_BASE_QUERIES + UPLOAD_QUERIES_PER_BATCH * math.ceil(students / 500)
+    with assert_max_queries(app, budget):
+        job = upload_and_wait(client, [(io.BytesIO(csv.encode()), 'marks.csv')], timeout=120)
+    assert job['status'] == 'done'
+
+
+def test_repeated_statements_are_flagged(app, client, caplog):
+    seed_students(app, 12)
+
+    @app.route('/test/n-plus-one')
+    def n_plus_one():
+        names = [Student.query.filter_by(enrollment_no=f"NIISTCSE{i:05d}").first().name for i in range(12)]
+        return {'names': names}
+
+    login_as(client, 'Admin', 'admin')
+    with caplog.at_level(logging.WARNING):
+        response = client.get('/test/n-plus-one')
+    assert response.headers['X-Query-Count'] == '12'
+    [flagged] = response.headers.getlist('X-Repeated-Query')
+    assert flagged.startswith('12x SELECT students.')
+    assert 'Possible N+1 on GET /test/n-plus-one' in caplog.text
+
+    # Batched reads stay quiet
+    response = client.get('/api/students')
+    assert response.headers.getlist('X-Repeated-Query') == []
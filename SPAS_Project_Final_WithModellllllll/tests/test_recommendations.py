@@ -0,0 +1,69 @@
+from backend.alerts import cohort_recommendations, personalized_recommendation
+from backend.models import db, Performance, Prediction
+from conftest import count_queries, login_as, seed_students
+
+
+def _reference(enrollment_no):
+    """The old per-student loop, for comparison"""
+    perfs = Performance.query.filter_by(student_enrollment_no=enrollment_no).all()
+    avg_marks = sum(p.marks for p in perfs) / len(perfs)
+    avg_att = sum(p.attendance for p in perfs) / len(perfs)
+    recs = []
+    if avg_att < 75:
+        recs.append('Improve attendance to at least 75%')
+    if avg_marks < 50:
+        recs.append('Attend remedial classes and practice basics')
+    elif avg_marks < 70:
+        recs.append('Regular practice and revision recommended')
+    else:
+        recs.append('Keep up the good work; try advanced problems')
+    subj = {}
+    for p in perfs:
+        subj.setdefault(p.subject, []).append(p.marks)
+    weak = sorted(s for s, v in subj.items() if sum(v) / len(v) < 60)
+    if weak:
+        recs.append('Weak subjects: ' + ', '.join(weak))
+    return recs
+
+
+def test_cohort_matches_the_per_student_rules_in_one_query(app):
+    seed_students(app, 16)
+    with app.app_context():
+        with count_queries(app) as statements:
+            cohort = cohort_recommendations({'department': 'CSE', 'college': 'NIIST', 'semester': '3'})
+        assert len(statements) == 1
+        assert [s['enrollment_no'] for s in cohort] == ['NIISTCSE00002', 'NIISTCSE00010']
+
+        everyone = cohort_recommendations({'department': 'CSE'})
+        assert len(everyone) == 16
+        for s in everyone:
+            assert s['recommendations'] == _reference(s['enrollment_no'])
+            assert personalized_recommendation(s['enrollment_no'])['recommendations'] == s['recommendations']
+        assert personalized_recommendation('nobody') == {'msg': 'No data'}
+        advice = {r for s in everyone for r in s['recommendations']}
+        assert 'Attend remedial classes and practice basics' in advice
+        assert any(r.startswith('Weak subjects: ') for r in advice)
+
+
+def test_api_is_scoped_and_cached_per_model_version(app, client):
+    seed_students(app, 8)
+    seed_students(app, 4, department='ME', college='GEC')
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    body = client.get('/api/recommendations').get_json()
+    assert body['model_version'] is None
+    assert {s['department'] for s in body['students']} == {'CSE'} and len(body['students']) == 8
+    assert client.get('/api/recommendations?department=ME').get_json()['students'] == []
+
+    login_as(client, 'Admin', 'admin')
+    assert len(client.get('/api/recommendations?college=GEC').get_json()['students']) == 4
+    with app.app_context():
+        db.session.add(Prediction(student_enrollment_no='GECME00000', model_version='v2', predicted_marks=12.5))
+        db.session.commit()
+    # A new model version is a new cache entry, even without an invalidating write
+    body = client.get('/api/recommendations?college=GEC').get_json()
+    assert body['model_version'] == 'v2'
+    assert body['students'][0]['predicted_marks'] == 12.5
+
+    login_as(client, 'Student', 'NIISTCSE00001')
+    assert [s['enrollment_no'] for s in client.get('/api/recommendations').get_json()['students']] == ['NIISTCSE00001']
@@ -0,0 +1,72 @@
+import io
+
+from conftest import login_as, seed_students, upload_and_wait
+
+
+def _renders(app):
+    return app.extensions['dashboard_cache'].stats()['misses']
+
+
+def test_report_is_cached_and_revalidated(app, client):
+    seed_students(app, 3)
+    login_as(client, 'Admin', 'admin')
+
+    first = client.get('/reports/NIISTCSE00001.pdf')
+    assert first.status_code == 200 and first.data.startswith(b'%PDF')
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+    misses = _renders(app)
+
+    # Repeat download: served from the cache
+    assert client.get('/reports/NIISTCSE00001.pdf').data == first.data
+    assert _renders(app) == misses
+    # Browser revalidation: nothing rendered or sent
+    assert client.get('/reports/NIISTCSE00001.pdf', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/reports/NIISTCSE00001.pdf', headers={'If-Modified-Since': last_modified}).status_code == 304
+
+    other = client.get('/reports/NIISTCSE00002.pdf')
+    assert other.headers['ETag'] != etag
+
+    # An upload touching NIISTCSE00001 changes only that student's report
+    csv = (b"Enrollment,Name,Department,College,Semester,Subject,Marks,Attendance,Date\n"
+           b"NIISTCSE00001,Student 1,CSE,NIIST,2,History,77,88,2025-09-01\n")
+    assert upload_and_wait(client, [(io.BytesIO(csv), 'marks.csv')])['status'] == 'done'
+    partitions = app.extensions['dashboard_cache'].stats()['partitions']
+    assert 'student:NIISTCSE00001' not in partitions and 'student:NIISTCSE00002' in partitions
+
+    changed = client.get('/reports/NIISTCSE00001.pdf', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert client.get('/reports/NIISTCSE00002.pdf', headers={'If-None-Match': other.headers['ETag']}).status_code == 304
+    # The other student's cached PDF survived the upload
+    misses = _renders(app)
+    assert client.get('/reports/NIISTCSE00002.pdf').data == other.data
+    assert _renders(app) == misses
+
+
+def test_report_access_follows_roles(app, client):
+    seed_students(app, 2)
+    seed_students(app, 1, department='ME', college='GEC')
+
+    login_as(client, 'Student', 'NIISTCSE00001')
+    assert client.get('/reports/NIISTCSE00001.pdf').status_code == 200
+    assert client.get('/reports/NIISTCSE00000.pdf').status_code == 302
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert client.get('/reports/NIISTCSE00000.pdf').status_code == 200
+    assert client.get('/reports/GECME00000.pdf').status_code == 302
+    assert client.get('/reports/NOBODY.pdf').status_code == 302
+
+
+def test_report_etag_follows_student_details(app, client):
+    seed_students(app, 2)
+    login_as(client, 'Admin', 'admin')
+    first = client.get('/reports/NIISTCSE00001.pdf')
+    etag = first.headers['ETag']
+
+    # No marks or attendance: only the student row changes, not the performances
+    csv = (b"Enrollment,Name,Department,College,Semester,Subject,Marks,Attendance,Date\n"
+           b"NIISTCSE00001,Student 1,ME,NIIST,2,History,0,0,2025-09-01\n")
+    assert upload_and_wait(client, [(io.BytesIO(csv), 'marks.csv')])['status'] == 'done'
+
+    changed = client.get('/reports/NIISTCSE00001.pdf', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    assert changed.data != first.data
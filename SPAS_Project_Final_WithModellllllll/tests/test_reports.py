@@ -0,0 +1,73 @@
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import backend.reports as reports
+from backend.reports import report_cohort, stream_reports_zip, write_reports
+from conftest import count_queries, login_as, seed_students
+
+
+def test_cohort_loads_every_performance_in_one_query(app):
+    seed_students(app, 10, tests_per_student=4)
+    seed_students(app, 3, department='ME', college='GEC')
+    with app.app_context(), count_queries(app) as statements:
+        cohort = report_cohort({'department': 'CSE', 'semester': '2'})
+    assert len(statements) == 1
+    assert [s['enrollment_no'] for s, _ in cohort] == ['NIISTCSE00001', 'NIISTCSE00009']
+    assert all(len(performances) == 4 for _, performances in cohort)
+
+
+def test_pool_renders_zip_and_directory(app, tmp_path, monkeypatch):
+    seed_students(app, 6)
+    with app.app_context():
+        cohort = report_cohort()
+    monkeypatch.setattr(reports, 'INLINE_REPORT_LIMIT', 0)  # force the process pool
+
+    seen = []
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(stream_reports_zip(cohort, workers=2, progress=lambda d, t: seen.append((d, t))))))
+    assert archive.namelist() == [f'NIISTCSE{i:05d}_report.pdf' for i in range(6)]
+    assert all(archive.read(name).startswith(b'%PDF') for name in archive.namelist())
+    assert seen[-1] == (6, 6)
+
+    assert write_reports(cohort[:2], tmp_path / 'out', workers=1) == 2
+    assert sorted(p.name for p in (tmp_path / 'out').iterdir()) == ['NIISTCSE00000_report.pdf', 'NIISTCSE00001_report.pdf']
+
+
+def test_zip_endpoint_is_scoped(app, client):
+    seed_students(app, 4)
+    seed_students(app, 2, department='ME', college='GEC')
+
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    response = client.get('/reports/batch.zip')
+    assert response.headers['X-Report-Count'] == '4'
+    assert len(zipfile.ZipFile(io.BytesIO(response.data)).namelist()) == 4
+    assert client.get('/reports/batch.zip?college=GEC').status_code == 302
+
+    login_as(client, 'Admin', 'admin')
+    response = client.get('/reports/batch.zip?college=GEC')
+    assert 'reports_GEC.zip' in response.headers['Content-Disposition']
+    assert zipfile.ZipFile(io.BytesIO(response.data)).namelist() == ['GECME00000_report.pdf', 'GECME00001_report.pdf']
+
+    login_as(client, 'Student', 'NIISTCSE00001')
+    assert client.get('/reports/batch.zip').status_code == 302
+
+
+def test_pool_submits_a_bounded_window_of_chunks(app, monkeypatch):
+    seed_students(app, 12)
+    with app.app_context():
+        cohort = report_cohort()
+    monkeypatch.setattr(reports, 'REPORT_CHUNK_SIZE', 2)
+
+    class CountingExecutor(ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, *args, **kwargs):
+            CountingExecutor.submitted += 1
+            return super().submit(*args, **kwargs)
+
+    with CountingExecutor(max_workers=2) as executor:
+        results = reports._windowed(executor, cohort, window=2)
+        assert next(results)[0] == 'NIISTCSE00000'
+        assert CountingExecutor.submitted == 3  # the first window, topped up by one
+        assert [e for e, _ in results] == [f'NIISTCSE{i:05d}' for i in range(1, 12)]
+    assert CountingExecutor.submitted == 6
@@ -0,0 +1,114 @@
+import time
+
+from backend.models import Prediction
+from backend.model_registry import model_info
+from conftest import seed_students, login_as, upload_and_wait
+
+
+def test_requests_inside_the_window_share_one_training(app):
+    seed_students(app, 12)
+    scheduler = app.extensions['retrain_scheduler']
+    scheduler.debounce_seconds = 0.5
+
+    for _ in range(3):
+        scheduler.request(changed_rows=12)
+    assert scheduler.status()['pending_rows'] == 36
+    assert scheduler.wait(timeout=120)
+
+    status = scheduler.status()
+    assert status['last_run']['outcome'] == 'trained'
+    assert status['last_run']['changed_rows'] == 36
+    assert status['pending_rows'] == 0
+    with app.app_context():
+        version = model_info(app.config['MODEL_PATH'])['version']
+        assert version == status['last_run']['version']
+        assert {p.model_version for p in Prediction.query.all()} == {version}
+        assert Prediction.query.count() == 12
+
+
+def test_small_changes_are_skipped_until_forced(app):
+    seed_students(app, 12, tests_per_student=10)
+    scheduler = app.extensions['retrain_scheduler']
+    scheduler.request(force=True, delay=0)
+    assert scheduler.wait(timeout=120)
+    first = scheduler.status()['last_run']['version']
+
+    # 1 changed row out of 120 is under the 5% threshold
+    scheduler.request(changed_rows=1, delay=0)
+    assert scheduler.wait(timeout=30)
+    status = scheduler.status()
+    assert status['last_run']['outcome'] == 'skipped'
+    assert status['pending_rows'] == 1
+
+    time.sleep(0.01)  # versions are timestamps
+    client = app.test_client()
+    login_as(client, 'Admin', 'admin')
+    assert client.post('/admin/retrain').status_code == 302
+    assert scheduler.wait(timeout=120)
+    status = client.get('/api/retrain/status').get_json()
+    assert status['last_run']['outcome'] == 'trained'
+    assert status['last_run']['version'] != first
+
+
+def test_upload_queues_a_retrain_instead_of_training(app, client, tmp_path):
+    login_as(client, 'Admin', 'admin')
+    csv_path = tmp_path / 'source.csv'
+    csv_path.write_text(
+        "enrollment_no,name,email,subject,marks,attendance\n"
+        + "".join(f"E{i},Student {i},e{i}@spas.test,Maths,{50 + i},{80 - i}\n" for i in range(6))
+    )
+    with open(csv_path, 'rb') as fh:
+        job = upload_and_wait(client, [(fh, 'marks.csv')])
+
+    assert job['stages']['retrain']['status'] == 'scheduled'
+    status = app.extensions['retrain_scheduler'].status()
+    assert status['pending_rows'] == 6 and status['next_run_at'] and not status['running']
+    assert model_info(app.config['MODEL_PATH']) is None
+
+    client = app.test_client()
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert client.post('/admin/retrain').status_code == 302
+    assert app.extensions['retrain_scheduler'].status()['next_run_at'] == status['next_run_at']
+
+
+def test_unreadable_model_is_replaced_without_forcing(app):
+    seed_students(app, 12, tests_per_student=10)
+    with open(app.config['MODEL_PATH'], 'wb') as f:
+        f.write(b'not a pickle')
+    scheduler = app.extensions['retrain_scheduler']
+    scheduler.request(changed_rows=1, delay=0)
+    assert scheduler.wait(timeout=120)
+    assert scheduler.status()['last_run']['outcome'] == 'trained'
+
+    client = app.test_client()
+    login_as(client, 'Admin', 'admin')
+    assert client.get('/api/model').get_json()['version'] == scheduler.status()['last_run']['version']
+
+
+def test_rows_stay_pending_when_no_model_was_published(app, monkeypatch):
+    seed_students(app, 12)
+    scheduler = app.extensions['retrain_scheduler']
+    monkeypatch.setattr(scheduler, '_train', lambda model_path: (None, None, 0))
+    scheduler.request(changed_rows=12, force=True, delay=0)
+    assert scheduler.wait(timeout=30)
+    status = scheduler.status()
+    assert status['last_run']['outcome'] == 'skipped'
+    assert status['pending_rows'] == 12 and scheduler.force
+
+    def crash(model_path):
+        raise RuntimeError('training process died')
+
+    monkeypatch.setattr(scheduler, '_train', crash)
+    scheduler.request(delay=0)
+    assert scheduler.wait(timeout=30)
+    assert scheduler.status()['last_run']['outcome'] == 'failed'
+    assert scheduler.status()['pending_rows'] == 12 and scheduler.force
+
+
+def test_model_status_survives_an_unreadable_model(app, client):
+    with open(app.config['MODEL_PATH'], 'wb') as f:
+        f.write(b'not a pickle')
+    login_as(client, 'Admin', 'admin')
+    response = client.get('/api/model')
+    assert response.status_code == 500
+    assert response.get_json()['version'] is None
@@ -0,0 +1,82 @@
+import io
+
+import pandas as pd
+from sqlalchemy import func
+
+from backend.ingest import import_frame
+from backend.models import db, Performance, PerformanceRollup
+from backend.rollups import rebuild_rollups, rollup_totals
+from conftest import login_as, seed_students
+
+ROLLUP_COLUMNS = ['department', 'college', 'subject', 'month', 'test_count',
+                  'marks_sum', 'marks_sq_sum', 'attendance_sum', 'attendance_sq_sum']
+
+
+def _stored():
+    rows = PerformanceRollup.query.with_entities(
+        *(getattr(PerformanceRollup, c) for c in ROLLUP_COLUMNS)
+    ).order_by(PerformanceRollup.department, PerformanceRollup.college,
+               PerformanceRollup.subject, PerformanceRollup.month).all()
+    return pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+
+
+def _rebuilt():
+    rebuild_rollups()
+    rebuilt = _stored()
+    db.session.rollback()
+    return rebuilt
+
+
+def test_rollups_match_a_full_rebuild_after_imports_and_deletes(app, client):
+    seed_students(app, 8)
+    seed_students(app, 3, department='ME', college='GEC')
+    csv = (
+        "Enrollment,Name,Department,College,Semester,Subject,Marks,Attendance,Date\n"
+        # updated marks for an existing test
+        "NIISTCSE00001,Student 1,CSE,NIIST,2,Subject 0,91,80,2025-01-01\n"
+        # a student moving department: all their tests change group
+        "NIISTCSE00002,Student 2,ECE,NIIST,3,Physics,40,60,2025-07-15\n"
+        "NEW001,Newcomer,CSE,NIIST,1,Maths,55,70,2025-06-01\n"
+    )
+    with app.app_context():
+        import_frame(pd.read_csv(io.StringIO(csv)))
+        db.session.commit()
+        pd.testing.assert_frame_equal(_stored(), _rebuilt(), check_dtype=False)
+        assert set(_stored()['department']) == {'CSE', 'ECE', 'ME'}
+
+    login_as(client, 'Admin', 'admin')
+    client.post('/students/delete/GECME00000')
+    with app.app_context():
+        pd.testing.assert_frame_equal(_stored(), _rebuilt(), check_dtype=False)
+
+
+def test_totals_match_the_raw_table(app):
+    seed_students(app, 12)
+    with app.app_context():
+        totals = rollup_totals()
+        assert totals['test_count'] == Performance.query.count()
+        assert abs(totals['avg_marks'] - db.session.query(func.avg(Performance.marks)).scalar()) < 1e-9
+        assert abs(totals['avg_attendance'] - db.session.query(func.avg(Performance.attendance)).scalar()) < 1e-9
+        marks = [p.marks for p in Performance.query.all()]
+        assert abs(totals['marks_stddev'] - pd.Series(marks).std(ddof=0)) < 1e-6
+
+
+def test_admin_dashboard_reads_the_rollups(app, client):
+    seed_students(app, 4)
+    login_as(client, 'Admin', 'admin')
+    with app.app_context():
+        expected = round(rollup_totals()['avg_marks'], 2)
+        # The page is served from the rollups even if the raw rows disagree
+        Performance.query.delete()
+        db.session.commit()
+    assert f"<p>{expected}</p>" in client.get('/admin-dashboard').get_data(as_text=True)
+
+
+def test_rollup_charts_follow_department_filters(app, client):
+    seed_students(app, 6)
+    seed_students(app, 2, department='ME', college='GEC')
+    login_as(client, 'Admin', 'admin')
+    chart = client.get('/api/charts/department_comparison?college=GEC').get_json()['data']
+    assert chart['labels'] == ['ME'] and chart['student_count'] == [2]
+    months = client.get('/api/charts/monthly_trend').get_json()['data']['months']
+    assert months == ['2025-01', '2025-02', '2025-03']
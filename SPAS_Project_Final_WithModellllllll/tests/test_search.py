@@ -0,0 +1,50 @@
+import io
+
+from backend.models import db, Student
+from backend.search import student_search_clause
+from conftest import login_as, seed_students, upload_and_wait
+
+
+def search(client, q):
+    page = client.get(f'/api/students?q={q}&limit=500').get_json()
+    return {s['enrollment'] for s in page['students']}
+
+
+def test_index_follows_register_upload_and_delete(app, client):
+    seed_students(app, 3)
+    assert app.extensions['student_search']
+    login_as(client, 'Admin', 'admin')
+    assert search(client, 'student 1') == {'NIISTCSE00001'}
+    assert search(client, 'niistcse') == {'NIISTCSE00000', 'NIISTCSE00001', 'NIISTCSE00002'}
+
+    csv = "enrollment_no,name,email,department,college,subject,marks\nE900,Meera Iyer,meera@spas.test,Civil,GEC,Maths,70\n"
+    upload_and_wait(client, [(io.BytesIO(csv.encode()), 'new.csv')])
+    assert search(client, 'iyer') == {'E900'}
+    assert search(client, 'civ') == {'E900'}
+
+    # Upload updates re-index the changed fields
+    csv = csv.replace('Meera Iyer', 'Meera Rao')
+    upload_and_wait(client, [(io.BytesIO(csv.encode()), 'again.csv')])
+    assert search(client, 'iyer') == set()
+    assert search(client, 'rao') == {'E900'}
+
+    client.post('/students/delete/E900')
+    with app.app_context():
+        assert db.session.get(Student, 'E900') is None
+    assert search(client, 'rao') == set()
+
+
+def test_search_is_scoped_and_matches_like_semantics(app, client):
+    seed_students(app, 4)
+    seed_students(app, 2, department='ME', college='GEC')
+    login_as(client, 'Teacher', 'teacher@spas.test')
+    assert search(client, 'student') == {f'NIISTCSE0000{i}' for i in range(4)}
+    assert search(client, '"') == set()  # quotes never break the MATCH syntax
+
+    with app.app_context():
+        for q in ['st', 'ude', 'GEC', 'spas.test', 'nt 1', 'zzz']:
+            indexed = {s.enrollment_no for s in Student.query.filter(student_search_clause(q))}
+            app.extensions['student_search'] = False
+            like = {s.enrollment_no for s in Student.query.filter(student_search_clause(q))}
+            app.extensions['student_search'] = True
+            assert indexed == like, q
@@ -0,0 +1,86 @@
+import pytest
+
+from backend.queries import student_aggregate_query, student_summary, performance_status
+from conftest import login_as, seed_students
+
+
+def all_pages(client, **params):
+    """Walk /api/students with its keyset cursor; returns every row in page order"""
+    rows, after = [], None
+    while True:
+        query = dict(params, limit=7, **({'after': after} if after else {}))
+        page = client.get('/api/students', query_string=query).get_json()
+        rows.extend(page['students'])
+        after = page['next_cursor']
+        if not after:
+            return rows
+
+
+@pytest.fixture
+def seeded(app):
+    seed_students(app, 30)
+    seed_students(app, 12, department='ME', college='GEC')
+    with app.app_context():
+        return [student_summary(r) for r in student_aggregate_query({})]
+
+
+@pytest.mark.parametrize('sort', ['enrollment', 'name', 'semester', 'avg_marks', 'total_tests'])
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+def test_keyset_pages_cover_every_student_once_in_order(client, seeded, sort, order):
+    login_as(client, 'Admin', 'admin')
+    rows = all_pages(client, sort=sort, order=order)
+    assert sorted(r['enrollment'] for r in rows) == sorted(s['enrollment'] for s in seeded)
+
+    key = {'enrollment': 'enrollment'}.get(sort, sort)
+    pairs = [(r[key], r['enrollment']) for r in rows]
+    if sort == 'avg_marks':  # rounded in the payload, compare on the raw order
+        pairs = [(r['avg_marks'], r['enrollment']) for r in rows]
+        assert [p[0] for p in pairs] == sorted((p[0] for p in pairs), reverse=order == 'desc')
+    else:
+        assert pairs == sorted(pairs, reverse=order == 'desc')
+
+
+def test_server_side_filters_and_scope(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    assert {r['college'] for r in all_pages(client, college='GEC')} == {'GEC'}
+    semester_3 = all_pages(client, department='CSE', semester='3')
+    assert semester_3 and all(r['semester'] == '3' and r['department'] == 'CSE' for r in semester_3)
+
+    good = all_pages(client, status='Good')
+    expected = {s['enrollment'] for s in seeded if performance_status(s['avg_marks'])[0] == 'Good'}
+    assert {r['enrollment'] for r in good} == expected
+
+    login_as(client, 'Teacher', 'teacher@spas.test')  # CSE / NIIST teacher
+    assert {r['college'] for r in all_pages(client)} == {'NIIST'}
+    assert all_pages(client, college='GEC') == []
+
+    assert client.get('/api/students?sort=password').status_code == 400
+    assert client.get('/api/students?after=bm90LWEtY3Vyc29y').status_code == 400
+    assert client.get('/api/students?status=Legendary').status_code == 400
+
+
+def test_overview_matches_the_per_student_rows(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    overview = client.get('/api/students/overview?department=CSE').get_json()
+    cse = [s for s in seeded if s['department'] == 'CSE']
+
+    stats = overview['statistics']
+    assert stats['total_students'] == len(cse)
+    assert stats['avg_marks'] == pytest.approx(sum(s['avg_marks'] for s in cse) / len(cse), abs=0.01)
+    assert sum(stats['status_counts'].values()) == len(cse)
+
+    charts = overview['charts']
+    assert charts['department']['labels'] == ['CSE']
+    assert sum(charts['marks_distribution']['counts']) == len(cse)
+    assert charts['semester']['student_count'] == [
+        sum(1 for s in cse if s['semester'] == str(n)) for n in range(1, 9)
+    ]
+    top = sorted(cse, key=lambda s: (-s['avg_marks'], s['enrollment']))[:10]
+    assert charts['top_students']['labels'] == [s['name'] for s in top]
+
+
+def test_dashboard_no_longer_embeds_students(client, seeded):
+    login_as(client, 'Admin', 'admin')
+    html = client.get('/dashboard').get_data(as_text=True)
+    assert 'NIISTCSE00029' not in html
+    assert '<option value="GEC">GEC</option>' in html